@@ -12,48 +12,82 @@ class HeatConfig(AppConfig):
         from django_oemof import hooks
 
         # pylint: disable=C0415
-        from building_dialouge_webapp.heat import hooks as bd_hooks
+        from building_dialouge_webapp.heat import codec
+        from building_dialouge_webapp.heat import pipeline
+        from building_dialouge_webapp.heat import registry
+        from building_dialouge_webapp.heat import settings as heat_settings
 
+        # Task payload codec must be known to web and worker processes
+        codec.register()
+
+        # Hooks are referenced by name and imported on first use (see `heat.registry`),
+        # thus web processes do not import hooks needed by solver workers only.
         # noinspection PyPep8Naming
-        SETUP_FUNCTIONS = (  # noqa: N806
-            bd_hooks.init_parameters,
-            bd_hooks.init_flow_data,
-            bd_hooks.init_renovation_scenario,
-            bd_hooks.init_tabula_data,
-            bd_hooks.init_roof,
-            bd_hooks.init_renovation_data,
+        SETUP_FUNCTIONS = registry.hooks(  # noqa: N806
+            "init_parameters",
+            "init_profile_data_version",
+            "init_flow_data",
+            "init_renovation_scenario",
+            "init_tabula_data",
+            "init_roof",
+            "init_renovation_data",
         )
 
         # noinspection PyPep8Naming
-        PARAMETER_FUNCTIONS = (  # noqa: N806
-            bd_hooks.set_up_loads,
-            bd_hooks.set_up_volatiles,
-            bd_hooks.set_up_heatpumps,
-            bd_hooks.set_up_conversion_technologies,
-            bd_hooks.set_up_hotwater_supply,
-            bd_hooks.set_up_storages,
-            bd_hooks.unpack_oeprom,
+        PARAMETER_FUNCTIONS = registry.hooks(  # noqa: N806
+            "init_profiles",
+            "set_up_loads",
+            "set_up_volatiles",
+            "set_up_heatpumps",
+            "set_up_conversion_technologies",
+            "set_up_hotwater_supply",
+            "set_up_storages",
+            "bound_unbounded_capacities",
         )
 
-        for func in SETUP_FUNCTIONS:
-            hooks.register_hook(
-                hooks.HookType.SETUP,
-                hooks.Hook(scenario="oeprom", function=func),
-            )
+        # Hooks declare keys they read and write and are run as dependency graph with memoized outputs
+        hooks.register_hook(
+            hooks.HookType.SETUP,
+            hooks.Hook(
+                scenario="oeprom",
+                function=pipeline.HookPipeline("setup_pipeline", SETUP_FUNCTIONS, heat_settings.HOOK_WORKERS),
+            ),
+        )
+        hooks.register_hook(
+            hooks.HookType.PARAMETER,
+            hooks.Hook(
+                scenario="oeprom",
+                function=pipeline.HookPipeline("parameter_pipeline", PARAMETER_FUNCTIONS, heat_settings.HOOK_WORKERS),
+            ),
+        )
+        hooks.register_hook(
+            hooks.HookType.PARAMETER,
+            hooks.Hook(scenario="oeprom", function=registry.LazyHook("unpack_oeprom")),
+        )
 
-        for func in PARAMETER_FUNCTIONS:
-            hooks.register_hook(
-                hooks.HookType.PARAMETER,
-                hooks.Hook(scenario="oeprom", function=func),
-            )
+        hooks.register_hook(
+            hooks.HookType.ENERGYSYSTEM,
+            hooks.Hook(scenario="oeprom", function=registry.LazyHook("prune_energysystem")),
+        )
 
         if settings.DEBUG:
             hooks.register_hook(
                 hooks.HookType.ENERGYSYSTEM,
-                hooks.Hook(scenario="oeprom", function=bd_hooks.debug_input_data),
+                hooks.Hook(scenario="oeprom", function=registry.LazyHook("debug_input_data")),
             )
 
         hooks.register_hook(
             hooks.HookType.MODEL,
-            hooks.Hook(scenario="oeprom", function=bd_hooks.couple_battery_storage_to_pv_capacity),
+            hooks.Hook(scenario="oeprom", function=registry.LazyHook("couple_battery_storage_to_pv_capacity")),
+        )
+
+        hooks.register_hook(
+            hooks.HookType.MODEL,
+            hooks.Hook(scenario="oeprom", function=registry.LazyHook("record_model_statistics")),
         )
+
+        if settings.DEBUG:
+            hooks.register_hook(
+                hooks.HookType.MODEL,
+                hooks.Hook(scenario="oeprom", function=registry.LazyHook("report_scaling")),
+            )
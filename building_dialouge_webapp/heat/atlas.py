@@ -0,0 +1,206 @@
+"""Module to build and look up precomputed results (atlas) for common building archetypes."""
+
+from __future__ import annotations
+
+import itertools
+import json
+import logging
+from functools import cache
+from functools import lru_cache
+from typing import TYPE_CHECKING
+
+import numpy as np
+import pandas as pd
+from django_oemof import hooks
+
+from . import settings
+from . import tabula
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+    from collections.abc import Iterator
+    from pathlib import Path
+
+ATLAS_DIR = settings.DATA_DIR / "atlas"
+ATLAS_FILE = "atlas.json"
+SCENARIO = "oeprom"
+RENOVATION_SCENARIO = "scenario1"
+
+# Results calculated per atlas entry
+CALCULATIONS = ("invested_capacity", "total_system_costs")
+
+# Default archetype grid
+BUILDING_TYPES = tuple(settings.CONFIG["building_type"])
+NUMBER_PERSONS = (1, 2, 3, 4, 5)
+HEATINGS = (
+    ("heat_pump", "air_heat_pump"),
+    ("heat_pump", "groundwater"),
+    ("heat_pump", "geothermal_pump"),
+    ("gas_heating", ""),
+    ("district_heating", ""),
+    ("heating_rod", ""),
+    ("bhkw", ""),
+)
+
+# Columns of atlas entries which must match exactly
+CATEGORICAL_FEATURES = ("building_type", "primary_heating", "heat_pump_type")
+# Columns of atlas entries used for nearest-neighbour matching
+NUMERIC_FEATURES = ("construction_year_index", "number_persons")
+
+# Flow data shared by all archetypes; archetype features are set on top
+ARCHETYPE_FLOW_DATA = {
+    "monument_protection": "no",
+    "energy_source": "gas",
+    "solar_thermal_exists": "False",
+    "pv_exists": "False",
+    "flat_roof": "doesnt_exist",
+    "roof_orientation": "s",
+    "roof_inclination": 45,
+    "hotwater_supply": "instantaneous_water_heater",
+    f"{RENOVATION_SCENARIO}-secondary_heating": [],
+}
+
+
+def archetype_flow_data(
+    building_type: str,
+    construction_year: int,
+    number_persons: int,
+    primary_heating: str,
+    heat_pump_type: str = "",
+) -> dict:
+    """Return flow data of building archetype, no building part having been insulated after construction."""
+    return {
+        **ARCHETYPE_FLOW_DATA,
+        "building_type": building_type,
+        "construction_year": construction_year,
+        "number_persons": number_persons,
+        "insulation_choices": [],
+        f"{RENOVATION_SCENARIO}-primary_heating": primary_heating,
+        f"{RENOVATION_SCENARIO}-heat_pump_type": heat_pump_type,
+    }
+
+
+def archetype_grid(
+    building_types: Iterable[str] = BUILDING_TYPES,
+    construction_years: Iterable[int] = tabula.CONSTRUCTION_YEARS,
+    number_persons: Iterable[int] = NUMBER_PERSONS,
+    heatings: Iterable[tuple[str, str]] = HEATINGS,
+) -> Iterator[dict]:
+    """Yield flow data of all archetypes in given grid."""
+    for building_type, year, persons, (primary_heating, heat_pump_type) in itertools.product(
+        building_types,
+        construction_years,
+        number_persons,
+        heatings,
+    ):
+        yield archetype_flow_data(building_type, year, persons, primary_heating, heat_pump_type)
+
+
+def building_features(flow_data: dict, renovation_scenario: str) -> tuple[tuple[str, ...], tuple[float, ...]]:
+    """Extract categorical and numeric features used for atlas matching from flow data of given scenario."""
+    categorical = (
+        str(flow_data.get("building_type", "")),
+        str(flow_data.get(f"{renovation_scenario}-primary_heating", "")),
+        str(flow_data.get(f"{renovation_scenario}-heat_pump_type", "")),
+    )
+    numeric = (
+        float(tabula.nearest_year_index(flow_data["construction_year"])),
+        float(flow_data["number_persons"]),
+    )
+    return categorical, numeric
+
+
+def summarize(simulation_id: int) -> dict:
+    """Return compact (JSON-serializable) results of given simulation."""
+    # Solver stack is only imported when building atlas (see `heat.registry`)
+    # pylint: disable=C0415
+    from django_oemof import results
+
+    calculated = results.get_results(simulation_id, list(CALCULATIONS))
+    invested_capacity = calculated["invested_capacity"]
+    if isinstance(invested_capacity, pd.DataFrame):
+        invested_capacity = invested_capacity.iloc[:, 0]
+    return {
+        "invested_capacity": {
+            "-".join(map(str, np.atleast_1d(key))): float(value) for key, value in invested_capacity.items()
+        },
+        "total_system_costs": float(calculated["total_system_costs"].to_numpy().sum()),
+    }
+
+
+def solve_archetype(flow_data: dict) -> dict | None:
+    """Solve given archetype and return atlas entry; returns None if simulation is infeasible."""
+    # pylint: disable=C0415
+    from django_oemof import simulation
+
+    parameters = hooks.apply_hooks(
+        hook_type=hooks.HookType.SETUP,
+        scenario=SCENARIO,
+        data={"renovation_scenario": RENOVATION_SCENARIO, "django_htmx_flow": flow_data},
+    )
+    simulation_id = simulation.simulate_scenario(SCENARIO, json.loads(json.dumps(parameters, default=str)))
+    if simulation_id is None:
+        logging.warning("Atlas archetype %s is infeasible.", flow_data)
+        return None
+    categorical, numeric = building_features(flow_data, RENOVATION_SCENARIO)
+    return {
+        **dict(zip(CATEGORICAL_FEATURES, categorical, strict=True)),
+        **dict(zip(NUMERIC_FEATURES, numeric, strict=True)),
+        "simulation_id": simulation_id,
+        "results": summarize(simulation_id),
+    }
+
+
+class AtlasIndex:
+    """
+    Holds precomputed atlas entries and matches buildings to nearest entry.
+
+    Entries must share all categorical features (building type and heating) with the building;
+    among those, entry with least euclidean distance of numeric features is chosen.
+    """
+
+    def __init__(self, directory: Path):
+        self.entries = []
+        if (directory / ATLAS_FILE).exists():
+            self.entries = json.loads((directory / ATLAS_FILE).read_text(encoding="utf-8"))
+        else:
+            logging.warning("No atlas found at '%s'. Estimates are not available.", directory / ATLAS_FILE)
+        self.categories = np.array(
+            [[str(entry[feature]) for feature in CATEGORICAL_FEATURES] for entry in self.entries],
+            dtype=str,
+        ).reshape(len(self.entries), len(CATEGORICAL_FEATURES))
+        self.features = np.array(
+            [[float(entry[feature]) for feature in NUMERIC_FEATURES] for entry in self.entries],
+            dtype=float,
+        ).reshape(len(self.entries), len(NUMERIC_FEATURES))
+
+    @lru_cache(maxsize=1024)  # noqa: B019
+    def nearest_entry(self, categorical: tuple[str, ...], numeric: tuple[float, ...]) -> dict | None:
+        """Return nearest atlas entry for given building features or None if no entry matches."""
+        candidates = (self.categories == categorical).all(axis=1)
+        if not candidates.any():
+            return None
+        distances = np.linalg.norm(self.features[candidates] - np.array(numeric), axis=1)
+        return self.entries[int(np.flatnonzero(candidates)[np.argmin(distances)])]
+
+    def estimate(self, flow_data: dict, renovation_scenario: str) -> dict | None:
+        """Return preliminary results of nearest atlas entry for given renovation scenario."""
+        entry = self.nearest_entry(*building_features(flow_data, renovation_scenario))
+        if entry is None:
+            return None
+        return {"preliminary": True, "results": entry["results"]}
+
+
+def write_atlas(entries: Iterable[dict], directory: Path = ATLAS_DIR) -> Path:
+    """Store atlas entries and reset loaded atlas."""
+    directory.mkdir(parents=True, exist_ok=True)
+    path = directory / ATLAS_FILE
+    path.write_text(json.dumps(list(entries)), encoding="utf-8")
+    get_atlas.cache_clear()
+    return path
+
+
+@cache
+def get_atlas() -> AtlasIndex:
+    """Return atlas, which is loaded on first use."""
+    return AtlasIndex(ATLAS_DIR)
@@ -0,0 +1,128 @@
+"""
+Module to export profiles into a read-only memory-mapped bundle.
+
+All stored profiles are written into one binary file (float32, one row of fixed stride per profile) together
+with an index mapping profile keys to rows (see management command `build_profile_bundle`).
+Every process opens the bundle via `np.memmap`, thus profile pages are held once by the OS page cache and shared
+by web, Celery and process-pool workers instead of being copied into each process.
+
+Profiles of each weather region are bundled separately (profiles not depending on weather into common bundle).
+Regional bundles are opened on first use and held by a bounded LRU per process, thus startup cost and
+mapped memory do not grow with number of regions.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+from functools import lru_cache
+from typing import TYPE_CHECKING
+from typing import Any
+
+import numpy as np
+
+from . import settings
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+    from pathlib import Path
+
+BUNDLE_DIR = settings.DATA_DIR / "bundle"
+COMMON = "common"  # bundle of profiles not depending on weather region
+INDEX_FILE = "profiles.json"
+DTYPE = "float32"
+STRIDE = 8760  # hours of a year
+
+ProfileKey = tuple[str, tuple[Any, ...]]
+
+
+def bundle_dir(region: str | None = None) -> Path:
+    """Return directory of bundle holding profiles of given region (or common profiles if region is None)."""
+    return BUNDLE_DIR / (region or COMMON)
+
+
+def write_bundle(profiles: Iterable[tuple[ProfileKey, Iterable[float]]], directory: Path) -> Path:
+    """
+    Write profiles into bundle file and index; returns path of index.
+
+    Identical profiles are stored once and share their row.
+    Bundle file is named by its checksum and index is replaced last, thus processes never open
+    an index together with a bundle file it does not belong to. Processes keep using bundles opened before.
+    """
+    directory.mkdir(parents=True, exist_ok=True)
+    tmp_path = directory / "profiles.tmp"
+    checksum = hashlib.sha256()
+    rows = []
+    digests = {}
+    with tmp_path.open("wb") as f:
+        for (model_name, values), profile in profiles:
+            data = np.asarray(profile, dtype=DTYPE)
+            if data.shape != (STRIDE,):
+                error_msg = f"Profile {model_name}{values} has shape {data.shape}, but bundle stride is {STRIDE}."
+                raise ValueError(error_msg)
+            digest = hashlib.sha256(data.tobytes()).digest()
+            if digest not in digests:
+                digests[digest] = len(digests)
+                f.write(data.tobytes())
+                checksum.update(data.tobytes())
+            rows.append([model_name, list(values), digests[digest]])
+    if not rows:
+        tmp_path.unlink()
+        error_msg = "No profiles found to bundle."
+        raise ValueError(error_msg)
+
+    bundle_file = f"profiles-{checksum.hexdigest()[:16]}.{DTYPE}"
+    tmp_path.replace(directory / bundle_file)
+    index = {"file": bundle_file, "dtype": DTYPE, "stride": STRIDE, "size": len(digests), "profiles": rows}
+    tmp_index = directory / f"{INDEX_FILE}.tmp"
+    tmp_index.write_text(json.dumps(index), encoding="utf-8")
+    tmp_index.replace(directory / INDEX_FILE)
+    for path in directory.glob(f"profiles-*.{DTYPE}"):
+        if path.name != bundle_file:
+            path.unlink()
+    get_bundle.cache_clear()
+    logging.info("Bundled %s profiles (%s distinct) into '%s'.", len(rows), len(digests), directory / bundle_file)
+    return directory / INDEX_FILE
+
+
+class ProfileBundle:
+    """Read-only view on memory-mapped profiles; profiles are returned as views, never copied."""
+
+    def __init__(self, directory: Path):
+        index = json.loads((directory / INDEX_FILE).read_text(encoding="utf-8"))
+        self.rows: dict[ProfileKey, int] = {
+            (model_name, tuple(values)): row for model_name, values, row in index["profiles"]
+        }
+        self.profiles = np.memmap(
+            directory / index["file"],
+            dtype=index["dtype"],
+            mode="r",
+            shape=(index["size"], index["stride"]),
+        )
+
+    def __contains__(self, key: ProfileKey) -> bool:
+        return key in self.rows
+
+    def __len__(self) -> int:
+        return len(self.rows)
+
+    def get(self, key: ProfileKey) -> np.ndarray | None:
+        row = self.rows.get(key)
+        if row is None:
+            return None
+        return self.profiles[row]
+
+    def keys(self, model_name: str) -> list[tuple[Any, ...]]:
+        """Return values of all bundled profiles of given profile model."""
+        return [values for name, values in self.rows if name == model_name]
+
+
+@lru_cache(maxsize=settings.REGION_CACHE_SIZE)
+def get_bundle(region: str | None = None) -> ProfileBundle | None:
+    """Return bundle of given region, which is opened on first use, or None if no bundle has been built."""
+    directory = bundle_dir(region)
+    if not (directory / INDEX_FILE).exists():
+        logging.info("No profile bundle found at '%s'. Profiles are read from DB.", directory)
+        return None
+    return ProfileBundle(directory)
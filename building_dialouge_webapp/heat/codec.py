@@ -0,0 +1,132 @@
+"""
+Module holding compact binary codec for payloads of Celery tasks.
+
+Payloads are packed with msgpack (no pickle, thus no code is executed on decoding).
+NumPy arrays and pandas series are packed as raw buffers (floats keep float64, as payloads hold simulation
+parameters). Large arrays (i.e. profiles) are not sent within the payload, but as content-addressed references:
+the encoding process stores the packed array in the shared Django cache under its hash, the decoding worker
+resolves it from its local profile cache or, if missing, from the Django cache. If Django cache is not shared
+between processes (e.g. local memory cache) or storing fails, arrays are sent inline.
+"""
+
+from __future__ import annotations
+
+import hashlib
+from typing import Any
+
+import msgpack
+import numpy as np
+import pandas as pd
+from django.core.cache import cache
+from django.core.cache import caches
+from django.core.cache.backends.dummy import DummyCache
+from django.core.cache.backends.locmem import LocMemCache
+from kombu import serialization
+
+from . import settings
+from .profiles import ProfileCache
+
+SERIALIZER = "bd-msgpack"
+CONTENT_TYPE = "application/x-bd-msgpack"
+
+EXT_ARRAY = 1
+EXT_SERIES = 2
+EXT_REFERENCE = 3
+
+# Local cache of decoded arrays by content hash
+PAYLOAD_CACHE = ProfileCache(maxsize=settings.PROFILE_CACHE_SIZE)
+
+
+def reference_key(digest: str) -> str:
+    return f"heat:payload:{digest}"
+
+
+def shared_cache() -> bool:
+    """Return True if Django cache is shared between processes, thus it can hold referenced arrays."""
+    return not isinstance(caches["default"], LocMemCache | DummyCache)
+
+
+def pack_array(array: np.ndarray) -> bytes:
+    """Pack array as (dtype, shape, buffer); floats are packed as float64."""
+    array = np.asarray(array)
+    if array.dtype.kind == "f":
+        array = array.astype("<f8")
+    elif array.dtype.kind not in "iub":
+        error_msg = f"Arrays of dtype '{array.dtype}' cannot be encoded."
+        raise TypeError(error_msg)
+    return msgpack.packb([array.dtype.str, list(array.shape), np.ascontiguousarray(array).tobytes()])
+
+
+def unpack_array(data: bytes) -> np.ndarray:
+    dtype, shape, buffer = msgpack.unpackb(data)
+    return np.frombuffer(buffer, dtype=np.dtype(dtype)).reshape(shape)
+
+
+def encode_array(array: np.ndarray) -> msgpack.ExtType:
+    """Encode array inline or, if large and shared cache is available, as reference to array stored in cache."""
+    packed = pack_array(array)
+    if np.asarray(array).size < settings.PAYLOAD_REFERENCE_MIN_SIZE or not shared_cache():
+        return msgpack.ExtType(EXT_ARRAY, packed)
+    digest = hashlib.sha256(packed).hexdigest()
+    if PAYLOAD_CACHE.get(digest) is None:
+        cache.set(reference_key(digest), packed, settings.PAYLOAD_REFERENCE_TIMEOUT)
+        # Cache errors may be ignored (see IGNORE_EXCEPTIONS of redis cache), thus storing is checked
+        if not cache.touch(reference_key(digest), settings.PAYLOAD_REFERENCE_TIMEOUT):
+            return msgpack.ExtType(EXT_ARRAY, packed)
+        PAYLOAD_CACHE.set(digest, unpack_array(packed))
+    return msgpack.ExtType(EXT_REFERENCE, digest.encode())
+
+
+def resolve_reference(digest: str) -> np.ndarray:
+    """Return array by content hash from local cache or shared Django cache."""
+    array = PAYLOAD_CACHE.get(digest)
+    if array is None:
+        packed = cache.get(reference_key(digest))
+        if packed is None:
+            error_msg = f"Referenced array '{digest}' not found in cache."
+            raise KeyError(error_msg)
+        array = unpack_array(packed)
+        PAYLOAD_CACHE.set(digest, array)
+    # Decoded arrays must not share memory with cached (read-only) arrays
+    return array.copy()
+
+
+def _default(obj: Any) -> Any:
+    if isinstance(obj, pd.Series):
+        if not isinstance(obj.index, pd.RangeIndex) or obj.index.start != 0 or obj.index.step != 1:
+            error_msg = "Only series with default (range) index can be encoded."
+            raise TypeError(error_msg)
+        return msgpack.ExtType(EXT_SERIES, msgpack.packb([obj.name, encode_array(obj.to_numpy())], default=_default))
+    if isinstance(obj, np.ndarray):
+        return encode_array(obj)
+    if isinstance(obj, np.generic):
+        return obj.item()
+    error_msg = f"Object of type '{type(obj).__name__}' cannot be encoded."
+    raise TypeError(error_msg)
+
+
+def _ext_hook(code: int, data: bytes) -> Any:
+    if code == EXT_ARRAY:
+        return unpack_array(data).copy()
+    if code == EXT_REFERENCE:
+        return resolve_reference(data.decode())
+    if code == EXT_SERIES:
+        name, values = msgpack.unpackb(data, ext_hook=_ext_hook, raw=False)
+        return pd.Series(values, name=name)
+    error_msg = f"Unknown msgpack extension type {code}."
+    raise ValueError(error_msg)
+
+
+def encode(obj: Any) -> bytes:
+    """Encode task payload."""
+    return msgpack.packb(obj, default=_default, use_bin_type=True)
+
+
+def decode(data: bytes) -> Any:
+    """Decode task payload."""
+    return msgpack.unpackb(data, ext_hook=_ext_hook, raw=False, strict_map_key=False)
+
+
+def register():
+    """Register codec as kombu serializer (must be called in web and worker processes)."""
+    serialization.register(SERIALIZER, encode, decode, content_type=CONTENT_TYPE, content_encoding="binary")
@@ -0,0 +1,78 @@
+"""
+Module to synthesize hourly heat pump COP for arbitrary supply (flow) temperatures.
+
+COP is modelled as Carnot COP scaled by a quality grade: COP = quality grade * T_supply / (T_supply - T_source).
+Quality grade and hourly source temperature (ambient air, water or brine) are calibrated per region and medium
+from COP profiles stored for two supply temperatures (VL40C and VL75C), thus no temperature data is needed:
+per hour, the difference of both supply temperatures equals quality grade times the difference of T/COP.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+
+import numpy as np
+
+KELVIN = 273.15
+STORED_SUPPLY_TEMPERATURES = (40, 75)  # in °C; supply temperatures of stored heatpump profiles
+MIN_LIFT = 10  # in K; minimum temperature lift, limits COP if source is about as warm as supply
+
+
+def type_temperature(supply_temperature: float) -> str:
+    """Return type temperature (as used in heatpump profile keys) for supply temperature in °C."""
+    return f"VL{supply_temperature:g}C"
+
+
+def supply_temperature(type_temperature: str) -> float:
+    """Return supply temperature in °C from type temperature, e.g. 'VL55C'."""
+    return float(type_temperature.removeprefix("VL").removesuffix("C"))
+
+
+def carnot_cop(source_temperature: np.ndarray, supply_temperature: float, quality_grade: float) -> np.ndarray:
+    """Return hourly COP for source temperatures (in K) and supply temperature (in °C)."""
+    supply = supply_temperature + KELVIN
+    return quality_grade * supply / np.maximum(supply - source_temperature, MIN_LIFT)
+
+
+@dataclass(frozen=True)
+class Calibration:
+    """Quality grade and hourly source temperature (in K) of heat pumps of one medium in one region."""
+
+    quality_grade: float
+    source_temperature: np.ndarray
+
+    def cop(self, supply_temperature: float) -> np.ndarray:
+        return carnot_cop(self.source_temperature, supply_temperature, self.quality_grade)
+
+
+def calibrate(profiles: dict[float, np.ndarray]) -> Calibration:
+    """
+    Calibrate Carnot model from COP profiles stored for (at least two) supply temperatures (in °C).
+
+    Quality grade is fitted by least squares over all hours and pairs of supply temperatures,
+    source temperature is averaged over estimates from all profiles. Hours without valid COP are interpolated.
+    """
+    if len(profiles) < 2:  # noqa: PLR2004
+        error_msg = "At least two COP profiles of different supply temperatures are needed for calibration."
+        raise ValueError(error_msg)
+    supplies = np.array([temperature + KELVIN for temperature in profiles])
+    cops = np.stack([np.asarray(profile, dtype=float) for profile in profiles.values()])
+    with np.errstate(divide="ignore", invalid="ignore"):
+        # T / COP = (T - T_source) / quality grade
+        ratios = np.where(np.isfinite(cops) & (cops > 0), supplies[:, None] / cops, np.nan)
+    lifts = supplies[1:, None] - supplies[0]
+    slopes = ratios[1:] - ratios[0]
+    valid = np.isfinite(slopes)
+    if not valid.any():
+        error_msg = "COP profiles hold no valid values for calibration."
+        raise ValueError(error_msg)
+    quality_grade = float(np.sum((lifts * slopes)[valid]) / np.sum(slopes[valid] ** 2))
+    estimates = supplies[:, None] - quality_grade * ratios
+    counts = np.isfinite(estimates).sum(axis=0)
+    source = np.where(counts > 0, np.nansum(estimates, axis=0) / np.maximum(counts, 1), np.nan)
+    missing = np.isnan(source)
+    if missing.any():
+        hours = np.arange(len(source))
+        source[missing] = np.interp(hours[missing], hours[~missing], source[~missing])
+    source.setflags(write=False)
+    return Calibration(quality_grade, source)
@@ -0,0 +1,170 @@
+"""
+Module to predict solve durations and queue ETAs from recorded simulation statistics.
+
+For each simulation, model size (components, expandable components, time steps), solver and wall time are
+recorded (see `heat.tasks`). Wall time is fitted by least squares as linear in model size
+(time steps times components and time steps times expandables).
+Before simulation, model size is not known yet; it is taken from recorded simulations with same technologies.
+"""
+
+from __future__ import annotations
+
+import logging
+import time
+from dataclasses import dataclass
+from typing import TYPE_CHECKING
+
+import numpy as np
+from celery import current_task
+from django.core.cache import cache
+
+from . import models
+from . import queues
+from . import settings
+
+if TYPE_CHECKING:
+    from oemof import solph
+
+SOLVER = "cbc"  # solver used by django_oemof
+PREFIX = "heat:eta"
+
+# Start times and model sizes of simulations running in current worker process by task ID
+STARTED: dict[str, float] = {}
+PENDING_STATISTICS: dict[str, dict[str, int]] = {}
+
+
+def technologies(flow_data: dict) -> str:
+    """Return signature of technologies chosen in renovation scenario (flow data of setup parameters)."""
+    chosen = {
+        flow_data.get("scenario-primary_heating", ""),
+        flow_data.get("scenario-heat_pump_type", ""),
+        *flow_data.get("scenario-secondary_heating", []),
+    }
+    return ",".join(sorted(technology for technology in chosen if technology))
+
+
+def model_statistics(model: solph.Model) -> dict[str, int]:
+    """Return size of built model."""
+    nodes = model.es.nodes
+    expandables = sum(
+        getattr(node, "investment", None) is not None
+        or any(flow.investment is not None for flow in node.outputs.values())
+        for node in nodes
+    )
+    return {"components": len(nodes), "expandables": expandables, "timesteps": len(model.TIMESTEPS)}
+
+
+def collect(model: solph.Model):
+    """Collect size of model built by current simulation task."""
+    if not current_task or current_task.request.id is None:
+        return
+    PENDING_STATISTICS[current_task.request.id] = model_statistics(model)
+
+
+def start(task_id: str):
+    STARTED[task_id] = time.perf_counter()
+
+
+def record(task_id: str, scenario: str, parameters: dict, *args, **kwargs):
+    """Store statistics of finished simulation task."""
+    started = STARTED.pop(task_id, None)
+    statistics = PENDING_STATISTICS.pop(task_id, None)
+    # No model is built if simulation has been restored from DB
+    if started is None or statistics is None:
+        return
+    models.SimulationStatistics.objects.create(
+        scenario=scenario,
+        technologies=technologies(parameters.get("flow_data", {})),
+        solver=SOLVER,
+        wall_time=time.perf_counter() - started,
+        **statistics,
+    )
+
+
+def design(components, expandables, timesteps) -> np.ndarray:
+    components, expandables, timesteps = (
+        np.atleast_1d(np.asarray(x, dtype=float)) for x in (components, expandables, timesteps)
+    )
+    return np.column_stack([np.ones_like(components), timesteps * components, timesteps * expandables])
+
+
+@dataclass
+class DurationPredictor:
+    """Linear model of solve wall time in model size, together with typical model sizes per technologies."""
+
+    coefficients: np.ndarray | None
+    sizes: dict[str, tuple[float, float, float]]
+    mean_duration: float
+
+    @property
+    def has_statistics(self) -> bool:
+        return bool(self.sizes)
+
+    @classmethod
+    def fit(cls, statistics: list[dict]) -> DurationPredictor:
+        if not statistics:
+            return cls(None, {}, settings.ETA_DEFAULT_DURATION)
+        x = design(*zip(*((s["components"], s["expandables"], s["timesteps"]) for s in statistics), strict=True))
+        y = np.array([s["wall_time"] for s in statistics])
+        coefficients = None
+        # Fit is underdetermined if too few or only identical models have been recorded
+        if np.linalg.matrix_rank(x) == x.shape[1]:
+            coefficients, *_ = np.linalg.lstsq(x, y, rcond=None)
+        sizes = {}
+        for signature in {s["technologies"] for s in statistics}:
+            rows = [s for s in statistics if s["technologies"] == signature]
+            sizes[signature] = tuple(
+                float(np.mean([s[key] for s in rows])) for key in ("components", "expandables", "timesteps")
+            )
+        return cls(coefficients, sizes, float(y.mean()))
+
+    def predict(self, signature: str) -> float:
+        """Return predicted wall time (in seconds) of simulation with given technologies."""
+        if self.coefficients is None or signature not in self.sizes:
+            return self.mean_duration
+        return max(float((design(*self.sizes[signature]) @ self.coefficients)[0]), 0.0)
+
+
+def get_predictor() -> DurationPredictor:
+    """Return predictor fitted from recent statistics; predictor is refitted after cache timeout."""
+    predictor = cache.get(f"{PREFIX}:predictor")
+    if predictor is None:
+        statistics = list(
+            models.SimulationStatistics.objects.filter(solver=SOLVER)
+            .order_by("-created")
+            .values("technologies", "components", "expandables", "timesteps", "wall_time")[: settings.ETA_HISTORY],
+        )
+        predictor = DurationPredictor.fit(statistics)
+        cache.set(f"{PREFIX}:predictor", predictor, settings.ETA_REFIT_TIMEOUT)
+    return predictor
+
+
+def schedule(parameters: dict) -> tuple[str, float]:
+    """
+    Return queue (lane) and predicted duration for simulation with given setup parameters.
+
+    As long as no statistics have been recorded, duration is a mere assumption, thus simulations stay in
+    interactive lane.
+    """
+    predictor = get_predictor()
+    duration = predictor.predict(technologies(parameters.get("flow_data", {})))
+    if predictor.has_statistics and duration > settings.ETA_BATCH_THRESHOLD:
+        return queues.BATCH_QUEUE, duration
+    return queues.INTERACTIVE_QUEUE, duration
+
+
+def register(task_id: str, queue: str, duration: float):
+    """Store expected finish time of submitted task, derived from queue depth and predicted durations."""
+    waiting = queues.recent_queue_depths().get(queue, 0)
+    wait = waiting * get_predictor().mean_duration / settings.ETA_WORKER_CONCURRENCY
+    finish = time.time() + wait + duration
+    cache.set(f"{PREFIX}:task:{task_id}", finish, settings.SINGLE_FLIGHT_TIMEOUT)
+    logging.info("Expecting task #%s in queue '%s' to finish in %.0f s.", task_id, queue, finish - time.time())
+
+
+def remaining(task_id: str) -> float | None:
+    """Return expected remaining time (in seconds) of task or None if unknown."""
+    finish = cache.get(f"{PREFIX}:task:{task_id}")
+    if finish is None:
+        return None
+    return max(finish - time.time(), 0.0)
@@ -1,41 +1,62 @@
+from pathlib import Path
+
 import pandas as pd
-from django.conf import settings
 
+from . import regions
 
-def full_path(filename):
-    return settings.DATA_DIR / "profiles" / f"hourly_{filename}"
 
+def full_path(filename, region=regions.DEFAULT_REGION):
+    return regions.profile_dir(region) / f"hourly_{filename}"
 
-cop_air_path = full_path("profile_cop_air_raw.csv")
-cop_water_path = full_path("profile_cop_water_raw.csv")
-cop_brine_path = full_path("profile_cop_brine_raw.csv")
 
+# Profiles not depending on weather are shared by all regions
 hotwater_pp_path = full_path("profile_hotwater_raw.csv")
 
 load_path = full_path("profile_load_raw.csv")
-heat_path = full_path("profile_heat_raw.csv")
 
-pv_path = full_path("profile_PV_raw.csv")
 
-sth_heat_path = full_path("profile_STH_heat_raw.csv")
-sth_load_path = full_path("profile_STH_load_raw.csv")
+# Raw file and column of each profile
+
+
+def cop_source(medium: str, type_temp: str, region: str = regions.DEFAULT_REGION) -> tuple[Path, str]:
+    return full_path(f"profile_cop_{medium}_raw.csv", region), f"COP-{medium.capitalize()}-{type_temp}"
+
+
+def hotwater_source(number_people: int) -> tuple[Path, str]:
+    return hotwater_pp_path, f"HW-{number_people}P-60C"
+
+
+def load_source(number_people: int, eec: int) -> tuple[Path, str]:
+    return load_path, f"EL-SEK{eec}P{number_people}"
+
+
+def photovoltaic_source(elev_angle: int, direc_angle: int, region: str = regions.DEFAULT_REGION) -> tuple[Path, str]:
+    return full_path("profile_PV_raw.csv", region), f"PV-H{elev_angle}-A{direc_angle}"
+
+
+def solarthermal_source(
+    type_sth: str,
+    type_temp: int,
+    elev_angle: int,
+    direc_angle: int,
+    region: str = regions.DEFAULT_REGION,
+) -> tuple[Path, str]:
+    # csv files STH_load and STH_heat have the same column names atm
+    return full_path(f"profile_STH_{type_sth}_raw.csv", region), f"STH-VL{type_temp}-H{elev_angle}-A{direc_angle}"
+
+
+def heat_source(region: str = regions.DEFAULT_REGION) -> tuple[Path, str]:
+    return full_path("profile_heat_raw.csv", region), "profile_heat"
 
 
-def coefficient_of_performance(medium: str, type_temp: str) -> pd.Series:
+def coefficient_of_performance(medium: str, type_temp: str, region: str = regions.DEFAULT_REGION) -> pd.Series:
     """
     This function returns the coefficient of
-    performance (COP) depending on medium and type (temperature dependent).
+    performance (COP) depending on medium and type (temperature dependent) in given weather region.
 
     Allowed mediums: 'air', 'water', 'brine'
     Allowed type of temperature dependency: 'VL75C', 'VL40C'
     """
-    # file paths corresponding to medium
-    medium_paths = {
-        "air": cop_air_path,
-        "water": cop_water_path,
-        "brine": cop_brine_path,
-    }
-
     # dicts for checking allowed types
     allowed_medium = {"air", "water", "brine"}
     allowed_type_temp = {"VL75C", "VL40C"}
@@ -49,10 +70,8 @@ def coefficient_of_performance(medium: str, type_temp: str) -> pd.Series:
         raise ValueError(msg)
 
     # read csv-file according to medium given
-    df_medium = pd.read_csv(medium_paths[medium])
-
-    # column name for column to be read
-    column_name = f"COP-{medium.capitalize()}-{type_temp}"
+    path, column_name = cop_source(medium, type_temp, region)
+    df_medium = pd.read_csv(path)
 
     # checking coulmn name
     if column_name not in df_medium.columns:
@@ -83,7 +102,7 @@ def hotwater_per_person(number_people: int) -> pd.Series:
         raise ValueError(msg)
 
     # column name for column to be read
-    column_name = f"HW-{number_people}P-60C"
+    _, column_name = hotwater_source(number_people)
 
     # checking column name
     if column_name not in df_hotwater.columns:
@@ -120,7 +139,7 @@ def load(number_people: int, eec: int) -> pd.Series:
         raise ValueError(msg)
 
     # column name for column to be read
-    column_name = f"EL-SEK{eec}P{number_people}"
+    _, column_name = load_source(number_people, eec)
 
     # checking coulmn name
     if column_name not in df_load.columns:
@@ -132,11 +151,11 @@ def load(number_people: int, eec: int) -> pd.Series:
     return df_load[column_name]
 
 
-def photovoltaic(elev_angle: int, direc_angle: int) -> pd.Series:
+def photovoltaic(elev_angle: int, direc_angle: int, region: str = regions.DEFAULT_REGION) -> pd.Series:
     """
     This function returns the energy output from
     photovoltaics per elevation angle, directional angle
-    and type.
+    and type in given weather region.
 
     Allowed elevation angles: 0, 10, 20, 30, 40, 45, 50, 60, 70, 80, 90
     Allowed directional angle: 0, 120, 150, 180, 210, 240, 270, 30, 300, 330, 360, 60, 90
@@ -144,7 +163,8 @@ def photovoltaic(elev_angle: int, direc_angle: int) -> pd.Series:
     # what about type?
 
     # read csv-file
-    df_pv = pd.read_csv(pv_path)
+    path, column_name = photovoltaic_source(elev_angle, direc_angle, region)
+    df_pv = pd.read_csv(path)
 
     # dicts for checking allowed types
     allowed_elev_angle = {0, 10, 20, 30, 40, 45, 50, 60, 70, 80, 90}
@@ -159,9 +179,6 @@ def photovoltaic(elev_angle: int, direc_angle: int) -> pd.Series:
         msg = f"Invalid directional angle {direc_angle}. Allowed directional angles: {allowed_direc_angle}"
         raise ValueError(msg)
 
-    # column name for column to be read
-    column_name = f"PV-H{elev_angle}-A{direc_angle}"
-
     # checking coulmn name
     if column_name not in df_pv.columns:
         msg = f"Invalid elevation angle {elev_angle} for chosen directional angle {direc_angle}. \
@@ -172,25 +189,23 @@ def photovoltaic(elev_angle: int, direc_angle: int) -> pd.Series:
     return df_pv[column_name]
 
 
-def solarthermal(type_sth: str, type_temp: int, elev_angle: int, direc_angle: int) -> pd.Series:
+def solarthermal(
+    type_sth: str,
+    type_temp: int,
+    elev_angle: int,
+    direc_angle: int,
+    region: str = regions.DEFAULT_REGION,
+) -> pd.Series:
     """
     This function returns the energy output from
     solarthermal per elevation angle, directional angle
-    and type (temperature dependent).
+    and type (temperature dependent) in given weather region.
 
     Allowed type of solarthermal: 'heat', 'load'
     Alowed type depending on temperature: 40, 75
     Allowed elevation angles: 0, 10, 20, 30, 40, 45, 50, 60, 70, 80, 90
     Allowed directional angle: 0, 120, 150, 180, 210, 240, 270, 30, 300, 330, 360, 60, 90
     """
-    # csv files STH_load and STH_heat have the same column names atm
-    # file paths corresponding to type
-
-    type_paths = {
-        "load": sth_load_path,
-        "heat": sth_heat_path,
-    }
-
     # dicts for checking allowed types
     alllowed_type = {"heat", "load"}
     allowed_type_temp = {40, 75}
@@ -212,10 +227,8 @@ def solarthermal(type_sth: str, type_temp: int, elev_angle: int, direc_angle: in
         raise ValueError(msg)
 
     # read csv-file according to type given
-    df_sth = pd.read_csv(type_paths[type_sth])
-
-    # column name for column to be read
-    column_name = f"STH-VL{type_temp}-H{elev_angle}-A{direc_angle}"
+    path, column_name = solarthermal_source(type_sth, type_temp, elev_angle, direc_angle, region)
+    df_sth = pd.read_csv(path)
 
     # checking coulmn name
     if column_name not in df_sth.columns:
@@ -227,6 +240,7 @@ def solarthermal(type_sth: str, type_temp: int, elev_angle: int, direc_angle: in
     return df_sth[column_name]
 
 
-def heat() -> pd.Series:
-    """Read-in heat profile."""
-    return pd.read_csv(heat_path)["profile_heat"]
+def heat(region: str = regions.DEFAULT_REGION) -> pd.Series:
+    """Read-in heat profile of given weather region."""
+    path, column_name = heat_source(region)
+    return pd.read_csv(path)[column_name]
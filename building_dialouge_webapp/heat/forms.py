@@ -3,6 +3,7 @@ import json
 from django import forms
 from django.core.validators import MaxValueValidator
 from django.core.validators import MinValueValidator
+from django.core.validators import RegexValidator
 from django.forms.widgets import RadioSelect
 
 
@@ -86,6 +87,12 @@ class BuildingDetailsForm(ValidationForm):
         label="Anzahl Personen",
         widget=forms.NumberInput(attrs={"class": "form-control"}),
     )
+    postcode = forms.CharField(
+        label="Postleitzahl",
+        required=False,
+        validators=[RegexValidator(r"^\d{5}$", "Bitte geben Sie eine fünfstellige Postleitzahl ein.")],
+        widget=forms.TextInput(attrs={"class": "form-control", "inputmode": "numeric"}),
+    )
 
     def validate_with_session(self):
         min_max_defaults = {
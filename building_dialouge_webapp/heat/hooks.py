@@ -1,22 +1,42 @@
+"""
+Hooks to set up parameters, energysystem and model of oeprom scenario.
+
+Hooks are registered lazily by dotted path (see `heat.registry`); as SETUP hooks run in web processes,
+modules only needed by hooks run in solver workers (e.g. `heat.spaceheat`, `heat.eta`, `heat.pruning`) are
+imported within these hooks.
+"""
+
 import inspect
-import json
+import logging
+import math
 
-import numpy as np
 import pandas as pd
 from django.http import HttpRequest
-from django_oemof.simulation import SimulationError
-from oemof import solph
-from pyomo.environ import BuildAction
-from pyomo.environ import Constraint
 
 from . import flows
-from . import models
+from . import pipeline
+from . import profiles
+from . import renovations
 from . import settings
+from . import tabula
+
+# Heating technologies from flow mapped to oeprom component
+CONVERSION_TECHNOLOGIES = {
+    "wood_pellets": "conversion_pk",
+    "wood_chips": "conversion_hgk",
+    "firewood": "conversion_shk",
+    "gas_heating": "conversion_boiler",
+    "heating_rod": "conversion_ehz",
+    "bhkw": "backpressure_bhkw",
+}
 
-# As inf cannot be set, we instead use a very large value
-OEMOF_INF_EQUIVALENT = 100000000
+# Capacity of components which are not limited (and not optimized);
+# replaced by a finite, well-scaled bound in `bound_unbounded_capacities`
+UNBOUNDED_CAPACITY = math.inf
+HOURS_PER_YEAR = 8760
 
 
+@pipeline.declare(writes=("flow_data", "renovation_data", "oeprom", "config"))
 def init_parameters(scenario: str, parameters: dict, request: HttpRequest) -> dict:
     """Set up structure of parameters used in hooks."""
     structure = {"flow_data": {}, "renovation_data": {}, "oeprom": {}, "config": settings.CONFIG}
@@ -24,6 +44,14 @@ def init_parameters(scenario: str, parameters: dict, request: HttpRequest) -> di
     return parameters
 
 
+@pipeline.declare(writes=("profile_data_version",), memoize=False)
+def init_profile_data_version(scenario: str, parameters: dict, request: HttpRequest) -> dict:
+    """Set version of stored profiles, thus simulations are not reused after profiles have been re-imported."""
+    parameters["profile_data_version"] = profiles.data_version()
+    return parameters
+
+
+@pipeline.declare(reads=("django_htmx_flow",), writes=("flow_data", "django_htmx_flow"), memoize=False)
 def init_flow_data(scenario: str, parameters: dict, request: HttpRequest) -> dict:
     """Read flow data from session."""
 
@@ -42,6 +70,9 @@ def init_flow_data(scenario: str, parameters: dict, request: HttpRequest) -> dic
 
     for name, flow in all_flows:
         if not flow.finished(request):
+            # pylint: disable=C0415
+            from django_oemof.simulation import SimulationError
+
             message = f"Flow '{name}' is not completed."
             raise SimulationError(message)
 
@@ -52,6 +83,9 @@ def init_flow_data(scenario: str, parameters: dict, request: HttpRequest) -> dic
         if flow.finished(request):
             scenario_id += 1
             break
+        # pylint: disable=C0415
+        from django_oemof.simulation import SimulationError
+
         message = "No completed 'RenovationRequestFlow' scenarios found."
         raise SimulationError(message)
 
@@ -59,6 +93,7 @@ def init_flow_data(scenario: str, parameters: dict, request: HttpRequest) -> dic
     return parameters
 
 
+@pipeline.declare(reads=("renovation_scenario", "flow_data"), writes=("renovation_scenario", "flow_data"))
 def init_renovation_scenario(
     scenario: str,
     parameters: dict,
@@ -90,91 +125,101 @@ def init_renovation_scenario(
     return parameters
 
 
+@pipeline.declare(reads=("flow_data.building_type", "flow_data.construction_year"), writes=("tabula_data",))
 def init_tabula_data(scenario: str, parameters: dict, request: HttpRequest) -> dict:
-    """Get tabula building."""
-
-    building_type = settings.CONFIG["building_type"][parameters["flow_data"]["building_type"]]
-
-    # Get nearest available year using absolut difference
-    year_diff = [
-        abs(year - parameters["flow_data"]["construction_year"]) for year in settings.CONFIG["construction_years"]
-    ]
-    year_index = int(np.argmin(year_diff)) + 1
-    if building_type == "TH" and year_index == 1:
-        # There is no building data for "DE.N.TH.01."
-        year_index = 2
-
-    building_reference = f"DE.N.{building_type}.{year_index:02}."
-    parameters["tabula_data"] = settings.TABULA_DATA[building_reference].to_dict()
-
-    # Set flow temperature depending on heating system (i.e. radiators/floorheating)
-    parameters["tabula_data"]["flow_temperature"] = settings.CONFIG["flow_temperature"][
-        parameters["tabula_data"]["HeatingSystem_Emission"]
-    ]
-
-    # Set available roof area
-    parameters["tabula_data"]["roof_area_available"] = (
-        float(parameters["tabula_data"]["roof_area_tabula"]) * settings.CONFIG["roof_usage"]
+    """Get tabula building (including flow temperature and available roof area)."""
+    parameters["tabula_data"] = tabula.get_tabula_data(
+        parameters["flow_data"]["building_type"],
+        parameters["flow_data"]["construction_year"],
     )
-
     return parameters
 
 
+@pipeline.declare(
+    reads=("flow_data.flat_roof", "flow_data.roof_inclination", "flow_data.roof_orientation"),
+    writes=("flow_data.elevation", "flow_data.direction"),
+)
 def init_roof(scenario: str, parameters: dict, request: HttpRequest) -> dict:
     """Calculate elevation and direction angles of roof."""
     if parameters["flow_data"]["flat_roof"] == "exists":
         parameters["flow_data"]["elevation"] = 0
         parameters["flow_data"]["direction"] = 0
     else:
-        parameters["flow_data"]["elevation"] = settings.map_elevation(
+        parameters["flow_data"]["elevation"] = settings.check_elevation(
             parameters["flow_data"]["roof_inclination"],
         )
         parameters["flow_data"]["direction"] = settings.CONFIG["orientation"][
             parameters["flow_data"]["roof_orientation"]
         ]
-
-        # This is necessary due to missing data for elevation angle of 45°; only 0, 120, 240, 360 are available
-        if parameters["flow_data"]["elevation"] == 45:  # noqa: PLR2004
-            parameters["flow_data"]["direction"] = round(parameters["flow_data"]["direction"] / 120) * 120
     return parameters
 
 
+@pipeline.declare(
+    reads=tuple(
+        f"flow_data.{key}" for key in ("construction_year", "insulation_choices", *renovations.CATEGORICAL_FEATURES)
+    ),
+    writes=("renovation_data",),
+)
 def init_renovation_data(scenario: str, parameters: dict, request: HttpRequest) -> dict:
-    """Get renovation data from KfW based on flow data."""
-    # Get cluster ID from KfW clustering
-    # TODO: Get cluster ID from lookup table. Currently hardcoded.
-    # https://github.com/rl-institut/bd_app/issues/90
-    cluster_id = 1
-
-    with (settings.DATA_DIR / "renovations" / f"{cluster_id}.json").open(
-        "r",
-        encoding="utf-8",
-    ) as f:
-        parameters["renovation_data"] = json.load(f)
+    """Get renovation data from KfW cluster matching flow data."""
+    parameters["renovation_data"] = renovations.get_renovation_index().renovation_data(parameters["flow_data"])
     return parameters
 
 
+@pipeline.declare(
+    reads=(
+        *(f"flow_data.{key}" for key in profiles.REQUIRED_PROFILE_KEYS),
+        "tabula_data.flow_temperature",
+        "profile_data_version",
+    ),
+    writes=("profiles",),
+)
+def init_profiles(scenario: str, parameters: dict, request: HttpRequest) -> dict:
+    """Fetch all profiles needed in following hooks at once (after clearing caches holding outdated profiles)."""
+    if "profile_data_version" in parameters:
+        profiles.use_data_version(parameters["profile_data_version"])
+    profile_sets, _ = profiles.fetch_profiles([parameters])
+    parameters["profiles"] = profile_sets[0]
+    return parameters
+
+
+@pipeline.declare(
+    reads=(
+        "profiles.load_electricity",
+        "profiles.load_hotwater",
+        "profile_data_version",
+        "renovation_data",
+        *(
+            f"flow_data.{key}"
+            for key in (
+                "number_persons",
+                "building_type",
+                "construction_year",
+                "postcode",
+                "latitude",
+                "longitude",
+                "insulation_choices",
+            )
+        ),
+    ),
+    writes=("oeprom.load_electricity", "oeprom.load_hotwater", "oeprom.load_heat"),
+)
 def set_up_loads(
     scenario: str,
     parameters: dict,
     request: HttpRequest,
 ) -> dict:
-    """Set up electricity, heat and hotwater consumption (profiles & amount)."""
-    electricity_profile = pd.Series(
-        models.Load.objects.get(
-            number_people=parameters["flow_data"]["number_persons"],
-            eec=settings.CONFIG["default_energy_efficiency_class"],
-        ).profile,
-    )
+    """
+    Set up electricity, heat and hotwater consumption (profiles & amount).
+
+    Space heat profile is synthesized for building (see `heat.spaceheat`).
+    """
+    electricity_profile = pd.Series(parameters["profiles"]["load_electricity"])
     electricity_amount = (
         parameters["renovation_data"]["energyConsumptionElectricityAsIs"]
         - parameters["renovation_data"]["resultsMeasuresAccordingBEG"]["reductionFinalEnergyElectricity"]
     )
-    hotwater_profile = pd.Series(
-        models.Hotwater.objects.get(
-            number_people=parameters["flow_data"]["number_persons"],
-        ).profile,
-    )
+    hotwater_profile = pd.Series(parameters["profiles"]["load_hotwater"])
     hotwater_amount = (
         parameters["flow_data"]["number_persons"] * settings.CONFIG["hotwater_energy_consumption_per_person"]
     )
@@ -193,9 +238,30 @@ def set_up_loads(
             "load_heat": {"amount": heat_amount},
         },
     )
+    # pylint: disable=C0415
+    from . import spaceheat
+
+    heat_profile = spaceheat.building_heat_profile(parameters["flow_data"])
+    if heat_profile is not None:
+        parameters["oeprom"]["load_heat"]["profile"] = pd.Series(heat_profile)
     return parameters
 
 
+@pipeline.declare(
+    reads=(
+        "flow_data.pv_exists",
+        "flow_data.pv_capacity",
+        "flow_data.solar_thermal_exists",
+        "flow_data.solar_thermal_area",
+        "flow_data.scenario-secondary_heating",
+        "profiles.volatile_PV",
+        "profiles.volatile_STH",
+        "profiles.load_STH",
+        "profile_data_version",
+        "tabula_data.roof_area_available",
+    ),
+    writes=("oeprom.volatile_PV", "oeprom.volatile_STH", "oeprom.load_STH"),
+)
 def set_up_volatiles(  # noqa: C901
     scenario: str,
     parameters: dict,
@@ -206,37 +272,12 @@ def set_up_volatiles(  # noqa: C901
     parameters["oeprom"]["volatile_STH"] = {"capacity_cost": settings.get_ep_cost("volatile_STH")}
     parameters["oeprom"]["load_STH"] = {}
 
-    if parameters["flow_data"]["pv_exists"] == "True" or "pv" in parameters["flow_data"]["scenario-secondary_heating"]:
-        pv_profile = pd.Series(
-            models.Photovoltaic.objects.get(
-                elevation_angle=parameters["flow_data"]["elevation"],
-                direction_angle=parameters["flow_data"]["direction"],
-            ).profile,
-        )
-        parameters["oeprom"]["volatile_PV"]["profile"] = pv_profile
+    if profiles.pv_selected(parameters["flow_data"]):
+        parameters["oeprom"]["volatile_PV"]["profile"] = pd.Series(parameters["profiles"]["volatile_PV"])
 
-    if (
-        parameters["flow_data"]["solar_thermal_exists"] == "True"
-        or "solar" in parameters["flow_data"]["scenario-secondary_heating"]
-    ):
-        sth_profile = pd.Series(
-            models.Solarthermal.objects.get(
-                type="heat",
-                temperature=parameters["tabula_data"]["flow_temperature"],
-                elevation_angle=parameters["flow_data"]["elevation"],
-                direction_angle=parameters["flow_data"]["direction"],
-            ).profile,
-        )
-        parameters["oeprom"]["volatile_STH"]["profile"] = sth_profile
-        sth_load_profile = pd.Series(
-            models.Solarthermal.objects.get(
-                type="load",
-                temperature=parameters["tabula_data"]["flow_temperature"],
-                elevation_angle=parameters["flow_data"]["elevation"],
-                direction_angle=parameters["flow_data"]["direction"],
-            ).profile,
-        )
-        parameters["oeprom"]["load_STH"]["profile"] = sth_load_profile
+    if profiles.sth_selected(parameters["flow_data"]):
+        parameters["oeprom"]["volatile_STH"]["profile"] = pd.Series(parameters["profiles"]["volatile_STH"])
+        parameters["oeprom"]["load_STH"]["profile"] = pd.Series(parameters["profiles"]["load_STH"])
 
     # Set existing PV and solarthermal capacities
     if parameters["flow_data"]["pv_exists"] == "True" and "pv_capacity" in parameters["flow_data"]:
@@ -298,63 +339,37 @@ def set_up_volatiles(  # noqa: C901
     return parameters
 
 
+@pipeline.declare(
+    reads=(
+        "flow_data.scenario-primary_heating",
+        "flow_data.scenario-heat_pump_type",
+        *(f"profiles.{component}" for _, component in profiles.HEATPUMPS.values()),
+        "profile_data_version",
+    ),
+    writes=tuple(f"oeprom.{component}" for _, component in profiles.HEATPUMPS.values()),
+)
 def set_up_heatpumps(scenario: str, parameters: dict, request: HttpRequest) -> dict:
-    """Set up heatpumps."""
-
-    # Get temperature type from flow temperature
-    type_temperature = f"VL{parameters['tabula_data']['flow_temperature']}C"
-
-    if (
-        parameters["flow_data"]["scenario-primary_heating"] == "heat_pump"
-        and parameters["flow_data"]["scenario-heat_pump_type"] == "air_heat_pump"
-    ):
-        heatpump_air_cop = pd.Series(
-            models.Heatpump.objects.get(
-                medium="air",
-                type_temperature=type_temperature,
-            ).profile,
-        )
-        parameters["oeprom"]["conversion_heatpump_air"] = {
-            "expandable": True,
-            "efficiency": heatpump_air_cop,
-            "capacity_cost": settings.get_ep_cost("air_heat_pump"),
-        }
-
-    if (
-        parameters["flow_data"]["scenario-primary_heating"] == "heat_pump"
-        and parameters["flow_data"]["scenario-heat_pump_type"] == "geothermal_pump"
-    ):
-        heatpump_water_cop = pd.Series(
-            models.Heatpump.objects.get(
-                medium="water",
-                type_temperature=type_temperature,
-            ).profile,
-        )
-        parameters["oeprom"]["conversion_heatpump_water"] = {
-            "expandable": True,
-            "efficiency": heatpump_water_cop,
-            "capacity_cost": settings.get_ep_cost("geothermal_pump"),
-        }
-
-    if (
-        parameters["flow_data"]["scenario-primary_heating"] == "heat_pump"
-        and parameters["flow_data"]["scenario-heat_pump_type"] == "groundwater"
-    ):
-        heatpump_brine_cop = pd.Series(
-            models.Heatpump.objects.get(
-                medium="brine",
-                type_temperature=type_temperature,
-            ).profile,
-        )
-        parameters["oeprom"]["conversion_heatpump_brine"] = {
-            "expandable": True,
-            "efficiency": heatpump_brine_cop,
-            "capacity_cost": settings.get_ep_cost("groundwater"),
-        }
+    """Set up heatpumps (unknown heat pump types are skipped)."""
+    heat_pump_type = parameters["flow_data"].get("scenario-heat_pump_type")
+    if parameters["flow_data"]["scenario-primary_heating"] != "heat_pump" or heat_pump_type not in profiles.HEATPUMPS:
+        return parameters
 
+    _, component = profiles.HEATPUMPS[heat_pump_type]
+    parameters["oeprom"][component] = {
+        "expandable": True,
+        "efficiency": pd.Series(parameters["profiles"][component]),
+        "capacity_cost": settings.get_ep_cost(heat_pump_type),
+    }
     return parameters
 
 
+@pipeline.declare(
+    reads=("flow_data.scenario-primary_heating", "flow_data.scenario-secondary_heating"),
+    writes=(
+        "oeprom.district_heating",
+        *(f"oeprom.{component}" for component in CONVERSION_TECHNOLOGIES.values()),
+    ),
+)
 def set_up_conversion_technologies(
     scenario: str,
     parameters: dict,
@@ -364,18 +379,10 @@ def set_up_conversion_technologies(
 
     # Capacity of district heating is set to "infinity" and not optimized
     if parameters["flow_data"]["scenario-primary_heating"] == "district_heating":
-        parameters["oeprom"]["district_heating"] = {"capacity": OEMOF_INF_EQUIVALENT}
+        parameters["oeprom"]["district_heating"] = {"capacity": UNBOUNDED_CAPACITY}
 
     # Heating system is optimized
-    technologies = {
-        "wood_pellets": "conversion_pk",
-        "wood_chips": "conversion_hgk",
-        "firewood": "conversion_shk",
-        "gas_heating": "conversion_boiler",
-        "heating_rod": "conversion_ehz",
-        "bhkw": "backpressure_bhkw",
-    }
-    for technology, oemof_technology in technologies.items():
+    for technology, oemof_technology in CONVERSION_TECHNOLOGIES.items():
         if parameters["flow_data"]["scenario-primary_heating"] == technology:
             parameters["oeprom"][oemof_technology] = {
                 "expandable": True,
@@ -392,6 +399,10 @@ def set_up_conversion_technologies(
     return parameters
 
 
+@pipeline.declare(
+    reads=("flow_data.hotwater_supply",),
+    writes=("oeprom.conversion_dle", "oeprom.conversion_fws"),
+)
 def set_up_hotwater_supply(
     scenario: str,
     parameters: dict,
@@ -399,12 +410,22 @@ def set_up_hotwater_supply(
 ) -> dict:
     """Either supply hot water via instantaneous water heater or freshwater station."""
     if parameters["flow_data"]["hotwater_supply"] == "instantaneous_water_heater":
-        parameters["oeprom"]["conversion_dle"] = {"capacity": OEMOF_INF_EQUIVALENT}
+        parameters["oeprom"]["conversion_dle"] = {"capacity": UNBOUNDED_CAPACITY}
     else:
-        parameters["oeprom"]["conversion_fws"] = {"capacity": OEMOF_INF_EQUIVALENT}
+        parameters["oeprom"]["conversion_fws"] = {"capacity": UNBOUNDED_CAPACITY}
     return parameters
 
 
+@pipeline.declare(
+    reads=(
+        "flow_data.battery_exists",
+        "flow_data.battery_capacity",
+        "flow_data.pv_exists",
+        "flow_data.pv_capacity",
+        "flow_data.scenario-secondary_heating",
+    ),
+    writes=("oeprom.storage_heat", "oeprom.storage_lion"),
+)
 def set_up_storages(scenario: str, parameters: dict, request: HttpRequest) -> dict:
     """Set up heat storage and battery storage if PV is selected."""
     # Always optimize heat storage
@@ -441,7 +462,58 @@ def set_up_storages(scenario: str, parameters: dict, request: HttpRequest) -> di
     return parameters
 
 
+def prune_energysystem(scenario: str, energysystem, request: HttpRequest):
+    """Remove components which cannot carry flow (e.g. PV without available roof area) before model is built."""
+    # pylint: disable=C0415
+    from . import pruning
+
+    return pruning.prune(energysystem)
+
+
+def peak_demand(load: dict) -> float:
+    """
+    Return peak hourly demand of load.
+
+    Loads without profile (e.g. if space heat profile cannot be synthesized) use default profile of datapackage,
+    thus peak is estimated from mean hourly demand of annual amount.
+    """
+    amount = max(load["amount"], 0)
+    if "profile" not in load:
+        return amount / HOURS_PER_YEAR * settings.LOAD_PEAK_FACTOR
+    return float(pd.Series(load["profile"]).max()) * amount
+
+
+@pipeline.declare(reads=("oeprom",), writes=("oeprom",))
+def bound_unbounded_capacities(scenario: str, parameters: dict, request: HttpRequest) -> dict:
+    """
+    Replace unbounded capacities by a finite bound.
+
+    Infinite capacities cannot be passed to the solver and big numbers instead result in badly scaled LPs.
+    Bound is peak hourly heat and hotwater demand times a safety factor, limited by a positive minimum,
+    thus it is of the same magnitude as other coefficients (and feasible, even if demand is reduced to zero).
+    """
+    peak = sum(peak_demand(parameters["oeprom"][load]) for load in ("load_heat", "load_hotwater"))
+    bound = max(peak * settings.CAPACITY_BOUND_FACTOR, settings.CAPACITY_BOUND_MIN)
+    for component in parameters["oeprom"].values():
+        if component.get("capacity") == UNBOUNDED_CAPACITY:
+            component["capacity"] = bound
+    return parameters
+
+
+def report_scaling(scenario: str, model, request: HttpRequest):
+    """Log coefficient ranges per constraint block of built model."""
+    # pylint: disable=C0415
+    from . import scaling
+
+    ranges = scaling.coefficient_ranges(model)
+    logging.info("Coefficient ranges of model for %s:\n%s", scenario, ranges.to_string())
+    return model
+
+
 def debug_input_data(scenario: str, energysystem, request: HttpRequest):
+    # pylint: disable=C0415
+    from oemof import solph
+
     _ = solph.processing.parameter_as_dict(
         energysystem,
         exclude_attrs=["bus", "from_bus", "to_bus", "from_node", "to_node"],
@@ -451,6 +523,13 @@ def debug_input_data(scenario: str, energysystem, request: HttpRequest):
 
 def couple_battery_storage_to_pv_capacity(scenario: str, model, request: HttpRequest):
     """Set constraint in model which couples battery storage to PV capacity in a fix relation."""
+    # pylint: disable=C0415
+    from pyomo.environ import BuildAction
+    from pyomo.environ import Constraint
+
+    # PV or battery may have been pruned from energysystem
+    if "volatile_PV" not in model.es.groups or "storage_lion" not in model.es.groups:
+        return model
     if model.es.groups["volatile_PV"].investment is not None:
         pv_flow = next((f, n) for f, n in model.InvestmentFlowBlock.INVESTFLOWS if f.label == "volatile_PV")
         storageblock = model.GenericInvestmentStorageBlock
@@ -473,5 +552,14 @@ def couple_battery_storage_to_pv_capacity(scenario: str, model, request: HttpReq
     return model
 
 
+def record_model_statistics(scenario: str, model, request: HttpRequest):
+    """Collect size of built model, used to predict solve durations (see `eta`)."""
+    # pylint: disable=C0415
+    from . import eta
+
+    eta.collect(model)
+    return model
+
+
 def unpack_oeprom(scenario: str, parameters: dict, request: HttpRequest) -> dict:
     return parameters["oeprom"]
@@ -0,0 +1,167 @@
+"""
+Module to import raw profiles incrementally, driven by checksums of raw files and their columns.
+
+Checksums of each imported raw file and of all its columns are stored in `models.ProfileSource`. On re-import,
+unchanged files are skipped without parsing them; of changed files, only profiles of new or changed columns are
+stored (in bulk), and profiles whose column (or file) has been removed are deleted. After profiles have changed,
+profile data version is published (see `profiles.data_version`), invalidating profile caches and simulations.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import logging
+from collections import defaultdict
+from dataclasses import dataclass
+from dataclasses import field
+from typing import TYPE_CHECKING
+from typing import Any
+
+import pandas as pd
+from django.db import transaction
+
+from . import models
+from . import profiles
+from . import regions
+from . import shapes
+
+if TYPE_CHECKING:
+    from collections.abc import Container
+    from collections.abc import Iterable
+    from pathlib import Path
+
+CHUNK_SIZE = 2**20
+
+
+def file_checksum(path: Path) -> str:
+    digest = hashlib.sha256()
+    with path.open("rb") as file:
+        for chunk in iter(lambda: file.read(CHUNK_SIZE), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def column_checksums(frame: pd.DataFrame) -> dict[str, str]:
+    """Return content checksum of each column of raw file."""
+    return {
+        str(column): hashlib.sha256(pd.util.hash_pandas_object(frame[column], index=False).to_numpy()).hexdigest()
+        for column in frame.columns
+    }
+
+
+def source_name(path: Path) -> str:
+    """Return path of raw file relative to profiles folder, as stored in ProfileSource."""
+    return path.relative_to(regions.PROFILES_DIR).as_posix()
+
+
+def changed_columns(
+    columns: dict[str, tuple[Any, ...]],
+    checksums: dict[str, str],
+    imported: dict[str, str],
+    stored: Container[tuple[Any, ...]],
+) -> list[str]:
+    """
+    Return columns whose profiles have to be (re-)stored.
+
+    These are columns found in raw file which are new, changed since last import or whose profile is missing in DB.
+    """
+    return [
+        column
+        for column, values in columns.items()
+        if column in checksums and (imported.get(column) != checksums[column] or values not in stored)
+    ]
+
+
+@dataclass
+class FileDiff:
+    """Profiles found in raw file and profiles to be stored since file is new or has changed since last import."""
+
+    name: str
+    checksum: str | None = None  # None if file has been removed
+    checksums: dict[str, str] | None = None  # checksums of columns if file has been (re-)read
+    found: set[tuple[Any, ...]] = field(default_factory=set)
+    changed: dict[tuple[Any, ...], pd.Series] = field(default_factory=dict)
+
+    def save(self):
+        """Store checksums of file or delete them if file has been removed."""
+        if self.checksum is None:
+            models.ProfileSource.objects.filter(path=self.name).delete()
+        elif self.checksums is not None:
+            models.ProfileSource.objects.update_or_create(
+                path=self.name,
+                defaults={"checksum": self.checksum, "columns": self.checksums},
+            )
+
+
+def diff_file(path: Path, columns: dict[str, tuple[Any, ...]], stored: Container[tuple[Any, ...]]) -> FileDiff:
+    """Compare raw file and its profile columns against checksums of last import; unchanged files are not read."""
+    diff = FileDiff(source_name(path))
+    if not path.exists():
+        logging.warning("Raw profile file '%s' not found. Its profiles are deleted.", path)
+        return diff
+    diff.checksum = file_checksum(path)
+    source = models.ProfileSource.objects.filter(path=diff.name).first()
+    imported = source.columns if source is not None else {}
+    frame = None
+    if source is not None and source.checksum == diff.checksum:
+        checksums = imported
+    else:
+        frame = pd.read_csv(path)
+        checksums = diff.checksums = column_checksums(frame)
+    if missing := sorted(columns.keys() - checksums.keys()):
+        logging.warning("Columns %s not found in raw profile file '%s'.", missing, path)
+    diff.found.update(values for column, values in columns.items() if column in checksums)
+    columns_to_store = changed_columns(columns, checksums, imported, stored)
+    if columns_to_store and frame is None:
+        frame = pd.read_csv(path, usecols=columns_to_store)
+    diff.changed.update((columns[column], frame[column]) for column in columns_to_store)
+    return diff
+
+
+def import_profiles(
+    model_name: str,
+    sources: Iterable[tuple[tuple[Any, ...], tuple[Path, str]]],
+    region: str | None = None,
+) -> int:
+    """
+    Import profiles of profile model from raw files; returns number of stored and deleted profiles.
+
+    Sources map values of profile key (see `profiles.PROFILE_MODELS`) to raw file and column of profile.
+    Stored profiles (of given weather region) not found in sources are deleted.
+    """
+    model, fields = profiles.PROFILE_MODELS[model_name]
+    queryset = model.objects.filter(region=region) if region is not None else model.objects.all()
+    stored = {tuple(values): pk for pk, *values in queryset.values_list("pk", *fields)}
+
+    columns_per_file = defaultdict(dict)
+    for values, (path, column) in sources:
+        columns_per_file[path][column] = profiles.normalize_key((model_name, values))[1]
+    diffs = [diff_file(path, columns, stored) for path, columns in columns_per_file.items()]
+    found = set().union(*(diff.found for diff in diffs))
+    changed = {values: profile for diff in diffs for values, profile in diff.changed.items()}
+
+    updates, creates = [], []
+    removed = [pk for values, pk in stored.items() if values not in found]
+    # Checksums are stored along with profiles, thus failed imports are repeated
+    with transaction.atomic():
+        for values, references in zip(changed, shapes.store_many(changed.values()), strict=True):
+            row = model(**dict(zip(fields, values, strict=True)), **references)
+            if values in stored:
+                row.pk = stored[values]
+                updates.append(row)
+            else:
+                creates.append(row)
+        model.objects.bulk_update(updates, ("shape", "scale"))
+        model.objects.bulk_create(creates)
+        model.objects.filter(pk__in=removed).delete()
+        for diff in diffs:
+            diff.save()
+    logging.info(
+        "Imported %s profiles%s: %i updated, %i created, %i deleted.",
+        model_name,
+        f" of region '{region}'" if region is not None else "",
+        len(updates),
+        len(creates),
+        len(removed),
+    )
+    return len(updates) + len(creates) + len(removed)
@@ -0,0 +1,43 @@
+from concurrent.futures import ProcessPoolExecutor
+
+from django.core.management.base import BaseCommand
+from django.db import connections
+
+from building_dialouge_webapp.heat import atlas
+from building_dialouge_webapp.heat import tabula
+
+
+class Command(BaseCommand):
+    help = "Solves grid of building archetypes in parallel and stores compact results as atlas."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--building-types", nargs="+", default=atlas.BUILDING_TYPES)
+        parser.add_argument("--construction-years", nargs="+", type=int, default=tabula.CONSTRUCTION_YEARS)
+        parser.add_argument("--number-persons", nargs="+", type=int, default=atlas.NUMBER_PERSONS)
+        parser.add_argument(
+            "--heatings",
+            nargs="+",
+            default=[":".join(heating).rstrip(":") for heating in atlas.HEATINGS],
+            help="Primary heating, optionally followed by heat pump type, e.g. 'heat_pump:air_heat_pump'",
+        )
+        parser.add_argument("--workers", type=int, default=None, help="Number of parallel simulations")
+
+    def handle(self, *args, **options):
+        heatings = [tuple(heating.partition(":")[::2]) for heating in options["heatings"]]
+        grid = list(
+            atlas.archetype_grid(
+                options["building_types"],
+                options["construction_years"],
+                options["number_persons"],
+                heatings,
+            ),
+        )
+        self.stdout.write(f"Solving {len(grid)} archetypes...")
+        # DB connections must not be shared with forked worker processes
+        connections.close_all()
+        with ProcessPoolExecutor(max_workers=options["workers"]) as executor:
+            entries = [entry for entry in executor.map(atlas.solve_archetype, grid) if entry is not None]
+        path = atlas.write_atlas(entries)
+        self.stdout.write(
+            self.style.SUCCESS(f"Stored atlas with {len(entries)} of {len(grid)} archetypes at '{path}'."),
+        )
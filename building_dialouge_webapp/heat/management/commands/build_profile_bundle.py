@@ -0,0 +1,20 @@
+from django.core.management.base import BaseCommand
+
+from building_dialouge_webapp.heat import bundle
+from building_dialouge_webapp.heat import profiles
+
+
+class Command(BaseCommand):
+    help = (
+        "Exports all stored profiles into read-only memory-mapped profile bundles (one per weather region) "
+        "shared by all processes."
+    )
+
+    def handle(self, *args, **options):
+        for region in (None, *profiles.stored_regions()):
+            path = bundle.write_bundle(profiles.stored_profiles(region), bundle.bundle_dir(region))
+            self.stdout.write(
+                self.style.SUCCESS(
+                    f"Stored profile bundle with {len(bundle.get_bundle(region))} profiles at '{path}'.",
+                ),
+            )
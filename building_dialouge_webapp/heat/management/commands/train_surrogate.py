@@ -0,0 +1,37 @@
+from django.core.management.base import BaseCommand
+from django_oemof.models import Simulation
+
+from building_dialouge_webapp.heat import atlas
+from building_dialouge_webapp.heat import surrogate
+
+
+class Command(BaseCommand):
+    help = "Trains surrogate model on stored simulations and writes validation report on surrogate error by archetype."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--alpha", type=float, default=surrogate.RIDGE_ALPHA, help="Ridge regularization")
+        parser.add_argument("--folds", type=int, default=5, help="Number of folds used in cross-validation")
+
+    def handle(self, *args, **options):
+        simulations = Simulation.objects.filter(scenario=atlas.SCENARIO, dataset__isnull=False)
+        features = []
+        targets = []
+        for simulation in simulations:
+            features.append(surrogate.extract_features(simulation.parameters["flow_data"]))
+            targets.append(surrogate.flatten_results(atlas.summarize(simulation.id)))
+        if not features:
+            self.stdout.write(self.style.ERROR("No stored simulations found. Run 'build_atlas' first."))
+            return
+
+        surrogate.SURROGATE_DIR.mkdir(parents=True, exist_ok=True)
+        surrogate.Surrogate.fit(features, targets, options["alpha"]).save(
+            surrogate.SURROGATE_DIR / surrogate.MODEL_FILE,
+        )
+        surrogate.get_surrogate.cache_clear()
+        report = surrogate.validation_report(features, targets, options["folds"], options["alpha"])
+        report.to_csv(surrogate.SURROGATE_DIR / surrogate.REPORT_FILE, index=False)
+        costs = report[report["target"] == "total_system_costs"]
+        self.stdout.write(costs.to_string(index=False))
+        self.stdout.write(
+            self.style.SUCCESS(f"Trained surrogate on {len(features)} simulations at '{surrogate.SURROGATE_DIR}'."),
+        )
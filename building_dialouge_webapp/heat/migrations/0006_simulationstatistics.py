@@ -0,0 +1,34 @@
+# Generated by Django 5.2 on 2026-10-19 10:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("heat", "0005_heat"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="SimulationStatistics",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("scenario", models.CharField()),
+                ("technologies", models.CharField()),
+                ("components", models.IntegerField()),
+                ("expandables", models.IntegerField()),
+                ("timesteps", models.IntegerField()),
+                ("solver", models.CharField()),
+                ("wall_time", models.FloatField()),
+                ("created", models.DateTimeField(auto_now_add=True)),
+            ],
+        ),
+    ]
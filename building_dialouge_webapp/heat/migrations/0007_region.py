@@ -0,0 +1,44 @@
+# Generated by Django 5.2 on 2026-10-19 12:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("heat", "0006_simulationstatistics"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="heat",
+            name="region",
+            field=models.CharField(default="default"),
+        ),
+        migrations.AddField(
+            model_name="heatpump",
+            name="region",
+            field=models.CharField(default="default"),
+        ),
+        migrations.AddField(
+            model_name="photovoltaic",
+            name="region",
+            field=models.CharField(default="default"),
+        ),
+        migrations.AddField(
+            model_name="solarthermal",
+            name="region",
+            field=models.CharField(default="default"),
+        ),
+        migrations.AlterUniqueTogether(
+            name="heatpump",
+            unique_together={("region", "medium", "type_temperature")},
+        ),
+        migrations.AlterUniqueTogether(
+            name="photovoltaic",
+            unique_together={("region", "elevation_angle", "direction_angle")},
+        ),
+        migrations.AlterUniqueTogether(
+            name="solarthermal",
+            unique_together={("region", "type", "temperature", "elevation_angle", "direction_angle")},
+        ),
+    ]
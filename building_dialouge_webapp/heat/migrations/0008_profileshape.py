@@ -0,0 +1,91 @@
+# Generated by Django 5.2 on 2026-10-19 14:00
+
+import hashlib
+
+import django.contrib.postgres.fields
+import django.db.models.deletion
+import numpy as np
+from django.db import migrations, models
+
+PROFILE_MODELS = ("heat", "heatpump", "hotwater", "load", "photovoltaic", "solarthermal")
+SHAPE_DECIMALS = 9
+
+
+def split_profiles(apps, schema_editor):
+    """Split stored profiles into deduplicated shapes and scales (same as heat.shapes.split)."""
+    profile_shape = apps.get_model("heat", "ProfileShape")
+    for model_name in PROFILE_MODELS:
+        model = apps.get_model("heat", model_name)
+        for row in model.objects.all():
+            profile = np.asarray(row.profile, dtype=float)
+            scale = float(np.abs(profile).max(initial=0))
+            shape = np.round(profile / scale, SHAPE_DECIMALS) if scale else np.zeros_like(profile)
+            shape += 0.0
+            shape_hash = hashlib.sha256(np.ascontiguousarray(shape, dtype=np.float64).tobytes()).hexdigest()
+            profile_shape.objects.get_or_create(hash=shape_hash, defaults={"shape": shape.tolist()})
+            row.shape_id = shape_hash
+            row.scale = scale
+            row.save(update_fields=["shape", "scale"])
+
+
+def join_profiles(apps, schema_editor):
+    for model_name in PROFILE_MODELS:
+        model = apps.get_model("heat", model_name)
+        for row in model.objects.select_related("shape"):
+            row.profile = (np.asarray(row.shape.shape, dtype=float) * row.scale).tolist()
+            row.save(update_fields=["profile"])
+
+
+def shape_field(null):
+    return models.ForeignKey(
+        null=null,
+        on_delete=django.db.models.deletion.PROTECT,
+        related_name="+",
+        to="heat.profileshape",
+    )
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("heat", "0007_region"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ProfileShape",
+            fields=[
+                ("hash", models.CharField(max_length=64, primary_key=True, serialize=False)),
+                (
+                    "shape",
+                    django.contrib.postgres.fields.ArrayField(base_field=models.FloatField(), size=None),
+                ),
+            ],
+        ),
+        *(
+            operation
+            for model_name in PROFILE_MODELS
+            for operation in (
+                migrations.AddField(model_name=model_name, name="shape", field=shape_field(null=True)),
+                migrations.AddField(model_name=model_name, name="scale", field=models.FloatField(null=True)),
+                migrations.AlterField(
+                    model_name=model_name,
+                    name="profile",
+                    field=django.contrib.postgres.fields.ArrayField(
+                        base_field=models.FloatField(),
+                        null=True,
+                        size=None,
+                    ),
+                ),
+            )
+        ),
+        migrations.RunPython(split_profiles, join_profiles),
+        *(
+            operation
+            for model_name in PROFILE_MODELS
+            for operation in (
+                migrations.RemoveField(model_name=model_name, name="profile"),
+                migrations.AlterField(model_name=model_name, name="shape", field=shape_field(null=False)),
+                migrations.AlterField(model_name=model_name, name="scale", field=models.FloatField()),
+            )
+        ),
+    ]
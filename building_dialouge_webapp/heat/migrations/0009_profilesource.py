@@ -0,0 +1,30 @@
+# Generated by Django 5.2 on 2026-10-19 16:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("heat", "0008_profileshape"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ProfileSource",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("path", models.CharField(unique=True)),
+                ("checksum", models.CharField(max_length=64)),
+                ("columns", models.JSONField(default=dict)),
+                ("imported", models.DateTimeField(auto_now=True)),
+            ],
+        ),
+    ]
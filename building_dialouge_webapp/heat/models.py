@@ -1,45 +1,74 @@
 """Module to set up DB models for building dialouge."""
 
+import numpy as np
 from django.contrib.postgres.fields import ArrayField
 from django.db import models
 
+from . import settings
 
-class Solarthermal(models.Model):
+
+class ProfileShape(models.Model):
+    """Model to hold normalized profile shapes (peak of 1), deduplicated by content hash (see heat.shapes)."""
+
+    hash = models.CharField(max_length=64, primary_key=True)
+    shape = ArrayField(models.FloatField())
+
+    def __str__(self):
+        return f"ProfileShape ({self.hash[:12]})"
+
+
+class ShapedProfile(models.Model):
+    """Abstract model holding profile as reference to its normalized shape and scale."""
+
+    shape = models.ForeignKey(ProfileShape, on_delete=models.PROTECT, related_name="+")
+    scale = models.FloatField()
+
+    class Meta:
+        abstract = True
+
+    @property
+    def profile(self) -> np.ndarray:
+        return np.asarray(self.shape.shape, dtype=float) * self.scale
+
+
+class Solarthermal(ShapedProfile):
     """Model to hold heat and load timeseries for different setups of solarthermal component."""
 
+    region = models.CharField(default=settings.DEFAULT_REGION)  # weather region (see heat.regions)
     type = models.CharField()  # to distinguish between heat and load demand
     temperature = models.IntegerField()
     elevation_angle = models.IntegerField()
     direction_angle = models.IntegerField()
-    profile = ArrayField(models.FloatField())
 
     class Meta:
-        unique_together = ("type", "temperature", "elevation_angle", "direction_angle")
+        unique_together = ("region", "type", "temperature", "elevation_angle", "direction_angle")
 
     def __str__(self):
-        return f"Solarthermal ({self.type}, {self.temperature}, {self.elevation_angle}, {self.direction_angle})"
+        return (
+            f"Solarthermal ({self.region}, {self.type}, {self.temperature}, "
+            f"{self.elevation_angle}, {self.direction_angle})"
+        )
 
 
-class Photovoltaic(models.Model):
+class Photovoltaic(ShapedProfile):
     """Model to hold timeseries for different setups of photovoltaic component."""
 
+    region = models.CharField(default=settings.DEFAULT_REGION)  # weather region (see heat.regions)
     elevation_angle = models.IntegerField()
     direction_angle = models.IntegerField()
-    profile = ArrayField(models.FloatField())
 
     class Meta:
-        unique_together = ("elevation_angle", "direction_angle")
+        unique_together = ("region", "elevation_angle", "direction_angle")
 
     def __str__(self):
-        return f"Photovoltaic ({self.elevation_angle}, {self.direction_angle})"
+        return f"Photovoltaic ({self.region}, {self.elevation_angle}, {self.direction_angle})"
 
 
-class Load(models.Model):
+class Load(ShapedProfile):
     """Model to hold timeseries for different setups of load component."""
 
     number_people = models.IntegerField()
     eec = models.IntegerField()
-    profile = ArrayField(models.FloatField())
 
     class Meta:
         unique_together = ("number_people", "eec")
@@ -48,34 +77,61 @@ class Load(models.Model):
         return f"Load ({self.number_people}, {self.eec})"
 
 
-class Heat(models.Model):
+class Heat(ShapedProfile):
     """Model to hold timeseries for different setups of heat component."""
 
-    profile = ArrayField(models.FloatField())
+    region = models.CharField(default=settings.DEFAULT_REGION)  # weather region (see heat.regions)
 
     def __str__(self):
-        return "Heat"
+        return f"Heat ({self.region})"
 
 
-class Hotwater(models.Model):
+class Hotwater(ShapedProfile):
     """Model to hold timeseries for different setups of hotwater component."""
 
     number_people = models.IntegerField()
-    profile = ArrayField(models.FloatField())
 
     def __str__(self):
         return f"Hotwater ({self.number_people})"
 
 
-class Heatpump(models.Model):
+class Heatpump(ShapedProfile):
     """Model to hold air, water and brine timeseries for different setups of heatpump component."""
 
+    region = models.CharField(default=settings.DEFAULT_REGION)  # weather region (see heat.regions)
     medium = models.CharField()  # to distinguish between air, water and brine medium
     type_temperature = models.CharField()
-    profile = ArrayField(models.FloatField())
 
     class Meta:
-        unique_together = ("medium", "type_temperature")
+        unique_together = ("region", "medium", "type_temperature")
+
+    def __str__(self):
+        return f"Heatpump ({self.region}, {self.medium}, {self.type_temperature})"
+
+
+class ProfileSource(models.Model):
+    """Model to hold checksums of imported raw profile files and their columns (see heat.imports)."""
+
+    path = models.CharField(unique=True)  # relative to profiles folder
+    checksum = models.CharField(max_length=64)
+    columns = models.JSONField(default=dict)  # checksum per imported column
+    imported = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"ProfileSource ({self.path}, {self.checksum[:12]})"
+
+
+class SimulationStatistics(models.Model):
+    """Model to hold size and wall time of simulations, used to predict solve durations."""
+
+    scenario = models.CharField()
+    technologies = models.CharField()  # signature of technologies chosen in renovation scenario
+    components = models.IntegerField()
+    expandables = models.IntegerField()
+    timesteps = models.IntegerField()
+    solver = models.CharField()
+    wall_time = models.FloatField()  # in seconds
+    created = models.DateTimeField(auto_now_add=True)
 
     def __str__(self):
-        return f"Heatpump ({self.medium}, {self.type_temperature})"
+        return f"SimulationStatistics ({self.technologies}, {self.wall_time:.1f} s)"
@@ -0,0 +1,25 @@
+"""
+Urls replacing those of django_oemof (same namespace and names).
+
+Simulations are coalesced with identical running simulations (see `heat.singleflight`), thus simulate and terminate
+views are overridden. Remaining django_oemof views are imported on first request only (see `heat.registry`).
+"""
+
+from django.urls import include
+from django.urls import path
+from rest_framework.routers import DefaultRouter
+
+from . import registry
+from . import views
+
+router = DefaultRouter()
+
+app_name = "django_oemof"
+
+urlpatterns = [
+    path("", include(router.urls)),
+    path("simulate", views.SimulateEnergysystem.as_view(), name="simulate"),
+    path("terminate", views.TerminateSimulation.as_view()),
+    path("calculate", registry.lazy_view("django_oemof.views.CalculateResults")),
+    path("flows", registry.lazy_view("django_oemof.views.FlowsView")),
+]
@@ -0,0 +1,226 @@
+"""
+Module to run hooks as dependency graph with memoized hook outputs.
+
+Hooks declare the parameter keys they read and write (as dotted paths, e.g. "flow_data.building_type").
+From these declarations, dependencies between hooks are derived: a hook depends on an earlier hook if it reads
+or writes a key written by the earlier hook or writes a key read by the earlier hook.
+Hooks without dependencies between them may run concurrently.
+Outputs (written keys) of hooks are memoized by a fingerprint of their inputs (read keys), thus if a user changes
+a single answer, only hooks depending on it are rerun.
+"""
+
+from __future__ import annotations
+
+import copy
+import hashlib
+import logging
+import pickle
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from functools import cached_property
+from typing import TYPE_CHECKING
+from typing import Any
+
+from . import settings
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+    from collections.abc import Iterable
+
+    from django.http import HttpRequest
+
+
+class Missing:
+    """Marks keys not present in parameters; stays identical if copied, thus memoized outputs can hold it."""
+
+    def __copy__(self):
+        return self
+
+    def __deepcopy__(self, memo):
+        return self
+
+    def __reduce__(self):
+        return "MISSING"
+
+    def __repr__(self):
+        return "MISSING"
+
+
+MISSING = Missing()
+
+
+@dataclass(frozen=True)
+class HookSpec:
+    """Keys read and written by a hook; hooks depending on request (session) must not be memoized."""
+
+    reads: tuple[str, ...] = ()
+    writes: tuple[str, ...] = ()
+    memoize: bool = True
+
+
+def declare(reads: Iterable[str] = (), writes: Iterable[str] = (), *, memoize: bool = True):
+    """Decorator to declare keys a hook reads from and writes to parameters."""
+
+    def decorator(function: Callable) -> Callable:
+        function.spec = HookSpec(tuple(reads), tuple(writes), memoize)
+        return function
+
+    return decorator
+
+
+def get_path(parameters: dict, path: str) -> Any:
+    """Return value at dotted path in parameters or MISSING."""
+    value = parameters
+    for key in path.split("."):
+        if not isinstance(value, dict) or key not in value:
+            return MISSING
+        value = value[key]
+    return value
+
+
+def set_path(parameters: dict, path: str, value: Any):
+    """Set value at dotted path in parameters; value MISSING removes key."""
+    *parents, key = path.split(".")
+    target = parameters
+    for parent in parents:
+        target = target.setdefault(parent, {})
+    if value is MISSING:
+        target.pop(key, None)
+    else:
+        target[key] = value
+
+
+def overlaps(paths: Iterable[str], other_paths: Iterable[str]) -> bool:
+    """Return True if any path equals or contains (is prefix of) any other path."""
+    for path in paths:
+        for other in other_paths:
+            shorter, longer = sorted((path.split("."), other.split(".")), key=len)
+            if longer[: len(shorter)] == shorter:
+                return True
+    return False
+
+
+def fingerprint(name: str, values: tuple) -> str:
+    """Return fingerprint of hook inputs."""
+    return hashlib.sha256(pickle.dumps((name, values), protocol=pickle.HIGHEST_PROTOCOL)).hexdigest()
+
+
+class HookCache:
+    """
+    Bounded LRU cache holding written values of hooks by fingerprint of their inputs.
+
+    Cache is shared by hooks running concurrently (see HOOK_WORKERS), thus access is guarded by a lock.
+    """
+
+    def __init__(self, maxsize: int):
+        self.maxsize = maxsize
+        self._outputs: OrderedDict[str, tuple] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> tuple | None:
+        with self._lock:
+            outputs = self._outputs.get(key)
+            if outputs is not None:
+                self._outputs.move_to_end(key)
+            return outputs
+
+    def set(self, key: str, outputs: tuple):
+        with self._lock:
+            self._outputs[key] = outputs
+            self._outputs.move_to_end(key)
+            while len(self._outputs) > self.maxsize:
+                self._outputs.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._outputs.clear()
+
+
+HOOK_CACHE = HookCache(maxsize=settings.HOOK_CACHE_SIZE)
+
+
+class HookPipeline:
+    """
+    Runs hooks (with declared reads and writes) as dependency graph.
+
+    Instances are used as a single django_oemof hook in place of the sequence of given hooks.
+    Hooks are grouped into stages; hooks within a stage are independent and run concurrently if max_workers > 1.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        functions: Iterable[Callable],
+        max_workers: int = 1,
+        cache: HookCache = HOOK_CACHE,
+    ):
+        self.__name__ = name
+        self.functions = list(functions)
+        self.max_workers = max_workers
+        self.cache = cache
+
+    @cached_property
+    def dependencies(self) -> dict[Callable, set[Callable]]:
+        """Dependencies of hooks; built on first use, thus lazily referenced hooks are imported on first run."""
+        for function in self.functions:
+            if not hasattr(function, "spec"):
+                error_msg = f"Hook '{function.__name__}' does not declare keys it reads and writes."
+                raise ValueError(error_msg)
+        dependencies = {}
+        for i, function in enumerate(self.functions):
+            spec = function.spec
+            dependencies[function] = {
+                earlier
+                for earlier in self.functions[:i]
+                if overlaps((*spec.reads, *spec.writes), earlier.spec.writes)
+                or overlaps(spec.writes, earlier.spec.reads)
+            }
+        return dependencies
+
+    @cached_property
+    def stages(self) -> list[list[Callable]]:
+        level = {}
+        for function in self.functions:
+            level[function] = max((level[dependency] + 1 for dependency in self.dependencies[function]), default=0)
+        stages = [[] for _ in range(max(level.values(), default=-1) + 1)]
+        for function in self.functions:
+            stages[level[function]].append(function)
+        return stages
+
+    def run_hook(self, function: Callable, scenario: str, parameters: dict, request: HttpRequest | None):
+        """Run single hook or apply its memoized outputs."""
+        spec = function.spec
+        key = None
+        if spec.memoize:
+            key = fingerprint(function.__qualname__, tuple(get_path(parameters, path) for path in spec.reads))
+            outputs = self.cache.get(key)
+            if outputs is not None:
+                logging.debug("Applying memoized outputs of hook '%s'.", function.__name__)
+                for path, value in zip(spec.writes, outputs, strict=True):
+                    set_path(parameters, path, copy.deepcopy(value))
+                return
+        logging.debug("Running hook '%s'.", function.__name__)
+        result = function(scenario, parameters, request)
+        if result is not parameters:
+            error_msg = f"Hook '{function.__name__}' must change and return given parameters to be used in pipeline."
+            raise ValueError(error_msg)
+        if key is not None:
+            self.cache.set(key, copy.deepcopy(tuple(get_path(parameters, path) for path in spec.writes)))
+
+    def __call__(self, scenario: str, parameters: dict, request: HttpRequest | None) -> dict:
+        if self.max_workers == 1:
+            for stage in self.stages:
+                for function in stage:
+                    self.run_hook(function, scenario, parameters, request)
+            return parameters
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            for stage in self.stages:
+                futures = [
+                    executor.submit(self.run_hook, function, scenario, parameters, request) for function in stage
+                ]
+                for future in futures:
+                    future.result()
+        return parameters
@@ -0,0 +1,439 @@
+"""
+Module to plan, fetch and interpolate profiles needed by simulations.
+
+Profiles are read from memory-mapped profile bundle (see `heat.bundle`) if built, otherwise from DB.
+Weather-dependent profiles are stored per weather region (see `heat.regions`), which is the first field of their key.
+Heat pump COP at supply temperatures not stored is synthesized from stored COP profiles (see `heat.cop`).
+In DB, profiles are stored as deduplicated normalized shapes and scales (see `heat.shapes`).
+Profile caches of a process are cleared, once profile data version changes after profiles have been re-imported.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import logging
+import operator
+from collections import OrderedDict
+from collections import defaultdict
+from functools import cache
+from functools import lru_cache
+from functools import reduce
+from typing import TYPE_CHECKING
+from typing import Any
+
+import numpy as np
+from django.core.cache import cache as django_cache
+from django.db import connection
+from django.db.models import Q
+
+from . import bundle
+from . import cop
+from . import models
+from . import pipeline
+from . import regions
+from . import settings
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+    from collections.abc import Iterator
+
+    from django.db.models import Model
+
+# Profile models and fields which identify a profile
+PROFILE_MODELS: dict[str, tuple[type[Model], tuple[str, ...]]] = {
+    "load": (models.Load, ("number_people", "eec")),
+    "hotwater": (models.Hotwater, ("number_people",)),
+    "heat": (models.Heat, ("region",)),
+    "photovoltaic": (models.Photovoltaic, ("region", "elevation_angle", "direction_angle")),
+    "solarthermal": (models.Solarthermal, ("region", "type", "temperature", "elevation_angle", "direction_angle")),
+    "heatpump": (models.Heatpump, ("region", "medium", "type_temperature")),
+}
+
+# Heat pump type from flow mapped to medium of heatpump profile and oeprom component
+HEATPUMPS = {
+    "air_heat_pump": ("air", "conversion_heatpump_air"),
+    "geothermal_pump": ("water", "conversion_heatpump_water"),
+    "groundwater": ("brine", "conversion_heatpump_brine"),
+}
+
+# Profiles depending on roof angles are stored on a grid of these fields (as last fields of key)
+ANGLE_FIELDS = ("elevation_angle", "direction_angle")
+
+# Flow data keys used to determine required profiles
+REQUIRED_PROFILE_KEYS = (
+    "postcode",
+    "latitude",
+    "longitude",
+    "number_persons",
+    "pv_exists",
+    "solar_thermal_exists",
+    "elevation",
+    "direction",
+    "scenario-primary_heating",
+    "scenario-heat_pump_type",
+    "scenario-secondary_heating",
+)
+
+ProfileKey = tuple[str, tuple[Any, ...]]
+
+DATA_VERSION_KEY = "heat:profiles:version"
+# Profile data version of profiles cached in current process
+LOADED_DATA_VERSION: dict[str, str] = {}
+
+
+def pv_selected(flow_data: dict) -> bool:
+    """Return True if PV exists or is selected in renovation scenario."""
+    return flow_data["pv_exists"] == "True" or "pv" in flow_data["scenario-secondary_heating"]
+
+
+def sth_selected(flow_data: dict) -> bool:
+    """Return True if solarthermal exists or is selected in renovation scenario."""
+    return flow_data["solar_thermal_exists"] == "True" or "solar" in flow_data["scenario-secondary_heating"]
+
+
+def required_profiles(parameters: dict) -> dict[str, ProfileKey]:
+    """
+    Return profiles needed by PARAMETER hooks for given parameters (after SETUP hooks have been applied).
+
+    Profiles are returned as mapping from oeprom component to profile key.
+    """
+    flow_data = parameters["flow_data"]
+    eec = settings.CONFIG["default_energy_efficiency_class"]
+    region = regions.get_region(flow_data)
+    profiles = {
+        "load_electricity": ("load", (flow_data["number_persons"], eec)),
+        "load_hotwater": ("hotwater", (flow_data["number_persons"],)),
+    }
+    if pv_selected(flow_data):
+        profiles["volatile_PV"] = ("photovoltaic", (region, flow_data["elevation"], flow_data["direction"]))
+    if sth_selected(flow_data):
+        angles = (flow_data["elevation"], flow_data["direction"])
+        temperature = parameters["tabula_data"]["flow_temperature"]
+        profiles["volatile_STH"] = ("solarthermal", (region, "heat", temperature, *angles))
+        profiles["load_STH"] = ("solarthermal", (region, "load", temperature, *angles))
+    if flow_data["scenario-primary_heating"] == "heat_pump" and flow_data["scenario-heat_pump_type"] in HEATPUMPS:
+        medium, component = HEATPUMPS[flow_data["scenario-heat_pump_type"]]
+        type_temperature = cop.type_temperature(parameters["tabula_data"]["flow_temperature"])
+        profiles[component] = ("heatpump", (region, medium, type_temperature))
+    return profiles
+
+
+def key_region(key: ProfileKey) -> str | None:
+    """Return weather region of profile key or None if profile does not depend on weather."""
+    model_name, values = key
+    _, fields = PROFILE_MODELS[model_name]
+    return values[0] if fields[:1] == ("region",) else None
+
+
+class QueryCounter:
+    """Context manager counting DB queries executed within its context."""
+
+    def __init__(self):
+        self.count = 0
+
+    def __call__(self, execute, sql, params, many, context):
+        self.count += 1
+        return execute(sql, params, many, context)
+
+    def __enter__(self):
+        self._wrapper = connection.execute_wrapper(self)
+        self._wrapper.__enter__()
+        return self
+
+    def __exit__(self, *exc_info):
+        return self._wrapper.__exit__(*exc_info)
+
+
+class ProfileCache:
+    """Bounded LRU cache holding (read-only) profiles by profile key."""
+
+    def __init__(self, maxsize: int):
+        self.maxsize = maxsize
+        self._profiles: OrderedDict[ProfileKey, np.ndarray] = OrderedDict()
+
+    def get(self, key: ProfileKey) -> np.ndarray | None:
+        profile = self._profiles.get(key)
+        if profile is not None:
+            self._profiles.move_to_end(key)
+        return profile
+
+    def set(self, key: ProfileKey, profile: np.ndarray):
+        profile.setflags(write=False)
+        self._profiles[key] = profile
+        self._profiles.move_to_end(key)
+        while len(self._profiles) > self.maxsize:
+            self._profiles.popitem(last=False)
+
+    def clear(self):
+        self._profiles.clear()
+
+
+PROFILE_CACHE = ProfileCache(maxsize=settings.PROFILE_CACHE_SIZE)
+# Normalized shapes by content hash, shared by all profiles of same shape
+SHAPE_CACHE = ProfileCache(maxsize=settings.SHAPE_CACHE_SIZE)
+
+
+def normalize_key(key: ProfileKey) -> ProfileKey:
+    """Validate profile key and convert its values to the types returned from DB."""
+    model_name, values = key
+    if model_name not in PROFILE_MODELS:
+        error_msg = f"Unknown profile model '{model_name}'."
+        raise KeyError(error_msg)
+    model, fields = PROFILE_MODELS[model_name]
+    values = tuple(
+        model._meta.get_field(field).to_python(value)  # noqa: SLF001
+        for field, value in zip(fields, values, strict=True)
+    )
+    return model_name, values
+
+
+@cache
+def angle_grid(model_name: str, region: str) -> dict[int, np.ndarray]:
+    """
+    Return stored direction angles per elevation angle for given profile model and region.
+
+    Only elevation angles holding all direction angles are used as interpolation grid.
+    """
+    model, _ = PROFILE_MODELS[model_name]
+    profile_bundle = bundle.get_bundle(region)
+    if profile_bundle is not None:
+        angles = {tuple(values[-2:]) for values in profile_bundle.keys(model_name)}
+    else:
+        angles = model.objects.filter(region=region).values_list("elevation_angle", "direction_angle").distinct()
+    grid = defaultdict(set)
+    for elevation, direction in angles:
+        grid[elevation].add(direction)
+    if not grid:
+        error_msg = f"No {model.__name__} profiles found for region '{region}'."
+        raise model.DoesNotExist(error_msg)
+    complete = max(len(directions) for directions in grid.values())
+    return {
+        elevation: np.array(sorted(directions))
+        for elevation, directions in sorted(grid.items())
+        if len(directions) == complete
+    }
+
+
+def linear_neighbours(grid_values: np.ndarray, value: float) -> list[tuple[int, float]]:
+    """Return neighbouring grid values and their weights for linear interpolation of value."""
+    index = int(np.searchsorted(grid_values, value))
+    if index < len(grid_values) and grid_values[index] == value:
+        return [(int(grid_values[index]), 1.0)]
+    if index in (0, len(grid_values)):
+        error_msg = f"Value {value} is outside of grid [{grid_values[0]}, {grid_values[-1]}]."
+        raise ValueError(error_msg)
+    low, high = grid_values[index - 1], grid_values[index]
+    weight = float((value - low) / (high - low))
+    return [(int(low), 1 - weight), (int(high), weight)]
+
+
+def bilinear_weights(grid: dict[int, np.ndarray], elevation: float, direction: float) -> dict[tuple[int, int], float]:
+    """Return weights of stored (elevation, direction) profiles to interpolate profile at given angles."""
+    weights = defaultdict(float)
+    for grid_elevation, elevation_weight in linear_neighbours(np.array(list(grid)), elevation):
+        for grid_direction, direction_weight in linear_neighbours(grid[grid_elevation], direction):
+            weights[(grid_elevation, grid_direction)] += elevation_weight * direction_weight
+    return dict(weights)
+
+
+def profile_weights(key: ProfileKey) -> dict[ProfileKey, float]:
+    """
+    Return stored profiles and weights which make up profile for given key.
+
+    Profiles depending on roof angles are interpolated bilinearly from stored angle grid,
+    all other profiles are taken as is.
+    """
+    model_name, values = key
+    _, fields = PROFILE_MODELS[model_name]
+    if fields[-2:] != ANGLE_FIELDS:
+        return {key: 1.0}
+    *fixed_values, elevation, direction = values
+    return {
+        (model_name, (*fixed_values, grid_elevation, grid_direction)): weight
+        for (grid_elevation, grid_direction), weight in bilinear_weights(
+            angle_grid(model_name, key_region(key)),
+            elevation,
+            direction,
+        ).items()
+    }
+
+
+def stored_regions() -> list[str]:
+    """Return weather regions of profiles stored in DB."""
+    stored = set()
+    for model, fields in PROFILE_MODELS.values():
+        if fields[:1] == ("region",):
+            stored.update(model.objects.values_list("region", flat=True).distinct())
+    return sorted(stored)
+
+
+def fetch_shapes(hashes: Iterable[str]) -> dict[str, np.ndarray]:
+    """Fetch normalized shapes by content hash using one query for all shapes not cached yet."""
+    shapes = {shape_hash: SHAPE_CACHE.get(shape_hash) for shape_hash in set(hashes)}
+    missing = [shape_hash for shape_hash, shape in shapes.items() if shape is None]
+    if missing:
+        for shape_hash, shape in models.ProfileShape.objects.filter(hash__in=missing).values_list("hash", "shape"):
+            shapes[shape_hash] = np.asarray(shape, dtype=float)
+            SHAPE_CACHE.set(shape_hash, shapes[shape_hash])
+    return shapes
+
+
+def stored_profiles(
+    region: str | None = None,
+    model_names: Iterable[str] = PROFILE_MODELS,
+) -> Iterator[tuple[ProfileKey, np.ndarray]]:
+    """Yield profiles of given region (or profiles not depending on weather) stored in DB with their keys."""
+    for model_name in model_names:
+        model, fields = PROFILE_MODELS[model_name]
+        if (fields[:1] == ("region",)) != (region is not None):
+            continue
+        queryset = model.objects.filter(region=region) if region is not None else model.objects.all()
+        rows = list(queryset.values_list(*fields, "shape_id", "scale").order_by(*fields))
+        shapes = fetch_shapes(shape_hash for *_, shape_hash, _ in rows)
+        for *values, shape_hash, scale in rows:
+            yield (model_name, tuple(values)), shapes[shape_hash] * scale
+
+
+def fetch_stored_profiles(keys: Iterable[ProfileKey]) -> dict[ProfileKey, np.ndarray]:
+    """
+    Fetch stored profiles for given keys from profile bundle or using one query per profile table.
+
+    Keys are deduplicated, thus profiles shared by multiple buildings are only fetched once.
+    Profiles from bundle (of region of profile) are read-only views on shared memory.
+    Profiles from DB are scaled from shapes, which are fetched in one additional query.
+    """
+    profiles = {}
+    keys_per_model = defaultdict(set)
+    for key in keys:
+        profile_bundle = bundle.get_bundle(key_region(key))
+        profile = profile_bundle.get(key) if profile_bundle is not None else None
+        if profile is not None:
+            profiles[key] = profile
+        else:
+            keys_per_model[key[0]].add(key[1])
+
+    references = {}
+    for model_name, model_keys in keys_per_model.items():
+        model, fields = PROFILE_MODELS[model_name]
+        queryset = model.objects.all()
+        if fields:
+            lookups = (Q(**dict(zip(fields, values, strict=True))) for values in model_keys)
+            queryset = queryset.filter(reduce(operator.or_, lookups))
+        for *values, shape_hash, scale in queryset.values_list(*fields, "shape_id", "scale"):
+            references.setdefault((model_name, tuple(values)), (shape_hash, scale))
+
+        for values in model_keys:
+            if (model_name, values) not in references:
+                error_msg = f"No {model.__name__} profile found for {dict(zip(fields, values, strict=True))}."
+                raise model.DoesNotExist(error_msg)
+
+    shapes = fetch_shapes(shape_hash for shape_hash, _ in references.values())
+    for key, (shape_hash, scale) in references.items():
+        profiles[key] = shapes[shape_hash] * scale
+    return profiles
+
+
+def synthesized(key: ProfileKey) -> bool:
+    """Return True if profile is synthesized instead of stored (heat pump COP at supply temperature not stored)."""
+    model_name, values = key
+    return model_name == "heatpump" and cop.supply_temperature(values[-1]) not in cop.STORED_SUPPLY_TEMPERATURES
+
+
+@lru_cache(maxsize=settings.REGION_CACHE_SIZE * len(HEATPUMPS))
+def cop_calibration(region: str, medium: str) -> cop.Calibration:
+    """Return COP model of heat pumps of given medium in given region, calibrated from stored COP profiles."""
+    keys = {
+        temperature: ("heatpump", (region, medium, cop.type_temperature(temperature)))
+        for temperature in cop.STORED_SUPPLY_TEMPERATURES
+    }
+    stored = fetch_stored_profiles(keys.values())
+    return cop.calibrate({temperature: stored[key] for temperature, key in keys.items()})
+
+
+def compute_data_version() -> str:
+    """Return profile data version as checksum of all imported raw profile files."""
+    digest = hashlib.sha256()
+    for path, checksum in models.ProfileSource.objects.order_by("path").values_list("path", "checksum"):
+        digest.update(f"{path}:{checksum}\n".encode())
+    return digest.hexdigest()[:16]
+
+
+def publish_data_version() -> str:
+    """Compute profile data version and share it with all processes."""
+    version = compute_data_version()
+    django_cache.set(DATA_VERSION_KEY, version, None)
+    return version
+
+
+def data_version() -> str:
+    """Return version of stored profile data, which changes whenever re-imported profiles have changed."""
+    version = django_cache.get(DATA_VERSION_KEY)
+    if version is None:
+        version = publish_data_version()
+    return version
+
+
+def clear_caches():
+    """Clear profiles and data derived from profiles (including memoized hook outputs) cached in current process."""
+    # pylint: disable=C0415
+    from . import spaceheat
+
+    PROFILE_CACHE.clear()
+    SHAPE_CACHE.clear()
+    angle_grid.cache_clear()
+    cop_calibration.cache_clear()
+    bundle.get_bundle.cache_clear()
+    spaceheat.heat_profile.cache_clear()
+    pipeline.HOOK_CACHE.clear()
+
+
+def use_data_version(version: str):
+    """Clear caches of current process if they may hold profiles of another profile data version."""
+    if LOADED_DATA_VERSION.get("version") != version:
+        if "version" in LOADED_DATA_VERSION:
+            logging.info("Profile data version changed to '%s'. Clearing profile caches.", version)
+        clear_caches()
+        LOADED_DATA_VERSION["version"] = version
+
+
+def fetch_profiles(parameter_sets: Iterable[dict]) -> tuple[list[dict[str, np.ndarray]], int]:
+    """
+    Fetch profiles needed by PARAMETER hooks for one or many parameter sets.
+
+    Profiles are taken from process-wide LRU cache if possible. Missing profiles are fetched in one batch,
+    profiles at roof angles not stored in DB are interpolated from stored angle grid and COP at supply temperatures
+    not stored is synthesized (memoized per region, medium and supply temperature by LRU cache).
+    Returns profiles per parameter set (mapped by oeprom component) and the number of executed DB queries.
+    """
+    with QueryCounter() as queries:
+        required = [
+            {component: normalize_key(key) for component, key in required_profiles(parameters).items()}
+            for parameters in parameter_sets
+        ]
+        profiles = {}
+        weights = {}
+        synthesized_keys = []
+        for key in {key for keys in required for key in keys.values()}:
+            profile = PROFILE_CACHE.get(key)
+            if profile is not None:
+                profiles[key] = profile
+            elif synthesized(key):
+                synthesized_keys.append(key)
+            else:
+                weights[key] = profile_weights(key)
+
+        stored = fetch_stored_profiles(stored_key for key in weights for stored_key in weights[key])
+        for key, key_weights in weights.items():
+            if key_weights == {key: 1.0}:
+                # Profile is used as is, thus profiles from bundle are not copied
+                profiles[key] = stored[key]
+            else:
+                stacked = np.stack([stored[stored_key] for stored_key in key_weights])
+                profiles[key] = np.fromiter(key_weights.values(), dtype=float) @ stacked
+            PROFILE_CACHE.set(key, profiles[key])
+        for key in synthesized_keys:
+            region, medium, type_temperature = key[1]
+            profiles[key] = cop_calibration(region, medium).cop(cop.supply_temperature(type_temperature))
+            PROFILE_CACHE.set(key, profiles[key])
+
+    return [{component: profiles[key] for component, key in keys.items()} for keys in required], queries.count
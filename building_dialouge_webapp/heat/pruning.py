@@ -0,0 +1,131 @@
+"""Module to prune components which cannot carry any flow from energysystem before model is built."""
+
+from __future__ import annotations
+
+import logging
+from typing import TYPE_CHECKING
+
+import numpy as np
+import pandas as pd
+from oemof import solph
+
+if TYPE_CHECKING:
+    from oemof.network.network import Node
+
+
+def is_dead_flow(flow: solph.Flow) -> bool:
+    """
+    Return True if flow is fixed to zero.
+
+    This is the case for flows with zero nominal value, with investment limited to zero (and no existing capacity)
+    or with a profile of zeros.
+    """
+    if flow.investment is not None:
+        return flow.investment.maximum[0] == 0 and not flow.investment.existing
+    if flow.nominal_value is not None and flow.nominal_value == 0:
+        return True
+    if isinstance(flow.fix, pd.Series | np.ndarray | list):
+        return len(flow.fix) > 0 and not np.any(np.asarray(flow.fix, dtype=float))
+    return flow.fix[0] is not None and flow.fix[0] == 0
+
+
+def flows_of(node: Node) -> list[solph.Flow]:
+    return [*node.inputs.values(), *node.outputs.values()]
+
+
+def has_single_flow_path(node: Node) -> bool:
+    """
+    Return True if node is source, sink or converter with a single input and output.
+
+    Flows of these components are coupled, thus one flow fixed to zero fixes all flows. This does not hold for
+    storages (which may discharge without charging) or components with several inputs or outputs.
+    """
+    if isinstance(node, solph.components.Source | solph.components.Sink):
+        return len(node.inputs) + len(node.outputs) == 1
+    return isinstance(node, solph.components.Converter) and len(node.inputs) == len(node.outputs) == 1
+
+
+def is_dead_node(node: Node, dead: set[Node]) -> bool:
+    """Return True if node cannot carry any flow, given already found dead nodes."""
+    if isinstance(node, solph.Bus):
+        return all(source in dead for source in node.inputs) and all(target in dead for target in node.outputs)
+    if not has_single_flow_path(node):
+        return all(is_dead_flow(flow) for flow in flows_of(node))
+    if any(is_dead_flow(flow) for flow in flows_of(node)):
+        return True
+    # Converters cannot produce anything if the bus they draw from has no supply
+    return bool(node.outputs) and any(
+        isinstance(source, solph.Bus) and all(supplier in dead for supplier in source.inputs) for source in node.inputs
+    )
+
+
+def find_dead_nodes(energysystem: solph.EnergySystem) -> set[Node]:
+    """Return nodes which cannot carry any flow; nodes are checked repeatedly until no further node is found."""
+    dead = set()
+    changed = True
+    while changed:
+        changed = False
+        for node in energysystem.nodes:
+            if node not in dead and is_dead_node(node, dead):
+                dead.add(node)
+                changed = True
+    return dead
+
+
+def estimate_savings(nodes: set[Node], timesteps: int) -> tuple[int, int]:
+    """
+    Estimate number of variables and constraints saved by removing given nodes.
+
+    Each flow holds one variable per timestep (plus one investment variable), each bus, investment flow and
+    conversion holds one constraint per timestep.
+    """
+    flows = {flow for node in nodes for flow in flows_of(node)}
+    investments = sum(flow.investment is not None for flow in flows)
+    variables = len(flows) * timesteps + investments
+    conversions = sum(isinstance(node, solph.components.Converter) for node in nodes)
+    buses = sum(isinstance(node, solph.Bus) for node in nodes)
+    constraints = (buses + investments + conversions) * timesteps
+    return variables, constraints
+
+
+def rebuild(energysystem: solph.EnergySystem, nodes: list[Node]) -> solph.EnergySystem:
+    """Return new energysystem with time setup of given energysystem, holding given nodes (and their groups)."""
+    kwargs = {}
+    if energysystem.timeindex is None or energysystem.periods is not None:
+        kwargs["timeincrement"] = energysystem.timeincrement
+    rebuilt = solph.EnergySystem(
+        timeindex=energysystem.timeindex,
+        periods=energysystem.periods,
+        infer_last_interval=False,
+        **kwargs,
+    )
+    rebuilt.add(*nodes)
+    return rebuilt
+
+
+def prune(energysystem: solph.EnergySystem) -> solph.EnergySystem:
+    """Return energysystem without nodes which cannot carry any flow (and their edges)."""
+    dead = find_dead_nodes(energysystem)
+    if not dead:
+        return energysystem
+    dead |= {subnode for node in dead for subnode in getattr(node, "subnodes", [])}
+
+    timesteps = len(energysystem.timeindex) if energysystem.timeindex is not None else 0
+    variables, constraints = estimate_savings(dead, timesteps)
+
+    for node in dead:
+        for source in list(node.inputs):
+            del source.outputs[node]
+        for target in list(node.outputs):
+            del node.outputs[target]
+    # Groups are built when nodes are added, thus remaining nodes are added to a new energysystem
+    pruned = rebuild(energysystem, [node for node in energysystem.nodes if node not in dead])
+
+    logging.info(
+        "Pruned %s nodes which cannot carry flow (%s); saves ~%s variables and ~%s constraints.",
+        len(dead),
+        ", ".join(sorted(str(node.label) for node in dead)),
+        variables,
+        constraints,
+    )
+    return pruned
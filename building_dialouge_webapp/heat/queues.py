@@ -0,0 +1,74 @@
+"""
+Module holding Celery queue topology and queue metrics.
+
+Interactive simulations (started by users) and batch jobs (e.g. simulations of large models) run in
+separate lanes (queues), thus batch jobs cannot starve users. Routing is set via CELERY_TASK_ROUTES,
+workers subscribe to lanes via CELERY_WORKER_QUEUES (see compose start scripts).
+Queue depth is read from the broker (and cached briefly for ETAs); wait time (publish to start) is recorded per
+queue in cache.
+"""
+
+from __future__ import annotations
+
+from celery import current_app
+from django.core.cache import cache
+from kombu.exceptions import ChannelError
+
+from . import settings
+
+INTERACTIVE_QUEUE = "interactive"
+BATCH_QUEUE = "batch"
+QUEUES = (INTERACTIVE_QUEUE, BATCH_QUEUE)
+
+PUBLISHED_HEADER = "published_at"
+PREFIX = "heat:queues"
+
+
+def wait_key(queue: str, metric: str) -> str:
+    return f"{PREFIX}:{queue}:{metric}"
+
+
+def queue_depths() -> dict[str, int]:
+    """Return number of tasks waiting in each lane."""
+    depths = {}
+    with current_app.connection_for_read() as connection, connection.channel() as channel:
+        for queue in QUEUES:
+            try:
+                depths[queue] = channel.queue_declare(queue, passive=True).message_count
+            except ChannelError:
+                # Queue has not been declared by any worker yet
+                depths[queue] = 0
+    return depths
+
+
+def recent_queue_depths() -> dict[str, int]:
+    """Return number of tasks waiting in each lane, as read from broker at most QUEUE_DEPTH_TIMEOUT seconds ago."""
+    depths = cache.get(f"{PREFIX}:depths")
+    if depths is None:
+        depths = queue_depths()
+        cache.set(f"{PREFIX}:depths", depths, settings.QUEUE_DEPTH_TIMEOUT)
+    return depths
+
+
+def record_wait(queue: str, seconds: float):
+    """Record time a task waited in given queue before being started."""
+    milliseconds = int(seconds * 1000)
+    for metric, value in (("count", 1), ("total_ms", milliseconds)):
+        cache.add(wait_key(queue, metric), 0, None)
+        cache.incr(wait_key(queue, metric), value)
+    if milliseconds > cache.get(wait_key(queue, "max_ms"), 0):
+        cache.set(wait_key(queue, "max_ms"), milliseconds, None)
+
+
+def wait_times() -> dict[str, dict[str, float]]:
+    """Return number of started tasks, mean and max wait time (in seconds) per queue."""
+    metrics = {}
+    for queue in QUEUES:
+        count = cache.get(wait_key(queue, "count"), 0)
+        total = cache.get(wait_key(queue, "total_ms"), 0)
+        metrics[queue] = {
+            "count": count,
+            "mean_wait": total / count / 1000 if count else 0.0,
+            "max_wait": cache.get(wait_key(queue, "max_ms"), 0) / 1000,
+        }
+    return metrics
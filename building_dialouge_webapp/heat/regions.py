@@ -0,0 +1,94 @@
+"""
+Module to resolve weather region of a building from postcode or coordinates.
+
+Weather-dependent profiles (PV, solarthermal, heat and COP) are stored per region. Profiles of default region
+are read from `DATA_DIR / "profiles"`, profiles of other regions from `DATA_DIR / "profiles" / <region>`.
+Regions are looked up in table `DATA_DIR / "regions" / "regions.csv"` (columns region, postcode_prefix,
+latitude, longitude): postcodes are matched by longest prefix, coordinates by nearest entry.
+Buildings without postcode or coordinates, or not covered by lookup table, use default region.
+"""
+
+from __future__ import annotations
+
+import logging
+from functools import cache
+from typing import TYPE_CHECKING
+
+import numpy as np
+import pandas as pd
+
+from . import settings
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+PROFILES_DIR = settings.DATA_DIR / "profiles"
+REGIONS_FILE = settings.DATA_DIR / "regions" / "regions.csv"
+DEFAULT_REGION = settings.DEFAULT_REGION
+
+
+def profile_dir(region: str = DEFAULT_REGION) -> Path:
+    """Return directory holding raw profiles of given region."""
+    if region == DEFAULT_REGION:
+        return PROFILES_DIR
+    return PROFILES_DIR / region
+
+
+def available_regions() -> list[str]:
+    """Return regions for which raw profiles exist (default region first)."""
+    regions = [DEFAULT_REGION]
+    if PROFILES_DIR.exists():
+        regions.extend(sorted(path.name for path in PROFILES_DIR.iterdir() if path.is_dir()))
+    return regions
+
+
+class RegionIndex:
+    """Lookup table of postcode prefixes and coordinates per region."""
+
+    def __init__(self, table: pd.DataFrame):
+        self.prefixes = dict(zip(table["postcode_prefix"].astype(str), table["region"], strict=True))
+        self.prefix_lengths = sorted({len(prefix) for prefix in self.prefixes}, reverse=True)
+        self.regions = table["region"].to_numpy(dtype=str)
+        self.coordinates = np.radians(table[["latitude", "longitude"]].to_numpy(dtype=float))
+
+    def by_postcode(self, postcode: str) -> str | None:
+        postcode = str(postcode).strip()
+        for length in self.prefix_lengths:
+            region = self.prefixes.get(postcode[:length])
+            if region is not None:
+                return region
+        return None
+
+    def by_coordinates(self, latitude: float, longitude: float) -> str | None:
+        """Return region of nearest entry (by great-circle distance)."""
+        if not len(self.regions):
+            return None
+        latitude, longitude = np.radians(float(latitude)), np.radians(float(longitude))
+        latitudes, longitudes = self.coordinates.T
+        haversine = (
+            np.sin((latitudes - latitude) / 2) ** 2
+            + np.cos(latitude) * np.cos(latitudes) * np.sin((longitudes - longitude) / 2) ** 2
+        )
+        return str(self.regions[int(np.argmin(haversine))])
+
+
+@cache
+def get_region_index() -> RegionIndex:
+    """Return region lookup table, which is loaded on first use."""
+    if not REGIONS_FILE.exists():
+        logging.info("No region lookup table found at '%s'. Default region is used.", REGIONS_FILE)
+        table = pd.DataFrame(columns=["region", "postcode_prefix", "latitude", "longitude"])
+    else:
+        table = pd.read_csv(REGIONS_FILE, dtype={"region": str, "postcode_prefix": str})
+    return RegionIndex(table)
+
+
+def get_region(flow_data: dict) -> str:
+    """Return weather region of building by postcode or coordinates given in flow data."""
+    index = get_region_index()
+    region = None
+    if flow_data.get("postcode"):
+        region = index.by_postcode(flow_data["postcode"])
+    if region is None and flow_data.get("latitude") is not None and flow_data.get("longitude") is not None:
+        region = index.by_coordinates(flow_data["latitude"], flow_data["longitude"])
+    return region or DEFAULT_REGION
@@ -0,0 +1,80 @@
+"""
+Module to reference hooks and views by dotted path, importing their modules on first use only.
+
+Web processes register all hooks and URLs, but never solve. Referencing hooks and views lazily keeps hook modules
+and their imports of the solver stack (pyomo, oemof.tabular) out of web-process imports at startup.
+Note that oemof.solph is still imported by web processes, as django_oemof.models imports it.
+"""
+
+from __future__ import annotations
+
+import importlib
+from functools import cached_property
+from typing import TYPE_CHECKING
+
+from celery import current_app
+from django.views.decorators.csrf import csrf_exempt
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+    from celery.canvas import Signature
+
+HOOKS_MODULE = "building_dialouge_webapp.heat.hooks"
+
+
+def import_string(path: str) -> object:
+    module, name = path.rsplit(".", 1)
+    return getattr(importlib.import_module(module), name)
+
+
+class LazyHook:
+    """Hook referenced by dotted path; module holding hook is imported on first call."""
+
+    def __init__(self, path: str):
+        self.path = path if "." in path else f"{HOOKS_MODULE}.{path}"
+        self.__name__ = self.path.rsplit(".", 1)[1]
+        self.__qualname__ = self.__name__
+
+    @cached_property
+    def function(self) -> Callable:
+        return import_string(self.path)
+
+    @property
+    def spec(self):
+        """Keys read and written by hook (see `pipeline.declare`); accessing them imports hook."""
+        return self.function.spec
+
+    def __call__(self, *args, **kwargs):
+        return self.function(*args, **kwargs)
+
+    def __repr__(self):
+        return f"LazyHook({self.path!r})"
+
+
+def hooks(*names: str) -> tuple[LazyHook, ...]:
+    """Return lazy hooks for given names (of hooks in `heat.hooks`) or dotted paths."""
+    return tuple(LazyHook(name) for name in names)
+
+
+def signature(task: str, *args) -> Signature:
+    """Return signature of Celery task referenced by name; module holding task is not imported."""
+    return current_app.signature(task, args=args)
+
+
+def lazy_view(path: str, **initkwargs) -> Callable:
+    """
+    Return view for DRF view referenced by dotted path; view module is imported on first request.
+
+    As `APIView.as_view()`, view is exempt from CSRF middleware (DRF enforces CSRF for session authentication itself).
+    """
+    view = None
+
+    @csrf_exempt
+    def dispatch(request, *args, **kwargs):
+        nonlocal view
+        if view is None:
+            view = import_string(path).as_view(**initkwargs)
+        return view(request, *args, **kwargs)
+
+    return dispatch
@@ -0,0 +1,121 @@
+"""Module to look up KfW renovation data for buildings."""
+
+from __future__ import annotations
+
+import copy
+import json
+import logging
+from functools import cache
+from functools import lru_cache
+from typing import TYPE_CHECKING
+
+import numpy as np
+import pandas as pd
+
+from . import settings
+from . import tabula
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+RENOVATION_DIR = settings.DATA_DIR / "renovations"
+CLUSTER_FILE = "clusters.csv"
+
+# Cluster used if no lookup table is available
+# https://github.com/rl-institut/bd_app/issues/90
+DEFAULT_CLUSTER_ID = 1
+
+# Columns of lookup table which must match exactly
+CATEGORICAL_FEATURES = ("building_type", "energy_source")
+# Columns of lookup table used for nearest-neighbour matching
+NUMERIC_FEATURES = (
+    "construction_year_class",
+    "roof_insulation_year",
+    "upper_storey_ceiling_insulation_year",
+    "cellar_insulation_year",
+    "facade_insulation_year",
+    "window_insulation_year",
+)
+# Building parts which can be chosen as insulated in insulation flow (see `forms.InsulationForm`)
+INSULATION_PARTS = NUMERIC_FEATURES[1:]
+
+
+def insulation_years(flow_data: dict) -> tuple[float, ...]:
+    """
+    Return insulation year of each building part.
+
+    Insulation flow only asks which building parts have been insulated, thus these are treated as insulated in
+    configured insulation year (or year of construction, if later) and remaining parts in year of construction.
+    """
+    construction_year = flow_data["construction_year"]
+    insulated = flow_data.get("insulation_choices") or []
+    insulation_year = max(settings.CONFIG["insulation_year"], construction_year)
+    return tuple(float(insulation_year if part in insulated else construction_year) for part in INSULATION_PARTS)
+
+
+def building_features(flow_data: dict) -> tuple[tuple[str, ...], tuple[float, ...]]:
+    """Extract categorical and numeric features used for cluster matching from flow data."""
+    categorical = tuple(str(flow_data.get(feature, "")) for feature in CATEGORICAL_FEATURES)
+    numeric = (float(tabula.nearest_year_index(flow_data["construction_year"])), *insulation_years(flow_data))
+    return categorical, numeric
+
+
+class RenovationIndex:
+    """
+    Holds renovation data of all KfW clusters and the lookup table to match buildings to clusters.
+
+    Data is read once; afterwards, resolving renovation data for a building needs no file I/O.
+    Buildings are matched to the nearest cluster (standardized euclidean distance of numeric features)
+    among clusters sharing the building's categorical features.
+    """
+
+    def __init__(self, directory: Path):
+        self.clusters = {
+            int(path.stem): json.loads(path.read_text(encoding="utf-8"))
+            for path in directory.glob("*.json")
+            if path.stem.isdigit()
+        }
+        self.cluster_ids = None
+        if (directory / CLUSTER_FILE).exists():
+            lookup = pd.read_csv(directory / CLUSTER_FILE)
+            self.cluster_ids = lookup["cluster_id"].to_numpy(dtype=int)
+            self.categories = lookup[list(CATEGORICAL_FEATURES)].astype(str).to_numpy()
+            features = lookup[list(NUMERIC_FEATURES)].to_numpy(dtype=float)
+            self.scale = features.std(axis=0)
+            self.scale[self.scale == 0] = 1
+            self.features = features / self.scale
+        else:
+            logging.warning(
+                "No renovation cluster lookup table found at '%s'. Using default cluster #%s.",
+                directory / CLUSTER_FILE,
+                DEFAULT_CLUSTER_ID,
+            )
+
+    @lru_cache(maxsize=1024)  # noqa: B019
+    def nearest_cluster(self, categorical: tuple[str, ...], numeric: tuple[float, ...]) -> int:
+        """Return ID of nearest cluster for given building features."""
+        if self.cluster_ids is None:
+            return DEFAULT_CLUSTER_ID
+        candidates = np.ones(len(self.cluster_ids), dtype=bool)
+        # Relax categorical features from last to first until at least one cluster matches
+        for number_of_features in range(len(categorical), -1, -1):
+            matches = (self.categories[:, :number_of_features] == categorical[:number_of_features]).all(axis=1)
+            if matches.any():
+                candidates = matches
+                break
+        distances = np.linalg.norm(self.features[candidates] - np.array(numeric) / self.scale, axis=1)
+        return int(self.cluster_ids[candidates][np.argmin(distances)])
+
+    def renovation_data(self, flow_data: dict) -> dict:
+        """Return (copy of) renovation data of cluster matching given flow data."""
+        cluster_id = self.nearest_cluster(*building_features(flow_data))
+        if cluster_id not in self.clusters:
+            error_msg = f"No renovation data found for cluster #{cluster_id}."
+            raise KeyError(error_msg)
+        return copy.deepcopy(self.clusters[cluster_id])
+
+
+@cache
+def get_renovation_index() -> RenovationIndex:
+    """Return renovation index, which is loaded on first use."""
+    return RenovationIndex(RENOVATION_DIR)
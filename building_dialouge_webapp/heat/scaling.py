@@ -0,0 +1,76 @@
+"""Module to report numerical scaling (coefficient ranges) of built oemof models."""
+
+from __future__ import annotations
+
+import math
+from typing import TYPE_CHECKING
+
+import numpy as np
+import pandas as pd
+from pyomo.environ import Constraint
+from pyomo.environ import Objective
+from pyomo.environ import Var
+from pyomo.environ import value
+from pyomo.repn import generate_standard_repn
+
+if TYPE_CHECKING:
+    from oemof import solph
+
+REPORT_COLUMNS = ("rows", "min_coefficient", "max_coefficient", "min_rhs", "max_rhs")
+
+
+def _nonzero_range(values: list[float]) -> tuple[float, float]:
+    """Return min and max of absolute non-zero values (NaN if there are none)."""
+    values = np.abs(np.asarray(values, dtype=float))
+    values = values[(values > 0) & np.isfinite(values)]
+    if len(values) == 0:
+        return math.nan, math.nan
+    return float(values.min()), float(values.max())
+
+
+def coefficient_ranges(model: solph.Model) -> pd.DataFrame:
+    """
+    Return range of absolute non-zero coefficients and right-hand sides per constraint block.
+
+    Variable bounds and objective coefficients are reported as blocks "variable bounds" and "objective".
+    Column "magnitudes" holds the spread of coefficients in orders of magnitude; the larger the spread,
+    the worse the LP is scaled.
+    """
+    report = {}
+    for constraint in model.component_objects(Constraint, active=True):
+        coefficients = []
+        rhs = []
+        for row in constraint.values():
+            if not row.active:
+                continue
+            repn = generate_standard_repn(row.body, quadratic=False)
+            coefficients.extend(value(coefficient) for coefficient in repn.linear_coefs)
+            rhs.extend(value(bound) - value(repn.constant) for bound in (row.lower, row.upper) if bound is not None)
+        report[constraint.name] = (len(constraint), *_nonzero_range(coefficients), *_nonzero_range(rhs))
+
+    bounds = [
+        bound
+        for variable in model.component_objects(Var, active=True)
+        for data in variable.values()
+        for bound in (data.lb, data.ub)
+        if bound is not None
+    ]
+    report["variable bounds"] = (len(bounds), math.nan, math.nan, *_nonzero_range(bounds))
+    for objective in model.component_objects(Objective, active=True):
+        repn = generate_standard_repn(objective.expr, quadratic=False)
+        coefficients = [value(coefficient) for coefficient in repn.linear_coefs]
+        report["objective"] = (1, *_nonzero_range(coefficients), math.nan, math.nan)
+
+    ranges = pd.DataFrame.from_dict(report, orient="index", columns=list(REPORT_COLUMNS))
+    ranges["magnitudes"] = np.log10(
+        ranges[["max_coefficient", "max_rhs"]].max(axis=1) / ranges[["min_coefficient", "min_rhs"]].min(axis=1),
+    )
+    return ranges.sort_values("magnitudes", ascending=False)
+
+
+def overall_range(ranges: pd.DataFrame) -> tuple[float, float]:
+    """Return overall min and max absolute value of coefficients, right-hand sides and bounds in given report."""
+    return (
+        float(ranges[["min_coefficient", "min_rhs"]].min().min()),
+        float(ranges[["max_coefficient", "max_rhs"]].max().max()),
+    )
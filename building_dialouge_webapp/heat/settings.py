@@ -21,12 +21,34 @@ COSTS_TECHNOLOGIES = pd.read_csv(DATA_DIR / "costs" / "costs_technologies.csv",
 
 SCENARIO_MAX = 3  # maximum of renovation scenario flow instances
 
+RESULTS_CACHE_TIMEOUT = 60 * 60 * 24  # in seconds
+PROFILE_CACHE_SIZE = 128  # maximum number of profiles held in LRU cache per process
+SHAPE_CACHE_SIZE = 256  # maximum number of normalized profile shapes held in LRU cache per process
+DEFAULT_REGION = "default"  # weather region of profiles used if building cannot be located
+REGION_CACHE_SIZE = 4  # maximum number of regional profile bundles held open per process
+HEAT_PROFILE_CACHE_SIZE = 64  # maximum number of synthesized space heat profiles held in LRU cache per process
+CAPACITY_BOUND_FACTOR = 2  # safety factor on peak hourly heat demand bounding otherwise unbounded capacities
+CAPACITY_BOUND_MIN = 10  # in kW; lower limit of bound of otherwise unbounded capacities
+LOAD_PEAK_FACTOR = 5  # ratio of peak to mean hourly demand assumed for loads without profile
+HOOK_CACHE_SIZE = 256  # maximum number of memoized hook outputs held in LRU cache per process
+HOOK_WORKERS = 1  # number of threads running independent hooks concurrently
+PAYLOAD_REFERENCE_MIN_SIZE = 1024  # arrays of this size or larger are sent as references in task payloads
+PAYLOAD_REFERENCE_TIMEOUT = 60 * 60 * 24  # in seconds
+SINGLE_FLIGHT_TIMEOUT = 10 * 60  # in seconds; running simulations are released after timeout at the latest
+ETA_DEFAULT_DURATION = 60  # in seconds; assumed solve duration as long as no statistics have been recorded
+ETA_HISTORY = 500  # number of recent simulation statistics used to fit duration predictor
+ETA_REFIT_TIMEOUT = 60 * 60  # in seconds
+ETA_BATCH_THRESHOLD = 30  # in seconds; simulations predicted to take longer are scheduled onto batch lane
+QUEUE_DEPTH_TIMEOUT = 10  # in seconds; queue depths read from broker are reused for ETAs meanwhile
+ETA_WORKER_CONCURRENCY = 2  # number of worker processes solving tasks of a lane concurrently
+WORKER_WARMUP = True  # load solver stack, profiles and model in worker processes before accepting tasks
 
-def map_elevation(angle: int) -> int:
+
+def check_elevation(angle: int) -> int:
     """
-    Map elevation angle to discrete value.
+    Check elevation angle of roof.
 
-    Possible angles are {0, 10, 20, 30, 40, 45, 50, 60, 70, 80, 90}.
+    Profiles for angles in between stored angles are interpolated, thus no mapping to discrete values is needed.
     """
     if angle > 90:  # noqa: PLR2004
         error_msg = "Elevation angle is greater than 90°."
@@ -34,10 +56,7 @@ def map_elevation(angle: int) -> int:
     if angle < 0:
         error_msg = "Elevation angle is lower than 0°."
         raise ValueError(error_msg)
-    if 40 <= angle <= 50:  # noqa: PLR2004
-        # This enables special angle of 45°
-        return round(angle / 5) * 5
-    return round(angle / 10) * 10
+    return angle
 
 
 def get_ep_cost(technology: str, capacity: int | None = None) -> float:
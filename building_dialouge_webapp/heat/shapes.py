@@ -0,0 +1,54 @@
+"""
+Module to store profiles as normalized shapes (deduplicated by content hash) and scalars.
+
+Many profiles are scaled versions of one shape (e.g. hotwater per person). Each profile is split into shape
+(profile divided by its peak, rounded) and scale (peak); shapes are stored once per content hash in
+`models.ProfileShape` and referenced by hash from profile tables. Hash and scale identify profile content,
+thus they serve as cheap cache keys (shapes are cached by hash, see `profiles.SHAPE_CACHE`).
+"""
+
+from __future__ import annotations
+
+import hashlib
+from typing import TYPE_CHECKING
+
+import numpy as np
+
+from . import models
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+
+SHAPE_DECIMALS = 9  # rounding of normalized shapes, thus scaled versions of one shape share their hash
+
+
+def content_hash(shape: np.ndarray) -> str:
+    return hashlib.sha256(np.ascontiguousarray(shape, dtype=np.float64).tobytes()).hexdigest()
+
+
+def split(profile: Iterable[float]) -> tuple[str, np.ndarray, float]:
+    """Split profile into content hash, normalized shape and scale (peak absolute value)."""
+    profile = np.asarray(profile, dtype=float)
+    scale = float(np.abs(profile).max(initial=0))
+    shape = np.round(profile / scale, SHAPE_DECIMALS) if scale else np.zeros_like(profile)
+    # Negative zeros would change content hash
+    shape += 0.0
+    return content_hash(shape), shape, scale
+
+
+def store(profile: Iterable[float]) -> dict:
+    """Store shape of profile (if not stored yet); returns fields referencing shape to be set on profile model."""
+    shape_hash, shape, scale = split(profile)
+    models.ProfileShape.objects.get_or_create(hash=shape_hash, defaults={"shape": shape.tolist()})
+    return {"shape_id": shape_hash, "scale": scale}
+
+
+def store_many(profiles: Iterable[Iterable[float]]) -> list[dict]:
+    """Store shapes of profiles in bulk (skipping shapes already stored); returns shape fields per profile."""
+    split_profiles = [split(profile) for profile in profiles]
+    unique_shapes = {shape_hash: shape for shape_hash, shape, _ in split_profiles}
+    models.ProfileShape.objects.bulk_create(
+        [models.ProfileShape(hash=shape_hash, shape=shape.tolist()) for shape_hash, shape in unique_shapes.items()],
+        ignore_conflicts=True,
+    )
+    return [{"shape_id": shape_hash, "scale": scale} for shape_hash, _, scale in split_profiles]
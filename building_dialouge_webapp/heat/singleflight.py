@@ -0,0 +1,110 @@
+"""
+Module to coalesce identical simulation requests into a single running simulation (single-flight).
+
+Requests are keyed by a canonical hash of scenario and (setup) parameters. The first request reserves the key
+via atomic `cache.add` (SET NX in Redis) and starts the simulation task under a pre-generated task ID.
+Duplicate requests (double clicks, reloads, several tabs) attach to the running task as waiters and poll the same
+task ID, thus all waiters get the same result. The key is released when the task has finished or was revoked.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import uuid
+from typing import TYPE_CHECKING
+
+from django.core.cache import cache
+
+from . import settings
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+PREFIX = "heat:singleflight"
+METRICS = ("started", "coalesced", "released")
+
+
+def canonical_key(scenario: str, parameters: dict) -> str:
+    """Return hash of scenario and parameters independent of key order."""
+    canonical = json.dumps([scenario, parameters], sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(canonical.encode()).hexdigest()
+
+
+def lock_key(key: str) -> str:
+    return f"{PREFIX}:lock:{key}"
+
+
+def waiters_key(task_id: str) -> str:
+    return f"{PREFIX}:waiters:{task_id}"
+
+
+def flight_key(task_id: str) -> str:
+    return f"{PREFIX}:flight:{task_id}"
+
+
+def metric_key(metric: str) -> str:
+    return f"{PREFIX}:metric:{metric}"
+
+
+def increment(key: str, timeout: int | None = settings.SINGLE_FLIGHT_TIMEOUT) -> int:
+    """Increment counter in cache, counter is initialized if missing."""
+    cache.add(key, 0, timeout)
+    return cache.incr(key)
+
+
+def submit(scenario: str, parameters: dict, start: Callable[[str], object]) -> tuple[str, bool]:
+    """
+    Start simulation via `start(task_id)` or attach to identical running simulation.
+
+    Returns task ID and whether request has been coalesced with a running simulation.
+    """
+    key = canonical_key(scenario, parameters)
+    task_id = str(uuid.uuid4())
+    # Retry once, in case running simulation has been released in between
+    for _ in range(2):
+        if cache.add(lock_key(key), task_id, settings.SINGLE_FLIGHT_TIMEOUT):
+            cache.set(flight_key(task_id), key, settings.SINGLE_FLIGHT_TIMEOUT)
+            cache.set(waiters_key(task_id), 1, settings.SINGLE_FLIGHT_TIMEOUT)
+            try:
+                start(task_id)
+            except Exception:
+                # Otherwise, identical requests would attach to a task which never runs
+                release(task_id)
+                raise
+            increment(metric_key("started"), None)
+            return task_id, False
+        running_task_id = cache.get(lock_key(key))
+        if running_task_id is not None:
+            increment(waiters_key(running_task_id))
+            increment(metric_key("coalesced"), None)
+            logging.info("Attached request to running simulation task #%s.", running_task_id)
+            return running_task_id, True
+    error_msg = "Could neither start nor attach to simulation."
+    raise RuntimeError(error_msg)
+
+
+def detach(task_id: str) -> int:
+    """Detach waiter from simulation task and return number of remaining waiters."""
+    if cache.get(waiters_key(task_id)) is None:
+        return 0
+    return max(cache.decr(waiters_key(task_id)), 0)
+
+
+def release(task_id: str):
+    """Release key of finished or revoked simulation task; following requests start a new task."""
+    key = cache.get(flight_key(task_id))
+    if key is None:
+        return
+    # Only delete lock if it still belongs to given task
+    if cache.get(lock_key(key)) == task_id:
+        cache.delete(lock_key(key))
+    cache.delete_many([flight_key(task_id), waiters_key(task_id)])
+    increment(metric_key("released"), None)
+
+
+def metrics() -> dict[str, int]:
+    """Return number of started, coalesced and released simulations."""
+    counts = cache.get_many([metric_key(metric) for metric in METRICS])
+    return {metric: counts.get(metric_key(metric), 0) for metric in METRICS}
@@ -0,0 +1,96 @@
+"""
+Module to synthesize building-specific space heat profiles from heating degree hours.
+
+Hourly heat demand is proportional to heating degree hours (room temperature minus ambient temperature) on days
+with mean ambient temperature below heating limit temperature. Heating limit temperature decreases with insulation
+class (given by building parts chosen as insulated in insulation flow), demand is smoothed by thermal inertia of
+heat emission system of tabula archetype. Hourly ambient temperature of region is taken from air heat pump
+calibration (see `heat.cop`).
+"""
+
+from __future__ import annotations
+
+import logging
+from functools import lru_cache
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+from . import cop
+from . import models
+from . import profiles
+from . import regions
+from . import renovations
+from . import settings
+from . import tabula
+
+HOURS_PER_DAY = 24
+INSULATION_YEARS = np.array(list(settings.CONFIG["insulation_classes"]))
+HEATING_LIMIT_TEMPERATURES = np.array(list(settings.CONFIG["insulation_classes"].values()), dtype=float)
+
+
+def insulation_class(flow_data: dict) -> int:
+    """
+    Return insulation class of building by mean insulation year of its parts.
+
+    Insulation years are derived from building parts chosen as insulated (see `renovations.insulation_years`).
+    """
+    year = np.mean(renovations.insulation_years(flow_data))
+    return min(int(np.searchsorted(INSULATION_YEARS, year)), len(INSULATION_YEARS) - 1)
+
+
+def daily_mean(temperature: np.ndarray) -> np.ndarray:
+    """Return mean temperature of day for each hour (last incomplete day is averaged as well)."""
+    days = np.arange(len(temperature)) // HOURS_PER_DAY
+    return (np.bincount(days, weights=temperature) / np.bincount(days))[days]
+
+
+def degree_hour_profiles(
+    temperature: np.ndarray,
+    heating_limit_temperatures: np.ndarray,
+    room_temperature: float,
+    inertia: int = 1,
+) -> np.ndarray:
+    """
+    Return normalized heat profiles (one row per heating limit temperature) for hourly ambient temperature.
+
+    Demand is smoothed by moving average over `inertia` hours (wrapping around end of year).
+    """
+    temperature = np.asarray(temperature, dtype=float)
+    limits = np.atleast_1d(np.asarray(heating_limit_temperatures, dtype=float))[:, None]
+    demand = np.where(daily_mean(temperature) < limits, np.maximum(room_temperature - temperature, 0), 0)
+    if inertia > 1:
+        padded = np.concatenate([demand[:, 1 - inertia :], demand], axis=1)
+        demand = sliding_window_view(padded, inertia, axis=1).mean(axis=-1)
+    totals = demand.sum(axis=1, keepdims=True)
+    return np.divide(demand, totals, out=np.zeros_like(demand), where=totals > 0)
+
+
+def ambient_temperature(region: str) -> np.ndarray:
+    """Return hourly ambient temperature (in °C) of region, as calibrated from air heat pump COP profiles."""
+    return profiles.cop_calibration(region, "air").source_temperature - cop.KELVIN
+
+
+@lru_cache(maxsize=settings.HEAT_PROFILE_CACHE_SIZE)
+def heat_profile(archetype: str, insulation: int, region: str) -> np.ndarray:
+    """Return normalized space heat profile for tabula archetype, insulation class and region."""
+    emission = tabula.TABULA_RECORDS[archetype]["HeatingSystem_Emission"]
+    profile = degree_hour_profiles(
+        ambient_temperature(region),
+        HEATING_LIMIT_TEMPERATURES[insulation],
+        settings.CONFIG["room_temperature"],
+        settings.CONFIG["thermal_inertia"].get(emission, 1),
+    )[0]
+    profile.setflags(write=False)
+    return profile
+
+
+def building_heat_profile(flow_data: dict) -> np.ndarray | None:
+    """Return space heat profile of building or None if ambient temperature of its region is not available."""
+    archetype = tabula.reference(flow_data["building_type"], tabula.nearest_year_index(flow_data["construction_year"]))
+    region = regions.get_region(flow_data)
+    try:
+        return heat_profile(archetype, insulation_class(flow_data), region)
+    except models.Heatpump.DoesNotExist:
+        logging.warning("No air heat pump profiles found for region '%s'. Using default heat profile.", region)
+        return None
@@ -0,0 +1,210 @@
+"""Module to train and apply surrogate model estimating simulation results from flow data."""
+
+from __future__ import annotations
+
+import logging
+from functools import cache
+from typing import TYPE_CHECKING
+
+import numpy as np
+import pandas as pd
+
+from . import renovations
+from . import settings
+from . import tabula
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+    from pathlib import Path
+
+SURROGATE_DIR = settings.DATA_DIR / "surrogate"
+MODEL_FILE = "surrogate.npz"
+REPORT_FILE = "validation.csv"
+
+# Regularization of ridge regression; keeps estimates stable for sparse one-hot features
+RIDGE_ALPHA = 1.0
+
+CATEGORICAL_FEATURES = ("building_type", "pv_exists", "solar_thermal_exists")
+SCENARIO_CATEGORICAL_FEATURES = ("primary_heating", "heat_pump_type")
+RENOVATION_MEASURES = ("facade_renovation", "roof_renovation", "window_renovation", "cellar_renovation")
+
+
+def extract_features(flow_data: dict, renovation_scenario: str = "scenario") -> dict[str, float]:
+    """
+    Extract features from flow data of given renovation scenario.
+
+    Categorical features are one-hot encoded as "<feature>=<value>".
+    Stored simulation parameters hold renovation scenario as "scenario", flow data in session as "scenario<ID>".
+    """
+    features = {f"{feature}={flow_data.get(feature, '')}": 1.0 for feature in CATEGORICAL_FEATURES}
+    for feature in SCENARIO_CATEGORICAL_FEATURES:
+        features[f"{feature}={flow_data.get(f'{renovation_scenario}-{feature}', '')}"] = 1.0
+    secondary_heating = flow_data.get(f"{renovation_scenario}-secondary_heating", [])
+    for technology in ("pv", "solar", "gas_heating", "heating_rod"):
+        features[f"secondary_heating={technology}"] = float(technology in secondary_heating)
+    # Renovation measures are chosen in multiple choice fields "<measure>_choice" of renovation request form
+    for measure in RENOVATION_MEASURES:
+        features[measure] = float(measure in (flow_data.get(f"{renovation_scenario}-{measure}_choice") or []))
+    # Building parts insulated before renovation are chosen in multiple choice field of insulation form
+    for part in renovations.INSULATION_PARTS:
+        features[f"insulated={part}"] = float(part in (flow_data.get("insulation_choices") or []))
+
+    features["construction_year_index"] = float(tabula.nearest_year_index(flow_data["construction_year"]))
+    features["number_persons"] = float(flow_data["number_persons"])
+    if flow_data.get("flat_roof") == "exists":
+        elevation, direction = 0, 0
+    else:
+        elevation = flow_data.get("roof_inclination", 0)
+        direction = settings.CONFIG["orientation"].get(flow_data.get("roof_orientation"), 0)
+    # Orientation is circular, thus it is encoded weighted by elevation (flat roof has no orientation)
+    features["roof_inclination"] = float(elevation)
+    features["roof_south"] = float(elevation) * np.cos(np.radians(direction))
+    features["roof_west"] = float(elevation) * np.sin(np.radians(direction))
+    return features
+
+
+def flatten_results(results: dict) -> dict[str, float]:
+    """Flatten compact results (see `atlas.summarize`) into targets."""
+    targets = {}
+    for name, value in results.items():
+        if isinstance(value, dict):
+            targets.update({f"{name}:{key}": float(item) for key, item in value.items()})
+        else:
+            targets[name] = float(value)
+    return targets
+
+
+class Surrogate:
+    """Multi-output ridge regression on standardized features."""
+
+    def __init__(
+        self,
+        feature_names: list[str],
+        target_names: list[str],
+        coefficients: np.ndarray,
+        mean: np.ndarray,
+        scale: np.ndarray,
+    ):
+        self.feature_names = list(feature_names)
+        self.target_names = list(target_names)
+        self.coefficients = coefficients
+        self.mean = mean
+        self.scale = scale
+        self._feature_index = {name: i for i, name in enumerate(self.feature_names)}
+
+    @classmethod
+    def fit(cls, features: list[dict[str, float]], targets: list[dict[str, float]], alpha: float = RIDGE_ALPHA):
+        """Fit surrogate to given features and targets; missing targets (e.g. components not invested) are 0."""
+        feature_names = sorted({name for sample in features for name in sample})
+        target_names = sorted({name for sample in targets for name in sample})
+        x = np.array([[sample.get(name, 0.0) for name in feature_names] for sample in features])
+        y = np.array([[sample.get(name, 0.0) for name in target_names] for sample in targets])
+        mean = x.mean(axis=0)
+        scale = x.std(axis=0)
+        scale[scale == 0] = 1
+        # Intercept is added as last column and is not regularized
+        design = np.hstack([(x - mean) / scale, np.ones((len(x), 1))])
+        penalty = alpha * np.eye(design.shape[1])
+        penalty[-1, -1] = 0
+        coefficients = np.linalg.solve(design.T @ design + penalty, design.T @ y)
+        return cls(feature_names, target_names, coefficients, mean, scale)
+
+    def vectorize(self, features: Iterable[dict[str, float]]) -> np.ndarray:
+        """Return design matrix for given features; features unknown to surrogate are ignored."""
+        samples = list(features)
+        x = np.zeros((len(samples), len(self.feature_names)))
+        for row, sample in enumerate(samples):
+            for name, value in sample.items():
+                if name in self._feature_index:
+                    x[row, self._feature_index[name]] = value
+        return np.hstack([(x - self.mean) / self.scale, np.ones((len(samples), 1))])
+
+    def predict_many(self, features: Iterable[dict[str, float]]) -> np.ndarray:
+        """Return estimated targets for given features (negative estimates are clipped)."""
+        return np.clip(self.vectorize(features) @ self.coefficients, 0, None)
+
+    def predict(self, features: dict[str, float]) -> dict[str, float]:
+        """Return estimated targets for given features."""
+        return dict(zip(self.target_names, self.predict_many([features])[0].tolist(), strict=True))
+
+    def estimate(self, flow_data: dict, renovation_scenario: str) -> dict:
+        """Return preliminary results for given renovation scenario."""
+        return {"preliminary": True, "results": self.predict(extract_features(flow_data, renovation_scenario))}
+
+    def save(self, path: Path):
+        np.savez(
+            path,
+            feature_names=np.array(self.feature_names),
+            target_names=np.array(self.target_names),
+            coefficients=self.coefficients,
+            mean=self.mean,
+            scale=self.scale,
+        )
+
+    @classmethod
+    def load(cls, path: Path) -> Surrogate:
+        with np.load(path) as data:
+            return cls(
+                data["feature_names"].tolist(),
+                data["target_names"].tolist(),
+                data["coefficients"],
+                data["mean"],
+                data["scale"],
+            )
+
+
+def archetype(features: dict[str, float]) -> tuple[str, int]:
+    """Return archetype (building type and construction year index) of given features."""
+    building_type = next(name.split("=", 1)[1] for name in features if name.startswith("building_type="))
+    return building_type, int(features["construction_year_index"])
+
+
+def validation_report(
+    features: list[dict[str, float]],
+    targets: list[dict[str, float]],
+    folds: int = 5,
+    alpha: float = RIDGE_ALPHA,
+) -> pd.DataFrame:
+    """
+    Cross-validate surrogate and return error of each target per archetype (building type and construction year).
+
+    Returns mean absolute error (MAE) and MAE relative to mean target value.
+    """
+    target_names = sorted({name for sample in targets for name in sample})
+    actual = pd.DataFrame(
+        [[sample.get(name, 0.0) for name in target_names] for sample in targets],
+        columns=target_names,
+    )
+    predicted = actual * np.nan
+    fold_ids = np.arange(len(features)) % folds
+    for fold in range(folds):
+        test = np.flatnonzero(fold_ids == fold)
+        train = np.flatnonzero(fold_ids != fold)
+        if len(test) == 0 or len(train) == 0:
+            continue
+        surrogate = Surrogate.fit([features[i] for i in train], [targets[i] for i in train], alpha)
+        for i in test:
+            prediction = surrogate.predict(features[i])
+            predicted.iloc[i] = [prediction.get(name, 0.0) for name in target_names]
+
+    index = pd.MultiIndex.from_tuples(
+        [archetype(sample) for sample in features],
+        names=["building_type", "construction_year_index"],
+    )
+    actual.index = predicted.index = index
+    keys = [*index.names, "target"]
+    errors = (predicted - actual).abs().reset_index().melt(id_vars=index.names, var_name="target", value_name="mae")
+    values = actual.reset_index().melt(id_vars=index.names, var_name="target", value_name="mean")
+    report = pd.concat([errors.groupby(keys)["mae"].mean(), values.groupby(keys)["mean"].mean()], axis=1)
+    report["relative_mae"] = report["mae"] / report["mean"].where(report["mean"] != 0)
+    return report.reset_index()
+
+
+@cache
+def get_surrogate() -> Surrogate | None:
+    """Return trained surrogate (loaded on first use) or None if no surrogate has been trained yet."""
+    path = SURROGATE_DIR / MODEL_FILE
+    if not path.exists():
+        logging.warning("No surrogate model found at '%s'. Estimates are not available.", path)
+        return None
+    return Surrogate.load(path)
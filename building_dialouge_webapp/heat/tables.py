@@ -1,8 +1,7 @@
+from functools import cache
 from math import isclose
 from typing import Any
 
-import pandas as pd
-
 
 def format_currency(value: Any) -> str:
     """Format a number as currency (Euro)."""
@@ -15,8 +14,24 @@ def format_currency(value: Any) -> str:
     return str(value)
 
 
+def to_number(value: Any) -> float | None:
+    """Convert value to a number, returning None if this is not possible."""
+    if isinstance(value, bool):
+        return int(value)
+    if isinstance(value, (int, float)):
+        return value
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
 class Table:
-    """Base class for generating and formatting tables."""
+    """
+    Base class for generating and formatting tables.
+
+    Table data is given as mapping from column header to column values and rendered to HTML in a single pass.
+    """
 
     translations = {
         "scenario1": "Szenario 1",
@@ -27,25 +42,39 @@ class Table:
     def __init__(self, data):
         self.data = data
 
+    @classmethod
+    @cache
+    def header_classes(cls) -> dict[str, str]:
+        """Map translated headers back to their keys, which are used as CSS classes."""
+        return {value: key for key, value in reversed(cls.translations.items())}
+
     def translate_column(self, column_name: str) -> str:
         return self.translations.get(column_name, column_name)
 
-    def generate_table_data(self) -> pd.DataFrame:
-        return pd.DataFrame(self.data)
+    def generate_table_data(self) -> dict[str, list]:
+        return dict(self.data)
 
-    def to_html(self, title: str) -> str:
-        dataframe = self.generate_table_data()
-        html = dataframe.to_html(classes="table", escape=False, index=False)
+    def format_cell(self, value: Any) -> str:
+        """Render a single table cell."""
+        return f"<td>{value}</td>"
 
-        for header in dataframe.columns:
-            translated = next((k for k, v in self.translations.items() if v == header), None)
-            if translated is not None:
-                html = html.replace(
-                    f"<th>{header}</th>",
-                    f'<th class="{translated}"><span>{header}</span></th>',
-                )
+    def format_header(self, header: str) -> str:
+        """Render a single header cell, adding CSS class for translated headers."""
+        css_class = self.header_classes().get(header)
+        if css_class is None:
+            return f"<th>{header}</th>"
+        return f'<th class="{css_class}"><span>{header}</span></th>'
 
-        return html.replace('<table border="1" class="dataframe table">', f'<table class="{title} table">')
+    def to_html(self, title: str) -> str:
+        table_data = self.generate_table_data()
+        header = "".join(self.format_header(column) for column in table_data)
+        body = "\n".join(
+            f"<tr>{''.join(self.format_cell(value) for value in row)}</tr>"
+            for row in zip(*table_data.values(), strict=True)
+        )
+        return (
+            f'<table class="{title} table">\n<thead>\n<tr>{header}</tr>\n</thead>\n<tbody>\n{body}\n</tbody>\n</table>'
+        )
 
 
 class ConsumptionTable(Table):
@@ -77,7 +106,7 @@ class ConsumptionTable(Table):
         "insulate_basement_ceiling",
     ]
 
-    def generate_table_data(self) -> pd.DataFrame:
+    def generate_table_data(self) -> dict[str, list]:
         used_procedures = [
             proc for proc in self.procedures if any(proc in scenario_data for scenario_data in self.data.values())
         ]
@@ -89,36 +118,33 @@ class ConsumptionTable(Table):
             table_data[self.translate_column(scenario)] = [
                 scenario_data.get(proc, "nicht ausgewählt") for proc in used_procedures
             ]
-        return pd.DataFrame(table_data)
+        return table_data
+
+    def format_cell(self, value: Any) -> str:
+        if value == "nicht ausgewählt":
+            return f'<td class="no-entry">{value}</td>'
+        return super().format_cell(value)
 
     def to_html(self, title: str = "consumption_table") -> str:
-        html_table = super().to_html(title)
-        return html_table.replace(
-            "<td>nicht ausgewählt</td>",
-            '<td class="no-entry">nicht ausgewählt</td>',
-        )
+        return super().to_html(title)
 
 
 class SumTable(Table):
     @staticmethod
-    def generate_sum_row(dataframe: pd.DataFrame) -> pd.DataFrame:
-        if not dataframe.empty and dataframe.shape[1] > 1:
-            sum_row = ["Summe"]
-            for col in dataframe.columns[1:]:
-                numeric_series = pd.to_numeric(dataframe[col], errors="coerce")
-                col_sum = numeric_series.sum(skipna=True)
-                sum_row.append(col_sum)
+    def generate_sum_row(table_data: dict[str, list]) -> dict[str, list]:
+        columns = list(table_data)
+        if len(columns) > 1 and table_data[columns[0]]:
+            table_data[columns[0]] = [*table_data[columns[0]], "Summe"]
+            for col in columns[1:]:
+                numbers = (to_number(value) for value in table_data[col])
+                col_sum = sum(number for number in numbers if number is not None)
+                table_data[col] = [format_currency(value) for value in (*table_data[col], col_sum)]
 
-            dataframe.loc[len(dataframe)] = sum_row
-
-            for col in dataframe.columns[1:]:
-                dataframe[col] = dataframe[col].apply(format_currency)
-
-        return dataframe
+        return table_data
 
     def generate_table_data(self):
-        dataframe = super().generate_table_data()
-        return self.generate_sum_row(dataframe)
+        table_data = super().generate_table_data()
+        return self.generate_sum_row(table_data)
 
     def to_html(self, title: str = "sum_table"):
         return super().to_html(title)
@@ -130,7 +156,7 @@ class InvestmentSummaryTable(SumTable):
         "investment_overview": "Finanzierungsübersicht",
     }
 
-    def generate_table_data(self) -> pd.DataFrame:
+    def generate_table_data(self) -> dict[str, list]:
         table_data = {
             self.translate_column("investment_overview"): [
                 "Investitionskosten",
@@ -142,7 +168,7 @@ class InvestmentSummaryTable(SumTable):
                 scenario_data.get("investment", 0),
                 scenario_data.get("contribution", 0),
             ]
-        return self.generate_sum_row(pd.DataFrame(table_data))
+        return self.generate_sum_row(table_data)
 
     def to_html(self, title: str = "investment_table") -> str:
         return super().to_html(title)
@@ -171,12 +197,10 @@ class InvestmentTable(Table):
         total_sum = sum(investments.values())
         formatted_sum = format_currency(total_sum)
 
-        return pd.DataFrame(
-            {
-                "Investitionskosten": [self.translations.get(k, k) for k in investments],
-                f"<span class='summary-value'>{formatted_sum}</span>": formatted_values,
-            },
-        )
+        return {
+            "Investitionskosten": [self.translations.get(k, k) for k in investments],
+            f"<span class='summary-value'>{formatted_sum}</span>": formatted_values,
+        }
 
 
 class SubsidiesTable(Table):
@@ -196,12 +220,10 @@ class SubsidiesTable(Table):
         total_sum = sum(subsidies.values())
         formatted_sum = f"-{format_currency(abs(total_sum))}"
 
-        return pd.DataFrame(
-            {
-                "Zuschüsse": [self.translations.get(k, k) for k in subsidies],
-                f"<span class='summary-value'>{formatted_sum}</span>": formatted_values,
-            },
-        )
+        return {
+            "Zuschüsse": [self.translations.get(k, k) for k in subsidies],
+            f"<span class='summary-value'>{formatted_sum}</span>": formatted_values,
+        }
 
 
 class EnergySavingsTable(Table):
@@ -227,12 +249,10 @@ class EnergySavingsTable(Table):
         total_sum = sum(savings.values())
         formatted_sum = f"-{format_currency(abs(total_sum))}"
 
-        return pd.DataFrame(
-            {
-                "Energetische Einsparungen über 15 Jahre": [self.translations.get(k, k) for k in savings],
-                f"<span class='summary-value'>{formatted_sum}</span>": formatted_values,
-            },
-        )
+        return {
+            "Energetische Einsparungen über 15 Jahre": [self.translations.get(k, k) for k in savings],
+            f"<span class='summary-value'>{formatted_sum}</span>": formatted_values,
+        }
 
 
 class TotalCostTable(Table):
@@ -240,12 +260,10 @@ class TotalCostTable(Table):
         investments = self.data.get("investments", {})
         subsidies = self.data.get("subsidies", {})
         total_cost = sum(investments.values()) - sum(subsidies.values())
-        return pd.DataFrame(
-            {
-                "Summe": [""],
-                "": [format_currency(total_cost)],
-            },
-        )
+        return {
+            "Summe": [""],
+            "": [format_currency(total_cost)],
+        }
 
 
 class TotalCost15YearsTable(Table):
@@ -254,9 +272,7 @@ class TotalCost15YearsTable(Table):
         subsidies = self.data.get("subsidies", {})
         savings = self.data.get("savings", {})
         total_cost = sum(investments.values()) - sum(subsidies.values()) - sum(savings.values())
-        return pd.DataFrame(
-            {
-                "Summe 15 Jahre": [""],
-                "": [format_currency(total_cost)],
-            },
-        )
+        return {
+            "Summe 15 Jahre": [""],
+            "": [format_currency(total_cost)],
+        }
@@ -0,0 +1,78 @@
+"""Module to look up tabula reference buildings."""
+
+from __future__ import annotations
+
+from bisect import bisect_left
+from types import MappingProxyType
+from typing import TYPE_CHECKING
+
+import numpy as np
+
+from . import settings
+
+if TYPE_CHECKING:
+    from collections.abc import Mapping
+    from collections.abc import Sequence
+
+CONSTRUCTION_YEARS = tuple(settings.CONFIG["construction_years"])
+_CONSTRUCTION_YEARS_ARRAY = np.array(CONSTRUCTION_YEARS)
+
+
+def _build_record(reference: str) -> Mapping:
+    """Build record of tabula reference building including derived fields."""
+    record = settings.TABULA_DATA[reference].to_dict()
+    # Set flow temperature depending on heating system (i.e. radiators/floorheating)
+    record["flow_temperature"] = settings.CONFIG["flow_temperature"].get(record["HeatingSystem_Emission"])
+    # Set available roof area
+    record["roof_area_available"] = float(record["roof_area_tabula"]) * settings.CONFIG["roof_usage"]
+    return MappingProxyType(record)
+
+
+# Immutable records of all tabula reference buildings, built once at load time
+TABULA_RECORDS: Mapping[str, Mapping] = MappingProxyType(
+    {reference: _build_record(reference) for reference in settings.TABULA_DATA.columns},
+)
+
+
+def nearest_year_index(construction_year: int) -> int:
+    """Return index (starting at 1) of nearest tabula construction year; ties are resolved to the earlier year."""
+    index = bisect_left(CONSTRUCTION_YEARS, construction_year)
+    if index == len(CONSTRUCTION_YEARS):
+        return index
+    if index > 0:
+        lower, upper = CONSTRUCTION_YEARS[index - 1], CONSTRUCTION_YEARS[index]
+        if construction_year - lower <= upper - construction_year:
+            return index
+    return index + 1
+
+
+def nearest_year_indices(construction_years: Sequence[int] | np.ndarray) -> np.ndarray:
+    """Vectorized version of `nearest_year_index`."""
+    years = np.asarray(construction_years)
+    upper = np.clip(np.searchsorted(_CONSTRUCTION_YEARS_ARRAY, years, side="left"), 1, len(CONSTRUCTION_YEARS) - 1)
+    lower = upper - 1
+    use_lower = years - _CONSTRUCTION_YEARS_ARRAY[lower] <= _CONSTRUCTION_YEARS_ARRAY[upper] - years
+    return np.where(use_lower, lower, upper) + 1
+
+
+def reference(building_type: str, year_index: int) -> str:
+    """Return tabula reference for given building type (from flow) and construction year index."""
+    tabula_building_type = settings.CONFIG["building_type"][building_type]
+    if tabula_building_type == "TH" and year_index == 1:
+        # There is no building data for "DE.N.TH.01."
+        year_index = 2
+    return f"DE.N.{tabula_building_type}.{year_index:02}."
+
+
+def get_tabula_data(building_type: str, construction_year: int) -> dict:
+    """Return (copy of) tabula data of reference building for given building type and construction year."""
+    return dict(TABULA_RECORDS[reference(building_type, nearest_year_index(construction_year))])
+
+
+def get_tabula_references(building_types: Sequence[str], construction_years: Sequence[int]) -> list[str]:
+    """Return tabula references for batches of buildings."""
+    year_indices = nearest_year_indices(construction_years)
+    return [
+        reference(building_type, int(year_index))
+        for building_type, year_index in zip(building_types, year_indices, strict=True)
+    ]
@@ -0,0 +1,80 @@
+import logging
+import time
+
+from celery.signals import before_task_publish
+from celery.signals import task_postrun
+from celery.signals import task_prerun
+from celery.signals import task_revoked
+from celery.signals import worker_process_init
+
+from . import eta
+from . import queues
+from . import settings
+from . import singleflight
+from . import warmup
+
+SIMULATION_TASK = "django_oemof.simulation.simulate_scenario"
+
+
+@task_prerun.connect
+def start_simulation_clock(sender=None, task_id=None, **kwargs):
+    if sender is not None and sender.name == SIMULATION_TASK:
+        eta.start(task_id)
+
+
+@task_postrun.connect
+def record_simulation_statistics(sender=None, task_id=None, args=None, kwargs=None, state=None, **_kwargs):
+    """Record size and wall time of successful simulation, used to predict solve durations."""
+    if sender is not None and sender.name == SIMULATION_TASK and state == "SUCCESS":
+        eta.record(task_id, *(args or ()), **(kwargs or {}))
+
+
+@task_postrun.connect
+def release_simulation(sender=None, task_id=None, **kwargs):
+    """Release single-flight key of finished simulation."""
+    if sender is not None and sender.name == SIMULATION_TASK:
+        singleflight.release(task_id)
+
+
+@task_revoked.connect
+def release_revoked_simulation(sender=None, request=None, **kwargs):
+    """Release single-flight key of revoked (terminated) simulation."""
+    if sender is not None and sender.name == SIMULATION_TASK:
+        singleflight.release(request.id)
+
+
+@before_task_publish.connect
+def stamp_published(headers=None, **kwargs):
+    """Add publish time to task headers, in order to measure wait time in queue."""
+    if headers is not None:
+        headers.setdefault(queues.PUBLISHED_HEADER, time.time())
+
+
+@task_prerun.connect
+def record_queue_wait(task=None, **kwargs):
+    """Record time task waited in its queue."""
+    published = getattr(task.request, queues.PUBLISHED_HEADER, None)
+    if published is None:
+        return
+    queue = (task.request.delivery_info or {}).get("routing_key", "")
+    wait = time.time() - published
+    logging.info("Task '%s' waited %.1f s in queue '%s'.", task.name, wait, queue)
+    queues.record_wait(queue, wait)
+
+
+@worker_process_init.connect
+def warm_up_worker_process(**kwargs):
+    """Warm up worker process before it accepts tasks."""
+    if settings.WORKER_WARMUP:
+        warmup.warm_up()
+
+
+@task_prerun.connect
+def start_task_clock(task_id=None, **kwargs):
+    warmup.task_started(task_id)
+
+
+@task_postrun.connect
+def report_first_task(sender=None, task_id=None, **kwargs):
+    if sender is not None:
+        warmup.task_finished(task_id, sender.name)
@@ -32,4 +32,6 @@ urlpatterns = [
     # htmx redirected views
     path("delete_flow/", views.delete_flow, name="delete_flow"),
     path("dev/session/", views.show_session),
+    path("dev/singleflight/", views.show_singleflight_metrics),
+    path("dev/queues/", views.show_queue_metrics),
 ]
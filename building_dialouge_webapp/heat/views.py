@@ -1,16 +1,28 @@
+import hashlib
 import inspect
+import json
 from urllib.parse import urlparse
 
+from django.core.cache import cache
 from django.http import HttpRequest
 from django.http import HttpResponseRedirect
 from django.http import JsonResponse
 from django.urls import reverse
+from django.utils.translation import get_language
+from django.utils.translation import gettext
 from django.views.generic import TemplateView
 from django_htmx.http import HttpResponseClientRedirect
+from django_oemof import hooks
+from django_oemof.settings import DJANGO_OEMOF_IGNORE_SIMULATION_PARAMETERS
+from rest_framework import status
+from rest_framework.response import Response
+from rest_framework.views import APIView
 
 from . import flows
 from . import forms
+from . import registry
 from . import settings as heat_settings
+from . import singleflight
 from . import tables
 from .charts import energycost_chart
 from .charts import heating_and_co2_chart
@@ -341,6 +353,16 @@ class OptimizationStart(SidebarNavigationMixin, TemplateView):
             or (not isinstance(step["object"], list) and step["object"].__name__ in not_finished)
         ]
         context["scenarios"] = get_finished_scenarios(self.request)
+        if all_finished:
+            # pylint: disable=C0415
+            from . import atlas
+
+            # Preliminary results of nearest precomputed archetype, shown until exact simulations are finished
+            flow_data = self.request.session.get("django_htmx_flow", {})
+            context["atlas_estimates"] = {
+                scenario: label_estimate(atlas.get_atlas().estimate(flow_data, scenario), scenario)
+                for scenario in context["scenarios"]
+            }
         return context
 
 
@@ -353,6 +375,94 @@ def simulate(request):
     # maybe some UI stuff for showing that sth is happening in the back
 
 
+class SimulateEnergysystem(APIView):
+    """
+    Starts simulation or attaches to identical running simulation (see `singleflight`) and reports ETA.
+
+    Replaces view of django_oemof, which is imported on first use only (see `heat.registry`).
+    """
+
+    @staticmethod
+    def post(request):
+        # Importing tasks connects signals stamping publish time of simulation task
+        # pylint: disable=C0415
+        from . import eta
+        from . import tasks
+
+        scenario = request.POST["scenario"]
+        parameters_raw = request.POST.get("parameters")
+        parameters = json.loads(parameters_raw) if parameters_raw else {}
+        for parameter in DJANGO_OEMOF_IGNORE_SIMULATION_PARAMETERS:
+            parameters.pop(parameter)
+        renovation_scenario = parameters.get("renovation_scenario")
+
+        parameters = hooks.apply_hooks(
+            hook_type=hooks.HookType.SETUP,
+            scenario=scenario,
+            data=parameters,
+            request=request,
+        )
+        # Simulations predicted to take long are scheduled onto batch lane
+        queue, duration = eta.schedule(parameters)
+
+        def start(task_id: str):
+            eta.register(task_id, queue, duration)
+            registry.signature(tasks.SIMULATION_TASK, scenario, parameters).apply_async(task_id=task_id, queue=queue)
+
+        task_id, coalesced = singleflight.submit(scenario, parameters, start)
+        start_simulation_task(request.session, task_id, renovation_scenario)
+        return Response({"task_id": task_id, "coalesced": coalesced, "eta": eta.remaining(task_id)})
+
+    @staticmethod
+    def get(request):
+        """Return simulation ID of finished simulation or expected remaining time (ETA) of running simulation."""
+        # pylint: disable=C0415
+        from . import eta
+
+        response = registry.import_string("django_oemof.views.SimulateEnergysystem").get(request)
+        if response.status_code != status.HTTP_200_OK:
+            return response
+        if response.data.get("simulation_id") is None:
+            response.data["eta"] = eta.remaining(request.GET["task_id"])
+        else:
+            finish_simulation_task(request.session, request.GET["task_id"], response.data["simulation_id"])
+        return response
+
+
+def start_simulation_task(session, task_id: str, renovation_scenario: str | None):
+    """Remember renovation scenario of simulation task; simulation of scenario is outdated until task finishes."""
+    if renovation_scenario is None:
+        return
+    session["simulation_tasks"] = {**session.get("simulation_tasks", {}), task_id: renovation_scenario}
+    simulation_ids = session.get("simulation_ids", {})
+    if renovation_scenario in simulation_ids:
+        session["simulation_ids"] = {
+            scenario: simulation_id
+            for scenario, simulation_id in simulation_ids.items()
+            if scenario != renovation_scenario
+        }
+
+
+def finish_simulation_task(session, task_id: str, simulation_id: int):
+    """Store simulation ID of finished task per renovation scenario, thus cached results are invalidated."""
+    simulation_tasks = dict(session.get("simulation_tasks", {}))
+    renovation_scenario = simulation_tasks.pop(task_id, None)
+    if renovation_scenario is None:
+        return
+    session["simulation_tasks"] = simulation_tasks
+    session["simulation_ids"] = {**session.get("simulation_ids", {}), renovation_scenario: simulation_id}
+
+
+class TerminateSimulation(APIView):
+    """Terminates simulation only if no other request is attached to it."""
+
+    @staticmethod
+    def post(request):
+        if singleflight.detach(request.POST["task_id"]) > 0:
+            return Response()
+        return registry.import_string("django_oemof.views.TerminateSimulationView").post(request)
+
+
 class Results(SidebarNavigationMixin, TemplateView):
     template_name = "pages/results.html"
     extra_context = {
@@ -362,6 +472,19 @@ class Results(SidebarNavigationMixin, TemplateView):
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
+        cache_key = get_results_cache_key(self.request)
+        results_context = cache.get(cache_key)
+        if results_context is None:
+            results_context = self.get_results_context()
+            cache.set(cache_key, results_context, heat_settings.RESULTS_CACHE_TIMEOUT)
+        context.update(results_context)
+        # Estimates are not cached, as they are replaced by results once simulations are finished
+        context["estimates"] = get_estimates(self.request)
+        return context
+
+    def get_results_context(self) -> dict:
+        """Calculate tables, charts and scenario boxes shown on results page."""
+        context = {}
 
         consumption_data = {
             "scenario1": {
@@ -605,6 +728,70 @@ class NextSteps(SidebarNavigationMixin, TemplateView):
     }
 
 
+def get_estimates(request: HttpRequest) -> dict:
+    """
+    Return preliminary (surrogate) results for finished scenarios which have not been simulated yet.
+
+    Simulation IDs of finished simulations are stored in session per scenario (see `finish_simulation_task`).
+    """
+    # pylint: disable=C0415
+    from . import surrogate
+
+    surrogate_model = surrogate.get_surrogate()
+    if surrogate_model is None:
+        return {}
+    simulation_ids = request.session.get("simulation_ids", {})
+    flow_data = request.session.get("django_htmx_flow", {})
+    return {
+        scenario: label_estimate(surrogate_model.estimate(flow_data, scenario), scenario)
+        for scenario in get_finished_scenarios(request)
+        if scenario not in simulation_ids
+    }
+
+
+def scenario_label(scenario: str) -> str:
+    """Return translated label of renovation scenario, e.g. "Szenario 1" for "scenario1"."""
+    return gettext("Szenario %(number)s") % {"number": scenario.removeprefix("scenario")}
+
+
+def label_estimate(estimate: dict | None, scenario: str) -> dict | None:
+    """Add label of renovation scenario to estimate, thus templates do not show internal scenario key."""
+    if estimate is None:
+        return None
+    return {**estimate, "label": scenario_label(scenario)}
+
+
+def get_results_cache_key(request: HttpRequest) -> str:
+    """
+    Return cache key for results page.
+
+    Key depends on simulation IDs, renovation scenario flow data (including scenario labels) and language.
+    Changing a renovation scenario flow results in a new key, thus invalidating cached results.
+    """
+    flow_data = request.session.get("django_htmx_flow", {})
+    scenario_data = {key: value for key, value in flow_data.items() if key.startswith("scenario")}
+    fingerprint = json.dumps(
+        {"simulation_ids": request.session.get("simulation_ids", {}), "scenarios": scenario_data},
+        sort_keys=True,
+        default=str,
+    )
+    digest = hashlib.sha256(fingerprint.encode()).hexdigest()
+    return f"heat:results:{get_language()}:{digest}"
+
+
 def show_session(request: HttpRequest) -> JsonResponse:
     """Show session. May be used by developers only."""
     return JsonResponse(dict(request.session))
+
+
+def show_singleflight_metrics(request: HttpRequest) -> JsonResponse:
+    """Show number of started and coalesced simulations. May be used by developers only."""
+    return JsonResponse(singleflight.metrics())
+
+
+def show_queue_metrics(request: HttpRequest) -> JsonResponse:
+    """Show depth and wait times of Celery queues. May be used by developers only."""
+    # pylint: disable=C0415
+    from . import queues
+
+    return JsonResponse({"depth": queues.queue_depths(), "wait": queues.wait_times()})
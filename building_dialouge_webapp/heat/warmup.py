@@ -0,0 +1,111 @@
+"""
+Module to warm up Celery worker processes before they accept simulation tasks.
+
+On `worker_process_init` (see `heat.tasks`), the solver stack is imported, cost tables and reference profiles
+are loaded into the process and the oeprom model is built once (without solving), thus pyomo and oemof code paths
+are loaded. Warm-up time per phase and latency of the first task are logged.
+"""
+
+from __future__ import annotations
+
+import importlib
+import logging
+import time
+from pathlib import Path
+
+from django.conf import settings as django_settings
+
+SOLVER_MODULES = ("pandas", "pyomo.environ", "oemof.solph", "oemof.tabular.facades", "django_oemof.simulation")
+PRELOADED_PROFILES = ("load", "hotwater", "heat", "heatpump")
+ANGLE_PROFILES = ("photovoltaic", "solarthermal")
+SCENARIO = "oeprom"
+
+# Warm-up time per phase and first task latency (in seconds) of current process
+REPORT: dict[str, float] = {}
+# Start times of tasks by task ID, until first task has finished
+TASKS_STARTED: dict[str, float] = {}
+
+
+def import_solver_stack():
+    for module in SOLVER_MODULES:
+        importlib.import_module(module)
+
+
+def load_cost_tables():
+    """Load heat settings (costs and tabula tables are read on import) and annuity calculation."""
+    from . import settings
+
+    for technology in settings.COSTS_TECHNOLOGIES.index.unique():
+        settings.get_ep_cost(technology)
+
+
+def load_profiles():
+    """
+    Load profiles without roof angles into profile cache and angle grids of all other profiles (of default region).
+
+    If profile bundle has been built, it is opened instead; its profiles are shared and need no copy per process.
+    Loaded profiles are marked with current profile data version, thus first task does not clear them.
+    """
+    from . import bundle
+    from . import profiles
+    from . import regions
+
+    profiles.use_data_version(profiles.data_version())
+    if bundle.get_bundle() is None:
+        for region in (None, regions.DEFAULT_REGION):
+            for key, profile in profiles.stored_profiles(region, PRELOADED_PROFILES):
+                profiles.PROFILE_CACHE.set(key, profile)
+    for model_name in ANGLE_PROFILES:
+        profiles.angle_grid(model_name, regions.DEFAULT_REGION)
+
+
+def build_model():
+    """Build oeprom energysystem and model once, thus model building code is loaded and compiled."""
+    from django_oemof import simulation
+    from oemof import solph
+
+    datapackage = Path(django_settings.MEDIA_ROOT) / "oemof" / SCENARIO / "datapackage.json"
+    if not datapackage.exists():
+        logging.info("Skipping model warm-up, as no datapackage found at '%s'.", datapackage)
+        return
+    solph.Model(simulation.build_energysystem(str(datapackage)))
+
+
+PHASES = {
+    "imports": import_solver_stack,
+    "cost_tables": load_cost_tables,
+    "profiles": load_profiles,
+    "model": build_model,
+}
+
+
+def warm_up() -> dict[str, float]:
+    """Run all warm-up phases; failing phases are logged and do not prevent worker from starting."""
+    for phase, function in PHASES.items():
+        start = time.perf_counter()
+        try:
+            function()
+        except Exception:
+            logging.exception("Warm-up phase '%s' failed.", phase)
+        REPORT[phase] = time.perf_counter() - start
+    logging.info(
+        "Warmed up worker process in %.2f s (%s).",
+        sum(REPORT.values()),
+        ", ".join(f"{phase}: {seconds:.2f} s" for phase, seconds in REPORT.items()),
+    )
+    return REPORT
+
+
+def task_started(task_id: str):
+    if "first_task" not in REPORT:
+        TASKS_STARTED[task_id] = time.perf_counter()
+
+
+def task_finished(task_id: str, name: str):
+    """Log latency of first task finished in current process."""
+    started = TASKS_STARTED.pop(task_id, None)
+    if started is None or "first_task" in REPORT:
+        return
+    REPORT["first_task"] = time.perf_counter() - started
+    TASKS_STARTED.clear()
+    logging.info("First task '%s' of worker process took %.2f s.", name, REPORT["first_task"])
@@ -1,5 +1,6 @@
 
 const scenarios = JSON.parse(document.getElementById("scenarios").innerText);
+const etaText = JSON.parse(document.getElementById("eta_text").innerText);
 
 const btnOptimization = document.getElementById("btn_optimization");
 const divOptimizationInfo = document.getElementById("optimization_info");
@@ -69,6 +70,7 @@ async function stopOptimization() {
 
 async function checkResults() {
   let simulationIds = [];
+  let eta = null;
   for (const taskId of runningTasks) {
     const response = await fetch("/oemof/simulate?task_id=" + taskId, {
       method: "GET"
@@ -77,12 +79,18 @@ async function checkResults() {
       const json = await response.json();
       if (json.simulation_id !== null) {
         simulationIds.push(json.simulation_id);
+      } else if (json.eta !== null && json.eta !== undefined) {
+        eta = Math.max(eta ?? 0, json.eta);
       }
     } else {
       throw new Error(`Simulation for task ID '${taskId}' not found: ${response.status}`);
     }
   }
   divOptimizationProgress.innerText = `${simulationIds.length} / ${scenarios.length} Simulationen abgeschlossen.`;
+  if (eta !== null) {
+    const minutes = Math.max(Math.ceil(eta / 60), 1);
+    divOptimizationProgress.innerText += " " + etaText.replace("%(minutes)s", minutes);
+  }
   if (simulationIds.length === runningTasks.length) {
     showResults(simulationIds);
   } else {
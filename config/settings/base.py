@@ -281,9 +281,10 @@ CELERY_RESULT_BACKEND_ALWAYS_RETRY = True
 # https://docs.celeryq.dev/en/stable/userguide/configuration.html#result-backend-max-retries
 CELERY_RESULT_BACKEND_MAX_RETRIES = 10
 # https://docs.celeryq.dev/en/stable/userguide/configuration.html#std:setting-accept_content
-CELERY_ACCEPT_CONTENT = ["json"]
+CELERY_ACCEPT_CONTENT = ["json", "bd-msgpack"]
 # https://docs.celeryq.dev/en/stable/userguide/configuration.html#std:setting-task_serializer
-CELERY_TASK_SERIALIZER = "json"
+# Compact msgpack codec, see building_dialouge_webapp.heat.codec
+CELERY_TASK_SERIALIZER = "bd-msgpack"
 # https://docs.celeryq.dev/en/stable/userguide/configuration.html#std:setting-result_serializer
 CELERY_RESULT_SERIALIZER = "json"
 # https://docs.celeryq.dev/en/stable/userguide/configuration.html#task-time-limit
@@ -292,6 +293,26 @@ CELERY_TASK_TIME_LIMIT = 5 * 60
 # https://docs.celeryq.dev/en/stable/userguide/configuration.html#task-soft-time-limit
 # TODO: set to whatever value is adequate in your circumstances
 CELERY_TASK_SOFT_TIME_LIMIT = 60
+# https://docs.celeryq.dev/en/stable/userguide/configuration.html#imports
+# Simulation task is sent by name from web processes, thus only workers import the solver stack
+CELERY_IMPORTS = ["django_oemof.simulation"]
+# https://docs.celeryq.dev/en/stable/userguide/configuration.html#std-setting-task_routes
+# Interactive simulations and batch jobs run in separate queues, see building_dialouge_webapp.heat.queues
+CELERY_TASK_ROUTES = {
+    "django_oemof.simulation.simulate_scenario": {"queue": "interactive"},
+    "building_dialouge_webapp.heat.tasks.*": {"queue": "batch"},
+}
+# https://docs.celeryq.dev/en/stable/userguide/configuration.html#worker-prefetch-multiplier
+# Long-running solver tasks must not be reserved by busy workers
+CELERY_WORKER_PREFETCH_MULTIPLIER = 1
+# https://docs.celeryq.dev/en/stable/userguide/configuration.html#worker-max-tasks-per-child
+CELERY_WORKER_MAX_TASKS_PER_CHILD = 100
+# https://docs.celeryq.dev/en/stable/userguide/configuration.html#worker-max-memory-per-child
+# Worker processes are recycled if resident memory (in KiB) exceeds limit after task (Pyomo/solver memory)
+CELERY_WORKER_MAX_MEMORY_PER_CHILD = env.int("CELERY_WORKER_MAX_MEMORY_PER_CHILD", 1024 * 1024)
+# https://docs.celeryq.dev/en/stable/userguide/configuration.html#worker-proc-alive-timeout
+# Worker processes are warmed up before accepting tasks (see building_dialouge_webapp.heat.warmup)
+CELERY_WORKER_PROC_ALIVE_TIMEOUT = 60
 # https://docs.celeryq.dev/en/stable/userguide/configuration.html#beat-scheduler
 CELERY_BEAT_SCHEDULER = "django_celery_beat.schedulers:DatabaseScheduler"
 # https://docs.celeryq.dev/en/stable/userguide/configuration.html#worker-send-task-events
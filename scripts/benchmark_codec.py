@@ -0,0 +1,54 @@
+"""Compare size and encode/decode time of task payloads using JSON and msgpack codec (heat.codec)."""
+
+import json
+import timeit
+
+import numpy as np
+import pandas as pd
+from django_oemof.standalone import init_django
+
+init_django(installed_apps=["building_dialouge_webapp.heat"])
+from building_dialouge_webapp.heat import codec  # noqa: E402
+
+REPEAT = 100
+HOURS = 8760
+PROFILES = ("load_electricity", "load_hotwater", "volatile_PV", "volatile_STH", "conversion_heatpump_air")
+
+
+def payload() -> dict:
+    """Return oeprom parameters holding profiles as 8760-point series."""
+    rng = np.random.default_rng(42)
+    return {component: {"profile": pd.Series(rng.random(HOURS)), "amount": 1.0} for component in PROFILES}
+
+
+def to_json(parameters: dict) -> str:
+    return json.dumps(parameters, default=lambda obj: obj.tolist())
+
+
+def main():
+    parameters = payload()
+    json_payload = to_json(parameters)
+    codec_payload = codec.encode(parameters)
+    codec.PAYLOAD_CACHE.clear()
+    cold_decode = timeit.timeit(lambda: codec.decode(codec_payload), number=1) * 1000
+
+    rows = [
+        {
+            "codec": "json",
+            "size_kb": len(json_payload.encode()) / 1024,
+            "encode_ms": timeit.timeit(lambda: to_json(parameters), number=REPEAT) / REPEAT * 1000,
+            "decode_ms": timeit.timeit(lambda: json.loads(json_payload), number=REPEAT) / REPEAT * 1000,
+        },
+        {
+            "codec": codec.SERIALIZER,
+            "size_kb": len(codec_payload) / 1024,
+            "encode_ms": timeit.timeit(lambda: codec.encode(parameters), number=REPEAT) / REPEAT * 1000,
+            "decode_ms": timeit.timeit(lambda: codec.decode(codec_payload), number=REPEAT) / REPEAT * 1000,
+        },
+    ]
+    print(pd.DataFrame(rows).round(3).to_string(index=False))  # noqa: T201
+    print(f"Decoding with empty local profile cache (resolved from Django cache): {cold_decode:.3f} ms")  # noqa: T201
+
+
+if __name__ == "__main__":
+    main()
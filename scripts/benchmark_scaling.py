@@ -0,0 +1,115 @@
+"""
+Compare numerical scaling, solve time and solver iterations of unbounded capacities.
+
+Capacities are set to the former big number (1e8) or to the bound from `hooks.bound_unbounded_capacities`.
+Representative scenarios (district heating, instantaneous water heater, freshwater station) are built as small
+hourly energysystems resembling the oeprom scenario. Requires CBC solver.
+"""
+
+import time
+import warnings
+
+import numpy as np
+import pandas as pd
+from oemof import solph
+
+from building_dialouge_webapp.heat import scaling
+
+HOURS = 8760
+BIG_NUMBER = 100_000_000
+HEAT_AMOUNT = 15.0  # in MWh
+HOTWATER_AMOUNT = 2.4  # in MWh
+SCENARIOS = ("district_heating", "conversion_dle", "conversion_fws")
+
+
+def profile(phase: float) -> np.ndarray:
+    """Return normalized profile with seasonal and daily variation."""
+    hours = np.arange(HOURS)
+    values = 1.2 + np.cos(2 * np.pi * (hours / HOURS + phase)) + 0.3 * np.sin(2 * np.pi * hours / 24)
+    return values / values.sum()
+
+
+def build_model(unbounded_component: str, capacity: float) -> solph.Model:
+    """Build model in which given component has given capacity (not optimized)."""
+    es = solph.EnergySystem(timeindex=pd.date_range("2025", periods=HOURS, freq="h"), infer_last_interval=False)
+    electricity = solph.Bus(label="b_electricity")
+    heat = solph.Bus(label="b_heat")
+    hotwater = solph.Bus(label="b_hotwater")
+    es.add(electricity, heat, hotwater)
+    es.add(
+        solph.components.Source(label="electricity_import", outputs={electricity: solph.Flow(variable_costs=350)}),
+        solph.components.Sink(
+            label="load_heat",
+            inputs={heat: solph.Flow(fix=profile(0), nominal_value=HEAT_AMOUNT)},
+        ),
+        solph.components.Sink(
+            label="load_hotwater",
+            inputs={hotwater: solph.Flow(fix=profile(0.5), nominal_value=HOTWATER_AMOUNT)},
+        ),
+        solph.components.Converter(
+            label="conversion_heatpump_air",
+            inputs={electricity: solph.Flow()},
+            outputs={heat: solph.Flow(investment=solph.Investment(ep_costs=120))},
+            conversion_factors={heat: 3.2},
+        ),
+        solph.components.GenericStorage(
+            label="storage_heat",
+            inputs={heat: solph.Flow()},
+            outputs={heat: solph.Flow()},
+            investment=solph.Investment(ep_costs=40),
+            loss_rate=0.01,
+            invest_relation_input_capacity=1 / 6,
+            invest_relation_output_capacity=1 / 6,
+        ),
+    )
+    district_heating_capacity = capacity if unbounded_component == "district_heating" else 0
+    es.add(
+        solph.components.Source(
+            label="district_heating",
+            outputs={heat: solph.Flow(nominal_value=district_heating_capacity, variable_costs=120)},
+        ),
+    )
+    for label, efficiency in (("conversion_dle", 0.99), ("conversion_fws", 0.95)):
+        es.add(
+            solph.components.Converter(
+                label=label,
+                inputs={electricity if label == "conversion_dle" else heat: solph.Flow()},
+                outputs={hotwater: solph.Flow(nominal_value=capacity if label == unbounded_component else 0)},
+                conversion_factors={hotwater: efficiency},
+            ),
+        )
+    return solph.Model(es)
+
+
+def solve(model: solph.Model) -> tuple[float, int | None]:
+    """Solve model and return solve time in seconds and number of solver iterations."""
+    start = time.perf_counter()
+    results = model.solve(solver="cbc")
+    duration = time.perf_counter() - start
+    iterations = getattr(getattr(results.solver.statistics, "black_box", None), "number_of_iterations", None)
+    return duration, iterations
+
+
+def main():
+    warnings.simplefilter("ignore", FutureWarning)
+    rows = []
+    for scenario in SCENARIOS:
+        for formulation, capacity in (("big number", BIG_NUMBER), ("bound", HEAT_AMOUNT + HOTWATER_AMOUNT)):
+            model = build_model(scenario, capacity)
+            minimum, maximum = scaling.overall_range(scaling.coefficient_ranges(model))
+            duration, iterations = solve(model)
+            rows.append(
+                {
+                    "scenario": scenario,
+                    "formulation": formulation,
+                    "range": f"[{minimum:.1e}, {maximum:.1e}]",
+                    "solve_time_s": round(duration, 2),
+                    "iterations": iterations,
+                    "objective": round(model.objective(), 2),
+                },
+            )
+    print(pd.DataFrame(rows).to_string(index=False))  # noqa: T201
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+"""Compare table rendering in heat.tables against previous pandas-based rendering (DataFrame.to_html)."""
+
+import timeit
+
+import pandas as pd
+
+from building_dialouge_webapp.heat import tables
+
+REPEAT = 1000
+
+SCENARIO_DATA = {
+    "investments": {
+        "air_heat_pump": 21500,
+        "hydraulic_balancing": 1000,
+        "change_circuit_pump": 1000,
+        "insulate_heat_distribution": 3000,
+        "insulate_water_distribution": 500,
+        "pv_battery": 27500,
+        "renovate_outer_facade": 11000,
+        "renovate_roof": 64500,
+        "insulate_basement_ceiling": 8000,
+    },
+    "subsidies": {
+        "tax_advantage_subsidy": 825,
+        "heating_basic_subsidy": 5500,
+        "heating_income_bonus": 8500,
+        "heating_emission_reduction_bonus": 5500,
+        "bafa_building_envelope_subsidy": 12000,
+    },
+    "savings": {
+        "air_heat_pump": 17000,
+        "hydraulic_comparison": 3600,
+        "change_circuit_pump": 900,
+        "insulate_heat_distribution": 4400,
+        "insulate_water_distribution": 900,
+        "pv_battery": 22200,
+        "renovate_outer_facade": 12400,
+        "renovate_roof": 21300,
+        "insulate_basement_ceiling": 3600,
+    },
+}
+TABLE_CLASSES = (
+    tables.InvestmentTable,
+    tables.SubsidiesTable,
+    tables.EnergySavingsTable,
+    tables.TotalCostTable,
+    tables.TotalCost15YearsTable,
+)
+
+
+def pandas_to_html(table: tables.Table, title: str) -> str:
+    """Render table as done previously, using DataFrame.to_html and string replacements."""
+    dataframe = pd.DataFrame(table.generate_table_data())
+    html = dataframe.to_html(classes="table", escape=False, index=False)
+    for header in dataframe.columns:
+        translated = next((k for k, v in table.translations.items() if v == header), None)
+        if translated is not None:
+            html = html.replace(
+                f"<th>{header}</th>",
+                f'<th class="{translated}"><span>{header}</span></th>',
+            )
+    return html.replace('<table border="1" class="dataframe table">', f'<table class="{title} table">')
+
+
+def render_tables():
+    for table_class in TABLE_CLASSES:
+        table_class(SCENARIO_DATA).to_html("scenario1 summary_table")
+
+
+def render_tables_pandas():
+    for table_class in TABLE_CLASSES:
+        pandas_to_html(table_class(SCENARIO_DATA), "scenario1 summary_table")
+
+
+if __name__ == "__main__":
+    for name, func in (("heat.tables", render_tables), ("pandas", render_tables_pandas)):
+        duration = timeit.timeit(func, number=REPEAT)
+        print(f"{name:<12} {duration / REPEAT * 1000:.3f} ms per scenario ({REPEAT} runs)")  # noqa: T201
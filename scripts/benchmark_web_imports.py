@@ -0,0 +1,72 @@
+"""
+Measure boot time and resident memory of a web process (Django setup and URLconf import).
+
+Each run starts a fresh interpreter, thus measurements are not influenced by previously imported modules.
+Django setup imports installed apps (django_oemof.models imports oemof.solph), URLconf imports views;
+both are reported separately. Heavy modules imported at boot are listed as well.
+"""
+
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+REPEAT = 15
+SETTINGS = os.environ.get("DJANGO_SETTINGS_MODULE", "config.settings.test")
+HEAVY_MODULES = (
+    "numpy",
+    "pandas",
+    "oemof.solph",
+    "oemof.tabular",
+    "pyomo",
+    "building_dialouge_webapp.heat.hooks",
+    "building_dialouge_webapp.heat.tasks",
+    "building_dialouge_webapp.heat.atlas",
+    "building_dialouge_webapp.heat.surrogate",
+)
+
+BOOT = f"""
+import json
+import resource
+import sys
+import time
+
+start = time.perf_counter()
+import django
+
+django.setup()
+setup = time.perf_counter() - start
+setup_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+from django.urls import get_resolver
+
+get_resolver().url_patterns
+print(json.dumps({{
+    "setup": setup,
+    "setup_rss": setup_rss,
+    "urls": time.perf_counter() - start - setup,
+    "urls_rss": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024 - setup_rss,
+    "modules": [module for module in {HEAVY_MODULES!r} if module in sys.modules],
+}}))
+"""
+
+
+def measure() -> dict:
+    output = subprocess.run(  # noqa: S603
+        [sys.executable, "-c", BOOT],
+        capture_output=True,
+        check=True,
+        text=True,
+        env={**os.environ, "DJANGO_SETTINGS_MODULE": SETTINGS},
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+if __name__ == "__main__":
+    runs = [measure() for _ in range(REPEAT)]
+    print(f"Median of {REPEAT} runs")  # noqa: T201
+    for step in ("setup", "urls"):
+        duration = statistics.median(run[step] for run in runs)
+        rss = statistics.median(run[f"{step}_rss"] for run in runs)
+        print(f"{step}: {duration * 1000:.0f} ms, +{rss:.1f} MiB max RSS")  # noqa: T201
+    print(f"Heavy modules imported at boot: {', '.join(runs[-1]['modules']) or '-'}")  # noqa: T201
@@ -1,38 +1,112 @@
+"""
+Resample minute-resolution profiles in DATA_DIR into hourly profiles.
+
+Files are streamed in chunks aligned to full hours, thus peak memory is bounded by MAX_CHUNK_VALUES
+independent of file length and width. Hourly profiles are written incrementally as CSV and as column-major
+(Fortran-ordered) NumPy array, column names of the latter are stored in a JSON file next to it.
+Files are processed in parallel.
+"""
+
+import json
+import math
+import os
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 
+import numpy as np
 import pandas as pd
 
 DATA_DIR = Path(__file__).parent.parent / "building_dialouge_webapp" / "data" / "profiles"
-date = "2023-01-01"  # Dummy date for timestamp column
-
-for filename in DATA_DIR.iterdir():
-    if filename.name.endswith(".csv"):
-        # Read the first row to get column names
-        with filename.open(encoding="utf-8") as f:
-            first_line = f.readline().strip()
-            column_names = first_line.split(",")
-
-        # Read the CSV again, skipping the first row
-        df_original = pd.read_csv(filename, skiprows=1, names=column_names)
-
-        # Generate a timestamp column
-        df_original.index = pd.date_range(start=date, periods=len(df_original), freq="min")
-        """  MEAN: all timeseries containing "COP", boiler, pv, sth_heat
-        SUM: heat, hotwater, load, sth_load """
-        mean_profiles = ["_cop_", "_boiler_", "_PV_", "_STH_heat_"]
-        sum_profiles = ["profile_heat_", "_hotwater_", "_load_"]
-        for designation in mean_profiles:
-            if designation in filename.name:
-                df_resampled = df_original.resample("h").mean(numeric_only=True)
-        for designation in sum_profiles:
-            if designation in filename.name:
-                df_resampled = df_original.resample("h").sum(numeric_only=True)
-
-        # Remove the timestamp index and reset it to match the original format
-        df_resampled.reset_index(drop=True)
-
-        # Save back to CSV (preserving the original column names)
-        output_path = DATA_DIR / f"hourly_{filename.name}"
-        df_resampled.to_csv(output_path, index=False)
-
-        print(f"Processed and saved: {output_path}")  # Noqa: T201
+MINUTES_PER_HOUR = 60
+MAX_CHUNK_VALUES = 2_400_000  # Maximum number of values (rows x columns) held in memory per chunk
+
+# MEAN: all timeseries containing "COP", boiler, pv, sth_heat
+# SUM: heat, hotwater, load, sth_load
+MEAN_PROFILES = ["_cop_", "_boiler_", "_PV_", "_STH_heat_"]
+SUM_PROFILES = ["profile_heat_", "_hotwater_", "_load_"]
+
+
+def get_aggregation(filename: str) -> str | None:
+    """Return aggregation rule ("mean" or "sum") for profile family of given file."""
+    aggregation = None
+    for designation in MEAN_PROFILES:
+        if designation in filename:
+            aggregation = "mean"
+    for designation in SUM_PROFILES:
+        if designation in filename:
+            aggregation = "sum"
+    return aggregation
+
+
+def resample_chunk(values: np.ndarray, aggregation: str) -> np.ndarray:
+    """Aggregate minute values (starting at a full hour) into hourly values, ignoring NaNs like pandas does."""
+    hour_starts = np.arange(0, len(values), MINUTES_PER_HOUR)
+    missing = np.isnan(values)
+    sums = np.add.reduceat(np.where(missing, 0, values), hour_starts, axis=0)
+    if aggregation == "sum":
+        return sums
+    counts = np.add.reduceat(~missing, hour_starts, axis=0)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return np.where(counts > 0, sums / counts, np.nan)
+
+
+def resample_file(filename: Path) -> Path | None:
+    """Resample given minute-resolution CSV file chunk-wise and return path of hourly CSV file."""
+    aggregation = get_aggregation(filename.name)
+    if aggregation is None:
+        print(f"Skipped (no aggregation rule found): {filename}")  # Noqa: T201
+        return None
+
+    with filename.open(encoding="utf-8") as f:
+        column_names = f.readline().strip().split(",")
+        number_of_rows = sum(1 for _ in f)
+
+    # Only numeric columns are resampled
+    first_rows = pd.read_csv(filename, skiprows=1, names=column_names, nrows=MINUTES_PER_HOUR)
+    numeric_columns = first_rows.select_dtypes("number").columns.tolist()
+    chunk_hours = max(MAX_CHUNK_VALUES // max(len(numeric_columns), 1) // MINUTES_PER_HOUR, 1)
+
+    output_path = DATA_DIR / f"hourly_{filename.name}"
+    columnar_path = output_path.with_suffix(".npy")
+    columnar = np.lib.format.open_memmap(
+        columnar_path,
+        mode="w+",
+        dtype=np.float64,
+        shape=(math.ceil(number_of_rows / MINUTES_PER_HOUR), len(numeric_columns)),
+        fortran_order=True,
+    )
+    columnar_path.with_suffix(".json").write_text(json.dumps(numeric_columns), encoding="utf-8")
+
+    hour = 0
+    with output_path.open("w", encoding="utf-8", newline="") as output:
+        chunks = pd.read_csv(
+            filename,
+            skiprows=1,
+            names=column_names,
+            usecols=numeric_columns,
+            chunksize=chunk_hours * MINUTES_PER_HOUR,
+        )
+        for i, chunk in enumerate(chunks):
+            hourly = resample_chunk(chunk[numeric_columns].to_numpy(dtype=np.float64), aggregation)
+            pd.DataFrame(hourly, columns=numeric_columns).to_csv(output, header=i == 0, index=False)
+            columnar[hour : hour + len(hourly)] = hourly
+            hour += len(hourly)
+    columnar.flush()
+
+    print(f"Processed and saved: {output_path}")  # Noqa: T201
+    return output_path
+
+
+def resample_profiles(max_workers: int | None = None) -> list[Path]:
+    """Resample all minute-resolution profiles in DATA_DIR in parallel."""
+    filenames = [
+        filename
+        for filename in DATA_DIR.iterdir()
+        if filename.name.endswith(".csv") and not filename.name.startswith("hourly_")
+    ]
+    with ProcessPoolExecutor(max_workers=max_workers or os.cpu_count()) as executor:
+        return [path for path in executor.map(resample_file, filenames) if path is not None]
+
+
+if __name__ == "__main__":
+    resample_profiles()
@@ -0,0 +1,50 @@
+import pytest
+
+from building_dialouge_webapp.heat import atlas
+
+
+def entry(building_type, primary_heating, construction_year_index, number_persons, costs):
+    return {
+        "building_type": building_type,
+        "primary_heating": primary_heating,
+        "heat_pump_type": "",
+        "construction_year_index": construction_year_index,
+        "number_persons": number_persons,
+        "results": {"total_system_costs": costs},
+    }
+
+
+@pytest.fixture
+def atlas_dir(tmp_path):
+    entries = [
+        entry("single_family", "gas_heating", 4, 2, 100),
+        entry("single_family", "gas_heating", 8, 2, 200),
+        entry("single_family", "district_heating", 4, 2, 300),
+    ]
+    atlas.write_atlas(entries, tmp_path)
+    return tmp_path
+
+
+def test_archetype_grid():
+    grid = list(atlas.archetype_grid(number_persons=(1, 2)))
+    assert len(grid) == len(atlas.BUILDING_TYPES) * len(atlas.tabula.CONSTRUCTION_YEARS) * 2 * len(atlas.HEATINGS)
+    categorical, numeric = atlas.building_features(grid[0], atlas.RENOVATION_SCENARIO)
+    assert categorical == (atlas.BUILDING_TYPES[0], *atlas.HEATINGS[0])
+    assert numeric == (1, 1)
+
+
+def test_atlas_estimates_nearest_entry(atlas_dir):
+    index = atlas.AtlasIndex(atlas_dir)
+    flow_data = atlas.archetype_flow_data("single_family", 1955, 3, "gas_heating")
+    assert index.estimate(flow_data, atlas.RENOVATION_SCENARIO) == {
+        "preliminary": True,
+        "results": {"total_system_costs": 100},
+    }
+    flow_data = atlas.archetype_flow_data("single_family", 1955, 3, "heat_pump", "air_heat_pump")
+    assert index.estimate(flow_data, atlas.RENOVATION_SCENARIO) is None
+
+
+def test_atlas_without_file(tmp_path):
+    index = atlas.AtlasIndex(tmp_path)
+    flow_data = atlas.archetype_flow_data("single_family", 1955, 3, "gas_heating")
+    assert index.estimate(flow_data, atlas.RENOVATION_SCENARIO) is None
@@ -0,0 +1,55 @@
+import numpy as np
+import pytest
+
+from building_dialouge_webapp.heat import bundle
+from building_dialouge_webapp.heat import profiles
+
+
+@pytest.fixture
+def bundle_dir(tmp_path):
+    stored = [
+        (("hotwater", (1,)), np.full(bundle.STRIDE, 1.0)),
+        (("hotwater", (2,)), np.full(bundle.STRIDE, 2.0)),
+        (("heatpump", ("default", "air", "VL40C")), np.arange(bundle.STRIDE, dtype=float)),
+    ]
+    bundle.write_bundle(stored, tmp_path)
+    return tmp_path
+
+
+def test_bundle_returns_shared_read_only_views(bundle_dir):
+    profile_bundle = bundle.ProfileBundle(bundle_dir)
+    assert len(profile_bundle) == 3  # noqa: PLR2004
+    profile = profile_bundle.get(("heatpump", ("default", "air", "VL40C")))
+    assert profile.dtype == np.float32
+    assert profile[10] == 10  # noqa: PLR2004
+    assert not profile.flags.writeable
+    assert np.shares_memory(profile, profile_bundle.profiles)
+    assert profile_bundle.get(("hotwater", (3,))) is None
+    assert profile_bundle.keys("hotwater") == [(1,), (2,)]
+
+
+def test_rebuilt_bundle_replaces_file(bundle_dir):
+    bundle.write_bundle([(("hotwater", (1,)), np.zeros(bundle.STRIDE))], bundle_dir)
+    assert len(list(bundle_dir.glob(f"profiles-*.{bundle.DTYPE}"))) == 1
+    assert len(bundle.ProfileBundle(bundle_dir)) == 1
+
+
+def test_bundle_stores_identical_profiles_once(tmp_path):
+    stored = [(("hotwater", (number_people,)), np.ones(bundle.STRIDE)) for number_people in (1, 2)]
+    bundle.write_bundle(stored, tmp_path)
+    profile_bundle = bundle.ProfileBundle(tmp_path)
+    assert len(profile_bundle) == 2  # noqa: PLR2004
+    assert profile_bundle.profiles.shape == (1, bundle.STRIDE)
+    assert profile_bundle.get(("hotwater", (2,))).sum() == bundle.STRIDE
+
+
+def test_bundle_rejects_profiles_of_other_length(tmp_path):
+    with pytest.raises(ValueError, match="stride"):
+        bundle.write_bundle([(("hotwater", (1,)), np.zeros(24))], tmp_path)
+
+
+def test_stored_profiles_are_fetched_from_bundle(bundle_dir, monkeypatch):
+    monkeypatch.setattr(bundle, "get_bundle", lambda region=None: bundle.ProfileBundle(bundle_dir))
+    fetched = profiles.fetch_stored_profiles([("hotwater", (2,)), ("hotwater", (2,))])
+    assert list(fetched) == [("hotwater", (2,))]
+    assert fetched["hotwater", (2,)][0] == 2  # noqa: PLR2004
@@ -0,0 +1,79 @@
+import numpy as np
+import pandas as pd
+import pytest
+from django.core.cache import cache
+
+from building_dialouge_webapp.heat import codec
+
+HOURS = 8760
+
+
+def payload():
+    rng = np.random.default_rng(42)
+    return {
+        "flow_data": {"number_persons": 2, "scenario-secondary_heating": ["pv"], "construction_year": np.int64(1955)},
+        "oeprom": {
+            "load_electricity": {"profile": pd.Series(rng.random(HOURS)), "amount": 3.2},
+            "conversion_heatpump_air": {"efficiency": pd.Series(rng.random(HOURS) + 2), "expandable": True},
+            "small": np.array([1.5, 2.5]),
+        },
+    }
+
+
+@pytest.fixture
+def shared_cache(monkeypatch):
+    monkeypatch.setattr(codec, "shared_cache", lambda: True)
+
+
+def test_codec_roundtrip(shared_cache):
+    data = payload()
+    encoded = codec.encode(data)
+    assert len(encoded) < 2048  # noqa: PLR2004
+    decoded = codec.decode(encoded)
+    assert decoded["flow_data"] == {**data["flow_data"], "construction_year": 1955}
+    assert decoded["oeprom"]["load_electricity"]["amount"] == 3.2  # noqa: PLR2004
+    profile = decoded["oeprom"]["load_electricity"]["profile"]
+    assert isinstance(profile, pd.Series)
+    # Floats are not downcast, as parameters are used to look up stored simulations
+    np.testing.assert_array_equal(profile, data["oeprom"]["load_electricity"]["profile"])
+    np.testing.assert_array_equal(decoded["oeprom"]["small"], [1.5, 2.5])
+    # Decoded arrays are writable copies
+    profile.iloc[0] = 0
+
+
+def test_codec_resolves_references_from_shared_cache(shared_cache):
+    encoded = codec.encode(payload())
+    codec.PAYLOAD_CACHE.clear()
+    assert isinstance(codec.decode(encoded)["oeprom"]["load_electricity"]["profile"], pd.Series)
+
+    codec.PAYLOAD_CACHE.clear()
+    cache.clear()
+    with pytest.raises(KeyError):
+        codec.decode(encoded)
+
+
+def test_codec_sends_arrays_inline_without_shared_cache(monkeypatch):
+    data = payload()
+    # Local memory cache is not shared with worker processes
+    assert not codec.shared_cache()
+    codec.PAYLOAD_CACHE.clear()
+    decoded = codec.decode(codec.encode(data))
+    np.testing.assert_array_equal(
+        decoded["oeprom"]["load_electricity"]["profile"],
+        data["oeprom"]["load_electricity"]["profile"],
+    )
+
+    # Arrays which could not be stored in shared cache are sent inline as well
+    monkeypatch.setattr(codec, "shared_cache", lambda: True)
+    monkeypatch.setattr(cache, "touch", lambda *args: False)
+    encoded = codec.encode(data)
+    codec.PAYLOAD_CACHE.clear()
+    cache.clear()
+    assert isinstance(codec.decode(encoded)["oeprom"]["load_electricity"]["profile"], pd.Series)
+
+
+def test_codec_rejects_unsupported_objects():
+    with pytest.raises(TypeError):
+        codec.encode({"object": object()})
+    with pytest.raises(TypeError):
+        codec.encode({"series": pd.Series([1.0], index=["a"])})
@@ -0,0 +1,49 @@
+import numpy as np
+import pytest
+
+from building_dialouge_webapp.heat import cop
+from building_dialouge_webapp.heat import profiles
+
+QUALITY_GRADE = 0.45
+SOURCE = cop.KELVIN + 10 + 10 * np.sin(np.linspace(0, 2 * np.pi, 8760))
+
+
+def stored_cops(region="default", medium="air"):
+    return {
+        ("heatpump", (region, medium, cop.type_temperature(temperature))): cop.carnot_cop(
+            SOURCE,
+            temperature,
+            QUALITY_GRADE,
+        )
+        for temperature in cop.STORED_SUPPLY_TEMPERATURES
+    }
+
+
+def test_type_temperature():
+    assert cop.type_temperature(55) == "VL55C"
+    assert cop.supply_temperature("VL55C") == 55  # noqa: PLR2004
+
+
+def test_calibration_recovers_quality_grade_and_source_temperature():
+    calibration = cop.calibrate({cop.supply_temperature(key[1][2]): profile for key, profile in stored_cops().items()})
+    assert calibration.quality_grade == pytest.approx(QUALITY_GRADE)
+    assert calibration.source_temperature == pytest.approx(SOURCE)
+    assert calibration.cop(55) == pytest.approx(cop.carnot_cop(SOURCE, 55, QUALITY_GRADE))
+
+
+def test_calibration_interpolates_invalid_hours():
+    low, high = (cop.carnot_cop(SOURCE, temperature, QUALITY_GRADE) for temperature in (40, 75))
+    low[100] = 0
+    calibration = cop.calibrate({40: low, 75: high})
+    assert calibration.source_temperature[100] == pytest.approx(SOURCE[100], abs=0.01)
+
+
+def test_cop_is_synthesized_for_supply_temperatures_not_stored(monkeypatch):
+    stored = stored_cops(region="south")
+    monkeypatch.setattr(profiles, "fetch_stored_profiles", lambda keys: {key: stored[key] for key in keys})
+    profiles.cop_calibration.cache_clear()
+    assert profiles.synthesized(("heatpump", ("south", "air", "VL55C")))
+    assert not profiles.synthesized(("heatpump", ("south", "air", "VL40C")))
+    calibration = profiles.cop_calibration("south", "air")
+    assert calibration.cop(40) == pytest.approx(stored["heatpump", ("south", "air", "VL40C")])
+    profiles.cop_calibration.cache_clear()
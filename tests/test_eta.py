@@ -0,0 +1,76 @@
+import pytest
+from django.core.cache import cache
+
+from building_dialouge_webapp.heat import eta
+from building_dialouge_webapp.heat import queues
+from building_dialouge_webapp.heat import settings
+
+
+def statistics(technologies, components, expandables, wall_time, timesteps=8760):
+    return {
+        "technologies": technologies,
+        "components": components,
+        "expandables": expandables,
+        "timesteps": timesteps,
+        "wall_time": wall_time,
+    }
+
+
+def test_technologies_signature_is_order_independent():
+    flow_data = {
+        "scenario-primary_heating": "heat_pump",
+        "scenario-heat_pump_type": "air_heat_pump",
+        "scenario-secondary_heating": ["solar", "pv"],
+    }
+    assert eta.technologies(flow_data) == "air_heat_pump,heat_pump,pv,solar"
+    assert eta.technologies({"scenario-primary_heating": "gas_heating"}) == "gas_heating"
+
+
+def test_predictor_without_statistics_uses_default_duration():
+    assert eta.DurationPredictor.fit([]).predict("gas_heating") == settings.ETA_DEFAULT_DURATION
+
+
+def test_predictor_fits_wall_time_in_model_size():
+    # Wall time is 1 s plus 1 ms per component time step and 2 ms per expandable time step
+    samples = [
+        statistics("gas_heating", 10, 1, 1 + 10 * 8.76 + 1 * 17.52),
+        statistics("gas_heating", 12, 1, 1 + 12 * 8.76 + 1 * 17.52),
+        statistics("heat_pump", 14, 3, 1 + 14 * 8.76 + 3 * 17.52),
+        statistics("heat_pump,pv", 16, 4, 1 + 16 * 8.76 + 4 * 17.52),
+    ]
+    predictor = eta.DurationPredictor.fit(samples)
+    assert predictor.predict("gas_heating") == pytest.approx(1 + 11 * 8.76 + 17.52)
+    assert predictor.predict("heat_pump,pv") == pytest.approx(samples[-1]["wall_time"])
+    # Unknown technologies fall back to mean duration
+    assert predictor.predict("district_heating") == pytest.approx(sum(s["wall_time"] for s in samples) / len(samples))
+
+
+def test_schedule_without_statistics_uses_interactive_lane(monkeypatch):
+    monkeypatch.setattr(eta, "get_predictor", lambda: eta.DurationPredictor.fit([]))
+    monkeypatch.setattr(settings, "ETA_BATCH_THRESHOLD", settings.ETA_DEFAULT_DURATION / 2)
+    assert eta.schedule({"flow_data": {"scenario-primary_heating": "gas_heating"}}) == (
+        queues.INTERACTIVE_QUEUE,
+        settings.ETA_DEFAULT_DURATION,
+    )
+
+
+def test_schedule_long_simulations_onto_batch_lane(monkeypatch):
+    predictor = eta.DurationPredictor.fit(
+        [statistics("gas_heating", 10, 1, 100), statistics("gas_heating", 12, 1, 120)],
+    )
+    monkeypatch.setattr(eta, "get_predictor", lambda: predictor)
+    assert eta.schedule({"flow_data": {"scenario-primary_heating": "gas_heating"}})[0] == queues.BATCH_QUEUE
+
+
+def test_register_reuses_recent_queue_depths(monkeypatch):
+    cache.clear()
+    reads = []
+    monkeypatch.setattr(queues, "queue_depths", lambda: reads.append(1) or {queues.INTERACTIVE_QUEUE: 2})
+    monkeypatch.setattr(eta, "get_predictor", lambda: eta.DurationPredictor.fit([]))
+    eta.register("a", queues.INTERACTIVE_QUEUE, 10)
+    eta.register("b", queues.INTERACTIVE_QUEUE, 10)
+    assert len(reads) == 1
+    assert eta.remaining("b") == pytest.approx(
+        2 * settings.ETA_DEFAULT_DURATION / settings.ETA_WORKER_CONCURRENCY + 10,
+        abs=1,
+    )
@@ -0,0 +1,73 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from building_dialouge_webapp.heat import extraction
+from building_dialouge_webapp.heat import imports
+from building_dialouge_webapp.heat import pipeline
+from building_dialouge_webapp.heat import profiles
+from building_dialouge_webapp.heat import regions
+
+
+@pytest.fixture
+def raw_file(tmp_path, monkeypatch):
+    monkeypatch.setattr(regions, "PROFILES_DIR", tmp_path)
+    path = tmp_path / "hourly_profile_hotwater_raw.csv"
+    pd.DataFrame({"HW-1P-60C": np.arange(24.0), "HW-2P-60C": np.ones(24)}).to_csv(path, index=False)
+    return path
+
+
+def test_column_checksums_change_with_column_content_only(raw_file):
+    checksums = imports.column_checksums(pd.read_csv(raw_file))
+    frame = pd.read_csv(raw_file)
+    frame.loc[3, "HW-2P-60C"] = 2.0
+    changed = imports.column_checksums(frame)
+    assert changed["HW-1P-60C"] == checksums["HW-1P-60C"]
+    assert changed["HW-2P-60C"] != checksums["HW-2P-60C"]
+    assert imports.source_name(raw_file) == "hourly_profile_hotwater_raw.csv"
+
+
+def test_changed_columns():
+    columns = {"HW-1P-60C": (1,), "HW-2P-60C": (2,), "HW-3P-60C": (3,), "HW-4P-60C": (4,)}
+    checksums = {"HW-1P-60C": "a", "HW-2P-60C": "b", "HW-3P-60C": "c"}
+    imported = {"HW-1P-60C": "a", "HW-2P-60C": "old"}
+    # Changed and new columns are stored, unchanged column and column not found in file are skipped
+    assert imports.changed_columns(columns, checksums, imported, stored={(1,), (3,)}) == [
+        "HW-2P-60C",
+        "HW-3P-60C",
+    ]
+    # Unchanged column is stored if its profile is missing
+    assert imports.changed_columns(columns, checksums, imported, stored=set()) == [
+        "HW-1P-60C",
+        "HW-2P-60C",
+        "HW-3P-60C",
+    ]
+    assert imports.changed_columns(columns, checksums, checksums, stored={(1,), (2,), (3,)}) == []
+
+
+def test_removed_file_deletes_its_profiles(tmp_path, monkeypatch):
+    monkeypatch.setattr(regions, "PROFILES_DIR", tmp_path)
+    diff = imports.diff_file(tmp_path / "hourly_profile_heat_raw.csv", {"profile_heat": ("default",)}, {("default",)})
+    assert diff.checksum is None
+    assert not diff.found
+    assert not diff.changed
+
+
+def test_sources_match_extraction():
+    path, column = extraction.cop_source("air", "VL40C", "north")
+    assert (path.name, column) == ("hourly_profile_cop_air_raw.csv", "COP-Air-VL40C")
+    assert path.parent == regions.profile_dir("north")
+    assert extraction.solarthermal_source("load", 75, 30, 180)[1] == "STH-VL75-H30-A180"
+
+
+def test_changed_data_version_clears_profile_caches(monkeypatch):
+    monkeypatch.setattr(profiles, "LOADED_DATA_VERSION", {})
+    profiles.use_data_version("a")
+    profiles.PROFILE_CACHE.set(("hotwater", (1,)), np.ones(24))
+    pipeline.HOOK_CACHE.set("set_up_loads", ({"amount": 1},))
+    profiles.use_data_version("a")
+    assert profiles.PROFILE_CACHE.get(("hotwater", (1,))) is not None
+    profiles.use_data_version("b")
+    assert profiles.PROFILE_CACHE.get(("hotwater", (1,))) is None
+    # Memoized hook outputs may be derived from outdated profiles as well
+    assert pipeline.HOOK_CACHE.get("set_up_loads") is None
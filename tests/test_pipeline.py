@@ -0,0 +1,115 @@
+import copy
+import pickle
+
+from building_dialouge_webapp.heat import hooks
+from building_dialouge_webapp.heat import pipeline
+
+CALLS = []
+
+
+@pipeline.declare(reads=("flow_data.construction_year",), writes=("tabula_data",))
+def init_tabula(scenario, parameters, request):
+    CALLS.append("init_tabula")
+    parameters["tabula_data"] = {"year": parameters["flow_data"]["construction_year"]}
+    return parameters
+
+
+@pipeline.declare(reads=("flow_data.number_persons",), writes=("oeprom.load_hotwater",))
+def set_up_hotwater(scenario, parameters, request):
+    CALLS.append("set_up_hotwater")
+    parameters["oeprom"]["load_hotwater"] = {"amount": parameters["flow_data"]["number_persons"] * 0.8}
+    return parameters
+
+
+@pipeline.declare(reads=("tabula_data",), writes=("oeprom.load_heat",))
+def set_up_heat(scenario, parameters, request):
+    CALLS.append("set_up_heat")
+    parameters["oeprom"]["load_heat"] = {"amount": 2000 - parameters["tabula_data"]["year"]}
+    return parameters
+
+
+@pipeline.declare(reads=("oeprom",), writes=("oeprom",))
+def sum_up(scenario, parameters, request):
+    CALLS.append("sum_up")
+    parameters["oeprom"]["total"] = sum(component["amount"] for component in parameters["oeprom"].values())
+    return parameters
+
+
+FUNCTIONS = (init_tabula, set_up_hotwater, set_up_heat, sum_up)
+
+
+def run(function_pipeline, **flow_data):
+    return function_pipeline("oeprom", {"flow_data": flow_data, "oeprom": {}}, None)
+
+
+def sequential(**flow_data):
+    parameters = {"flow_data": flow_data, "oeprom": {}}
+    for function in FUNCTIONS:
+        parameters = function("oeprom", parameters, None)
+    return parameters
+
+
+def test_pipeline_stages():
+    hook_pipeline = pipeline.HookPipeline("test", FUNCTIONS, cache=pipeline.HookCache(10))
+    assert hook_pipeline.stages == [[init_tabula, set_up_hotwater], [set_up_heat], [sum_up]]
+
+
+def test_pipeline_memoizes_unaffected_hooks():
+    hook_pipeline = pipeline.HookPipeline("test", FUNCTIONS, cache=pipeline.HookCache(10))
+    expected = sequential(construction_year=1950, number_persons=2)
+    CALLS.clear()
+    assert run(hook_pipeline, construction_year=1950, number_persons=2) == expected
+    assert CALLS == ["init_tabula", "set_up_hotwater", "set_up_heat", "sum_up"]
+
+    # Changing number of persons only reruns hotwater and all hooks depending on it
+    expected = sequential(construction_year=1950, number_persons=3)
+    CALLS.clear()
+    assert run(hook_pipeline, construction_year=1950, number_persons=3) == expected
+    assert CALLS == ["set_up_hotwater", "sum_up"]
+
+
+def test_pipeline_runs_stages_concurrently():
+    hook_pipeline = pipeline.HookPipeline("test", FUNCTIONS, max_workers=4, cache=pipeline.HookCache(10))
+    expected = sequential(construction_year=1970, number_persons=4)
+    assert run(hook_pipeline, construction_year=1970, number_persons=4) == expected
+
+
+@pipeline.declare(reads=("flow_data.storage",), writes=("oeprom.storage",))
+def set_up_storage(scenario, parameters, request):
+    CALLS.append("set_up_storage")
+    if parameters["flow_data"]["storage"]:
+        parameters["oeprom"]["storage"] = {"amount": 1}
+    return parameters
+
+
+def test_memoized_hook_writing_nothing_keeps_key_absent():
+    hook_pipeline = pipeline.HookPipeline("test", (set_up_storage,), cache=pipeline.HookCache(10))
+    CALLS.clear()
+    for _ in range(2):
+        parameters = run(hook_pipeline, storage=False)
+        assert "storage" not in parameters["oeprom"]
+    assert CALLS == ["set_up_storage"]
+    assert copy.deepcopy(pipeline.MISSING) is pipeline.MISSING
+    assert pickle.loads(pickle.dumps(pipeline.MISSING)) is pipeline.MISSING  # noqa: S301
+
+
+def test_paths():
+    parameters = {"flow_data": {"a": 1}}
+    assert pipeline.get_path(parameters, "flow_data.a") == 1
+    assert pipeline.get_path(parameters, "flow_data.b") is pipeline.MISSING
+    pipeline.set_path(parameters, "oeprom.load_heat", {"amount": 1})
+    pipeline.set_path(parameters, "flow_data.a", pipeline.MISSING)
+    assert parameters == {"flow_data": {}, "oeprom": {"load_heat": {"amount": 1}}}
+    assert pipeline.overlaps(["oeprom"], ["oeprom.load_heat"])
+    assert not pipeline.overlaps(["flow_data.a"], ["flow_data.ab"])
+
+
+def test_hooks_using_profiles_depend_on_profile_data_version():
+    functions = [hooks.set_up_loads]  # Synthesizes space heat profile from stored COP profiles
+    functions += [
+        function
+        for function in vars(hooks).values()
+        if hasattr(function, "spec") and any(path.startswith("profiles.") for path in function.spec.reads)
+    ]
+    for function in functions:
+        assert "profile_data_version" in function.spec.reads, function.__name__
@@ -0,0 +1,105 @@
+import numpy as np
+import pytest
+from django.db import connection
+
+from building_dialouge_webapp.heat import hooks
+from building_dialouge_webapp.heat import models
+from building_dialouge_webapp.heat import profiles
+from building_dialouge_webapp.heat import shapes
+
+PARAMETERS = {
+    "flow_data": {
+        "number_persons": 2,
+        "pv_exists": "False",
+        "solar_thermal_exists": "False",
+        "elevation": 50,
+        "direction": 315,
+        "scenario-primary_heating": "heat_pump",
+        "scenario-heat_pump_type": "air_heat_pump",
+        "scenario-secondary_heating": ["pv", "gas_heating"],
+    },
+    "tabula_data": {"flow_temperature": 75},
+}
+
+
+def test_required_profiles():
+    required = profiles.required_profiles(PARAMETERS)
+    assert required == {
+        "load_electricity": ("load", (2, 2)),
+        "load_hotwater": ("hotwater", (2,)),
+        "volatile_PV": ("photovoltaic", ("default", 50, 315)),
+        "conversion_heatpump_air": ("heatpump", ("default", "air", "VL75C")),
+    }
+
+
+def test_unknown_heat_pump_type_is_skipped():
+    flow_data = {**PARAMETERS["flow_data"], "scenario-heat_pump_type": ""}
+    assert "conversion_heatpump_air" not in profiles.required_profiles({**PARAMETERS, "flow_data": flow_data})
+    parameters = {"flow_data": flow_data, "profiles": {}, "oeprom": {}}
+    assert hooks.set_up_heatpumps("oeprom", parameters, None)["oeprom"] == {}
+
+
+@pytest.mark.django_db
+@pytest.mark.skipif(connection.vendor != "postgresql", reason="Profile models need PostgreSQL (ArrayField).")
+def test_fetch_profiles_query_budget(django_assert_max_num_queries, monkeypatch):
+    monkeypatch.setattr(profiles.bundle, "get_bundle", lambda region=None: None)
+    profiles.clear_caches()
+    for number_people in range(1, 6):
+        models.Hotwater.objects.create(number_people=number_people, **shapes.store(np.arange(24.0) * number_people))
+        models.Load.objects.create(number_people=number_people, eec=2, **shapes.store(np.ones(24) * number_people))
+    for medium in ("air", "water", "brine"):
+        for temperature in (40, 75):
+            models.Heatpump.objects.create(
+                region="default",
+                medium=medium,
+                type_temperature=f"VL{temperature}C",
+                **shapes.store(np.full(24, temperature / 10)),
+            )
+    parameter_sets = [
+        {
+            "flow_data": {
+                **PARAMETERS["flow_data"],
+                "number_persons": number_persons,
+                "scenario-heat_pump_type": heat_pump_type,
+                "scenario-secondary_heating": [],
+            },
+            "tabula_data": {"flow_temperature": temperature},
+        }
+        for number_persons in range(1, 6)
+        for heat_pump_type in profiles.HEATPUMPS
+        for temperature in (40, 75)
+    ]
+    # One query per profile table (load, hotwater, heatpump) and one for shapes, independent of number of buildings
+    with django_assert_max_num_queries(4):
+        profile_sets, queries = profiles.fetch_profiles(parameter_sets)
+    assert queries <= 4  # noqa: PLR2004
+    assert len(profile_sets) == len(parameter_sets)
+
+
+def test_key_region():
+    assert profiles.key_region(("photovoltaic", ("north", 50, 315))) == "north"
+    assert profiles.key_region(("hotwater", (2,))) is None
+
+
+def test_normalize_key():
+    assert profiles.normalize_key(("load", ("2", "2"))) == ("load", (2, 2))
+
+
+def test_bilinear_weights():
+    grid = {40: np.array([0, 30, 60]), 50: np.array([0, 30, 60])}
+    assert profiles.bilinear_weights(grid, 40, 30) == {(40, 30): 1.0}
+    weights = profiles.bilinear_weights(grid, 45, 45)
+    assert weights == pytest.approx({(40, 30): 0.25, (40, 60): 0.25, (50, 30): 0.25, (50, 60): 0.25})
+    with pytest.raises(ValueError, match="outside of grid"):
+        profiles.bilinear_weights(grid, 60, 0)
+
+
+def test_profile_cache_is_bounded():
+    cache = profiles.ProfileCache(maxsize=2)
+    for number_people in (1, 2):
+        cache.set(("hotwater", (number_people,)), np.zeros(3))
+    cache.get(("hotwater", (1,)))
+    cache.set(("hotwater", (3,)), np.zeros(3))
+    assert cache.get(("hotwater", (2,))) is None
+    assert cache.get(("hotwater", (1,))) is not None
+    assert not cache.get(("hotwater", (3,))).flags.writeable
@@ -0,0 +1,109 @@
+import warnings
+
+import pandas as pd
+import pytest
+from oemof import solph
+
+from building_dialouge_webapp.heat import pruning
+
+
+def build_energysystem():
+    warnings.simplefilter("ignore", FutureWarning)
+    es = solph.EnergySystem(timeindex=pd.date_range("2020", periods=3, freq="h"), infer_last_interval=False)
+    electricity = solph.Bus(label="b_electricity")
+    heat = solph.Bus(label="b_heat")
+    gas = solph.Bus(label="b_gas")
+    es.add(
+        electricity,
+        heat,
+        gas,
+        solph.components.Source(label="grid", outputs={electricity: solph.Flow(variable_costs=1)}),
+        solph.components.Source(
+            label="volatile_PV",
+            outputs={
+                electricity: solph.Flow(fix=[0.1, 0.5, 0.2], investment=solph.Investment(ep_costs=1, maximum=0)),
+            },
+        ),
+        solph.components.Source(label="volatile_STH", outputs={heat: solph.Flow(fix=[0, 0, 0], nominal_value=5)}),
+        solph.components.Converter(
+            label="conversion_boiler",
+            inputs={gas: solph.Flow()},
+            outputs={heat: solph.Flow(investment=solph.Investment(ep_costs=1))},
+        ),
+        solph.components.Converter(
+            label="conversion_ehz",
+            inputs={electricity: solph.Flow()},
+            outputs={heat: solph.Flow(nominal_value=10)},
+        ),
+        solph.components.Sink(label="load_heat", inputs={heat: solph.Flow(fix=[1, 2, 3], nominal_value=1)}),
+        solph.components.Sink(
+            label="load_electricity",
+            inputs={electricity: solph.Flow(fix=[1, 1, 1], nominal_value=1)},
+        ),
+    )
+    return es
+
+
+@pytest.fixture
+def energysystem():
+    return build_energysystem()
+
+
+def test_prune_removes_dead_nodes(energysystem):
+    pruned = pruning.prune(energysystem)
+    labels = {node.label for node in pruned.nodes}
+    # Zero potential, zero profile and boiler without gas supply (and its gas bus) are removed
+    assert labels == {"b_electricity", "b_heat", "grid", "conversion_ehz", "load_heat", "load_electricity"}
+    assert "volatile_PV" not in pruned.groups
+    assert all(target.label != "volatile_STH" for target in pruned.groups["b_heat"].inputs)
+
+    # Pruned energysystem is still a valid model, just smaller
+    model = solph.Model(pruned)
+    unpruned_model = solph.Model(build_energysystem())
+    assert model.nvariables() < unpruned_model.nvariables()
+    assert model.nconstraints() < unpruned_model.nconstraints()
+
+
+def test_estimate_savings(energysystem):
+    dead = pruning.find_dead_nodes(energysystem)
+    variables, constraints = pruning.estimate_savings(dead, 3)
+    # PV, STH, gas input and boiler output flows; investment variables of PV and boiler
+    assert variables == 4 * 3 + 2
+    # Gas bus, two investment flows and boiler conversion
+    assert constraints == (1 + 2 + 1) * 3
+
+
+def test_prune_keeps_storages_and_components_with_several_flows():
+    warnings.simplefilter("ignore", FutureWarning)
+    es = solph.EnergySystem(timeindex=pd.date_range("2020", periods=3, freq="h"), infer_last_interval=False)
+    electricity = solph.Bus(label="b_electricity")
+    heat = solph.Bus(label="b_heat")
+    gas = solph.Bus(label="b_gas")
+    es.add(
+        electricity,
+        heat,
+        gas,
+        solph.components.Source(label="gas", outputs={gas: solph.Flow(variable_costs=1)}),
+        # Storage may discharge its initial content, although it cannot be charged
+        solph.components.GenericStorage(
+            label="storage_heat",
+            inputs={heat: solph.Flow(nominal_value=0)},
+            outputs={heat: solph.Flow(nominal_value=5)},
+            nominal_storage_capacity=10,
+            initial_storage_level=0.5,
+            balanced=False,
+        ),
+        # Electricity output may be zero, while heat is still produced
+        solph.components.Converter(
+            label="backpressure_bhkw",
+            inputs={gas: solph.Flow()},
+            outputs={heat: solph.Flow(), electricity: solph.Flow(nominal_value=0)},
+            conversion_factors={heat: 0.5, electricity: 0.3},
+        ),
+        solph.components.Sink(label="load_heat", inputs={heat: solph.Flow(fix=[1, 2, 3], nominal_value=1)}),
+        solph.components.Sink(label="export", inputs={electricity: solph.Flow()}),
+    )
+    pruned = pruning.prune(es)
+    assert {node.label for node in pruned.nodes} >= {"storage_heat", "backpressure_bhkw", "b_electricity"}
+    assert pruned.timeindex.equals(es.timeindex)
+    solph.Model(pruned)
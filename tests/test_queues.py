@@ -0,0 +1,31 @@
+import pytest
+from django.core.cache import cache
+
+from building_dialouge_webapp.heat import queues
+from config.celery_app import app
+
+
+@pytest.fixture(autouse=True)
+def _clear_cache():
+    cache.clear()
+    yield
+    cache.clear()
+
+
+@pytest.mark.parametrize(
+    ("task", "queue"),
+    [
+        ("django_oemof.simulation.simulate_scenario", queues.INTERACTIVE_QUEUE),
+        ("building_dialouge_webapp.heat.tasks.any_task", queues.BATCH_QUEUE),
+    ],
+)
+def test_tasks_are_routed_to_lanes(task, queue):
+    assert app.amqp.router.route({}, task)["queue"].name == queue
+
+
+def test_wait_times():
+    queues.record_wait(queues.INTERACTIVE_QUEUE, 1.0)
+    queues.record_wait(queues.INTERACTIVE_QUEUE, 3.0)
+    metrics = queues.wait_times()
+    assert metrics[queues.INTERACTIVE_QUEUE] == {"count": 2, "mean_wait": 2.0, "max_wait": 3.0}
+    assert metrics[queues.BATCH_QUEUE]["count"] == 0
@@ -0,0 +1,35 @@
+import pandas as pd
+import pytest
+
+from building_dialouge_webapp.heat import regions
+
+
+@pytest.fixture
+def region_index(monkeypatch):
+    table = pd.DataFrame(
+        {
+            "region": ["north", "north", "south"],
+            "postcode_prefix": ["2", "20", "8"],
+            "latitude": [53.55, 53.55, 48.14],
+            "longitude": [9.99, 9.99, 11.58],
+        },
+    )
+    index = regions.RegionIndex(table)
+    monkeypatch.setattr(regions, "get_region_index", lambda: index)
+    return index
+
+
+def test_region_by_postcode(region_index):
+    assert region_index.by_postcode("20095") == "north"
+    assert region_index.by_postcode("80331") == "south"
+    assert region_index.by_postcode("10115") is None
+
+
+def test_region_by_coordinates(region_index):
+    assert region_index.by_coordinates(48.4, 10.9) == "south"
+
+
+def test_get_region_falls_back_to_default(region_index):
+    assert regions.get_region({"postcode": "80331"}) == "south"
+    assert regions.get_region({"postcode": "10115", "latitude": 53.1, "longitude": 8.8}) == "north"
+    assert regions.get_region({}) == regions.DEFAULT_REGION
@@ -0,0 +1,27 @@
+import pytest
+from django.urls import resolve
+from django.urls import reverse
+
+from building_dialouge_webapp.heat import pipeline
+from building_dialouge_webapp.heat import registry
+
+
+def test_lazy_hook_resolves_hook_by_name():
+    hook = registry.LazyHook("bound_unbounded_capacities")
+    assert hook.__name__ == "bound_unbounded_capacities"
+    assert hook.spec.writes == ("oeprom",)
+    parameters = {"oeprom": {"load_heat": {"amount": 1}, "load_hotwater": {"amount": 2}, "gas": {"capacity": 1}}}
+    assert hook("oeprom", parameters, None) is parameters
+
+
+def test_pipeline_imports_lazy_hooks_on_first_run():
+    hook_pipeline = pipeline.HookPipeline("test", registry.hooks("not_installed.module.hook"))
+    with pytest.raises(ModuleNotFoundError):
+        hook_pipeline("oeprom", {}, None)
+
+
+def test_oemof_urls_keep_namespace_and_csrf_exemption():
+    assert reverse("django_oemof:simulate") == "/oemof/simulate"
+    assert reverse("django_oemof:api-root") == "/oemof/"
+    assert resolve("/oemof/flows").func.csrf_exempt
+    assert resolve("/oemof/simulate").func.csrf_exempt
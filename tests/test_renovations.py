@@ -0,0 +1,55 @@
+import json
+
+import pytest
+
+from building_dialouge_webapp.heat import forms
+from building_dialouge_webapp.heat import renovations
+
+FLOW_DATA = {
+    "building_type": "single_family",
+    "energy_source": "gas",
+    "construction_year": 1955,
+}
+
+
+def insulation(*parts: str) -> dict:
+    """Return flow data of insulation form as stored in session."""
+    form = forms.InsulationForm({"insulation_choices": list(parts)})
+    assert form.is_valid(), form.errors
+    return form.cleaned_data
+
+
+@pytest.fixture
+def renovation_dir(tmp_path):
+    for cluster_id in (1, 2, 3):
+        (tmp_path / f"{cluster_id}.json").write_text(json.dumps({"cluster": cluster_id}))
+    (tmp_path / renovations.CLUSTER_FILE).write_text(
+        "cluster_id,building_type,energy_source,construction_year_class,roof_insulation_year,"
+        "upper_storey_ceiling_insulation_year,cellar_insulation_year,facade_insulation_year,window_insulation_year\n"
+        "1,single_family,gas,4,1957,1957,1957,1957,1957\n"
+        "2,single_family,gas,4,1957,1957,1957,2010,1957\n"
+        "3,apartment_building,oil,4,1957,1957,1957,2010,1957\n",
+    )
+    return tmp_path
+
+
+def test_renovation_index_matches_nearest_cluster(renovation_dir):
+    index = renovations.RenovationIndex(renovation_dir)
+    insulated_facade = {**FLOW_DATA, **insulation("facade_insulation_year")}
+    assert index.renovation_data(insulated_facade) == {"cluster": 2}
+    assert index.renovation_data({**FLOW_DATA, **insulation()}) == {"cluster": 1}
+    # Unknown energy source falls back to clusters of same building type
+    assert index.renovation_data({**insulated_facade, "energy_source": "wood"}) == {"cluster": 2}
+
+
+def test_insulation_years():
+    years = renovations.insulation_years({**FLOW_DATA, **insulation("roof_insulation_year")})
+    assert years == (2010, 1955, 1955, 1955, 1955)
+    # Building parts cannot be insulated before construction
+    assert renovations.insulation_years({"construction_year": 2020, **insulation("roof_insulation_year")})[0] == 2020  # noqa: PLR2004
+
+
+def test_renovation_index_without_lookup_table(renovation_dir):
+    (renovation_dir / renovations.CLUSTER_FILE).unlink()
+    index = renovations.RenovationIndex(renovation_dir)
+    assert index.renovation_data(FLOW_DATA) == {"cluster": renovations.DEFAULT_CLUSTER_ID}
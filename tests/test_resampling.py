@@ -0,0 +1,36 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from scripts import minute_into_hour_series as resampling
+
+
+@pytest.fixture
+def minutes():
+    index = pd.date_range("2024-01-01", periods=150, freq="min")
+    rng = np.random.default_rng(1)
+    frame = pd.DataFrame({"a": rng.random(150), "b": rng.random(150)}, index=index)
+    frame.iloc[5, 0] = np.nan
+    frame.iloc[60:120, 1] = np.nan  # Hour without any value
+    return frame
+
+
+@pytest.mark.parametrize("aggregation", ["mean", "sum"])
+def test_resample_chunk_matches_pandas(minutes, aggregation):
+    expected = getattr(minutes.resample("h"), aggregation)()
+    hourly = resampling.resample_chunk(minutes.to_numpy(), aggregation)
+    np.testing.assert_allclose(hourly, expected.to_numpy())
+
+
+@pytest.mark.parametrize(("filename", "aggregation"), [("profile_cop_test.csv", "mean"), ("x_load_test.csv", "sum")])
+def test_chunked_file_matches_pandas(minutes, tmp_path, monkeypatch, filename, aggregation):
+    monkeypatch.setattr(resampling, "DATA_DIR", tmp_path)
+    # Chunks of a single hour, thus file is resampled in three chunks (last one partial)
+    monkeypatch.setattr(resampling, "MAX_CHUNK_VALUES", 2 * resampling.MINUTES_PER_HOUR)
+    minutes.to_csv(tmp_path / filename, index=False)
+
+    output_path = resampling.resample_file(tmp_path / filename)
+
+    expected = getattr(minutes.resample("h"), aggregation)().to_numpy()
+    np.testing.assert_allclose(pd.read_csv(output_path).to_numpy(), expected)
+    np.testing.assert_allclose(np.load(output_path.with_suffix(".npy")), expected)
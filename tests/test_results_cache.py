@@ -0,0 +1,54 @@
+from django.test import RequestFactory
+from django.utils import translation
+
+from building_dialouge_webapp.heat.views import finish_simulation_task
+from building_dialouge_webapp.heat.views import get_results_cache_key
+from building_dialouge_webapp.heat.views import label_estimate
+from building_dialouge_webapp.heat.views import start_simulation_task
+
+
+def _request(flow_data: dict, simulation_ids: dict | None = None):
+    request = RequestFactory().get("/results/")
+    request.session = {"django_htmx_flow": flow_data}
+    if simulation_ids is not None:
+        request.session["simulation_ids"] = simulation_ids
+    return request
+
+
+def test_results_cache_key_ignores_non_scenario_data():
+    key = get_results_cache_key(_request({"scenario1-primary_heating": "heat_pump", "number_persons": 2}))
+    assert key == get_results_cache_key(_request({"scenario1-primary_heating": "heat_pump", "number_persons": 3}))
+
+
+def test_results_cache_key_changes_with_scenarios_and_simulations():
+    flow_data = {"scenario1-primary_heating": "heat_pump"}
+    key = get_results_cache_key(_request(flow_data, {"scenario1": 1}))
+    assert key != get_results_cache_key(_request({"scenario1-primary_heating": "district_heating"}, {"scenario1": 1}))
+    assert key != get_results_cache_key(_request(flow_data, {"scenario1": 2}))
+    with translation.override("de"):
+        assert key != get_results_cache_key(_request(flow_data, {"scenario1": 1}))
+
+
+def test_finished_simulations_invalidate_results_cache_key():
+    request = _request({"scenario1-primary_heating": "heat_pump"})
+    key = get_results_cache_key(request)
+    start_simulation_task(request.session, "task1", "scenario1")
+    finish_simulation_task(request.session, "unknown", 3)
+    assert get_results_cache_key(request) == key
+
+    finish_simulation_task(request.session, "task1", 7)
+    assert request.session["simulation_ids"] == {"scenario1": 7}
+    assert request.session["simulation_tasks"] == {}
+    finished_key = get_results_cache_key(request)
+    assert finished_key != key
+
+    # Restarting simulation of scenario drops its outdated simulation ID
+    start_simulation_task(request.session, "task2", "scenario1")
+    assert request.session["simulation_ids"] == {}
+
+
+def test_estimates_are_labeled_for_users():
+    estimate = {"preliminary": True, "results": {"total_system_costs": 1000.0}}
+    with translation.override("de"):
+        assert label_estimate(estimate, "scenario2")["label"] == "Szenario 2"
+    assert label_estimate(None, "scenario2") is None
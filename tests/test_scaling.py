@@ -0,0 +1,81 @@
+import math
+import warnings
+
+import pandas as pd
+from oemof import solph
+
+from building_dialouge_webapp.heat import hooks
+from building_dialouge_webapp.heat import scaling
+from building_dialouge_webapp.heat import settings
+
+BIG_NUMBER = 100_000_000
+
+
+def build_model(capacity: float) -> solph.Model:
+    warnings.simplefilter("ignore", FutureWarning)
+    es = solph.EnergySystem(timeindex=pd.date_range("2020", periods=3, freq="h"), infer_last_interval=False)
+    heat = solph.Bus(label="b_heat")
+    es.add(
+        heat,
+        solph.components.Source(
+            label="district_heating",
+            outputs={heat: solph.Flow(nominal_value=capacity, variable_costs=120)},
+        ),
+        solph.components.Sink(label="load_heat", inputs={heat: solph.Flow(fix=[0.2, 0.5, 0.3], nominal_value=15)}),
+    )
+    return solph.Model(es)
+
+
+def test_coefficient_ranges():
+    ranges = scaling.coefficient_ranges(build_model(BIG_NUMBER))
+    assert {"variable bounds", "objective"} <= set(ranges.index)
+    assert ranges.loc["variable bounds", "max_rhs"] == BIG_NUMBER
+    assert ranges.loc["objective", "max_coefficient"] == 120  # noqa: PLR2004
+
+    big_number = scaling.overall_range(ranges)
+    bound = scaling.overall_range(scaling.coefficient_ranges(build_model(15)))
+    assert math.log10(big_number[1] / big_number[0]) > math.log10(bound[1] / bound[0]) + 5
+
+
+def test_bound_unbounded_capacities():
+    parameters = {
+        "oeprom": {
+            "load_heat": {"amount": 15000, "profile": pd.Series([0.25, 0.5, 0.25])},
+            "load_hotwater": {"amount": 2000, "profile": pd.Series([0.5, 0.5])},
+            "district_heating": {"capacity": hooks.UNBOUNDED_CAPACITY},
+            "conversion_dle": {"capacity": hooks.UNBOUNDED_CAPACITY},
+            "volatile_PV": {"capacity": 5},
+        },
+    }
+    oeprom = hooks.bound_unbounded_capacities("oeprom", parameters, None)["oeprom"]
+    # Peak hourly demand times safety factor
+    bound = (0.5 * 15000 + 0.5 * 2000) * settings.CAPACITY_BOUND_FACTOR
+    assert oeprom["district_heating"]["capacity"] == oeprom["conversion_dle"]["capacity"] == bound
+    assert oeprom["volatile_PV"]["capacity"] == 5  # noqa: PLR2004
+
+
+def test_bound_of_unbounded_capacities_stays_positive():
+    parameters = {
+        "oeprom": {
+            # Heat demand may be reduced below zero by renovation measures
+            "load_heat": {"amount": -500},
+            "load_hotwater": {"amount": 0, "profile": pd.Series([0.5, 0.5])},
+            "district_heating": {"capacity": hooks.UNBOUNDED_CAPACITY},
+        },
+    }
+    oeprom = hooks.bound_unbounded_capacities("oeprom", parameters, None)["oeprom"]
+    assert oeprom["district_heating"]["capacity"] == settings.CAPACITY_BOUND_MIN
+
+
+def test_bound_of_load_without_profile_uses_mean_hourly_demand():
+    parameters = {
+        "oeprom": {
+            # Space heat profile could not be synthesized, thus annual amount is given only
+            "load_heat": {"amount": 87600},
+            "load_hotwater": {"amount": 0, "profile": pd.Series([0.5, 0.5])},
+            "district_heating": {"capacity": hooks.UNBOUNDED_CAPACITY},
+        },
+    }
+    oeprom = hooks.bound_unbounded_capacities("oeprom", parameters, None)["oeprom"]
+    peak = 87600 / hooks.HOURS_PER_YEAR * settings.LOAD_PEAK_FACTOR
+    assert oeprom["district_heating"]["capacity"] == peak * settings.CAPACITY_BOUND_FACTOR
@@ -0,0 +1,34 @@
+import numpy as np
+import pytest
+
+from building_dialouge_webapp.heat import profiles
+from building_dialouge_webapp.heat import shapes
+
+rng = np.random.default_rng(0)
+HOTWATER = rng.random(8760)
+
+
+def test_scaled_profiles_share_shape():
+    hashes = set()
+    for number_people in (1, 2, 3, 4, 5):
+        shape_hash, shape, scale = shapes.split(HOTWATER * number_people * 0.8)
+        assert np.abs(shape).max() == 1
+        assert shape * scale == pytest.approx(HOTWATER * number_people * 0.8, abs=scale * 1e-9)
+        hashes.add(shape_hash)
+    assert len(hashes) == 1
+
+
+def test_split_zero_and_negative_profiles():
+    shape_hash, shape, scale = shapes.split(np.zeros(24))
+    assert scale == 0
+    assert not shape.any()
+    assert shapes.split(-np.zeros(24))[0] == shape_hash
+    _, shape, scale = shapes.split(np.array([-2.0, 1.0]))
+    assert (scale, shape.tolist()) == (2.0, [-1.0, 0.5])
+
+
+def test_fetch_shapes_from_cache():
+    shape_hash, shape, _ = shapes.split(HOTWATER)
+    profiles.SHAPE_CACHE.set(shape_hash, shape)
+    assert profiles.fetch_shapes([shape_hash, shape_hash]) == {shape_hash: shape}
+    profiles.SHAPE_CACHE.clear()
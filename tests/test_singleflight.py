@@ -0,0 +1,54 @@
+import pytest
+from django.core.cache import cache
+
+from building_dialouge_webapp.heat import singleflight
+
+
+@pytest.fixture(autouse=True)
+def _clear_cache():
+    cache.clear()
+    yield
+    cache.clear()
+
+
+def test_canonical_key_ignores_key_order():
+    assert singleflight.canonical_key("oeprom", {"a": 1, "b": {"c": 2, "d": 3}}) == singleflight.canonical_key(
+        "oeprom",
+        {"b": {"d": 3, "c": 2}, "a": 1},
+    )
+    assert singleflight.canonical_key("oeprom", {"a": 1}) != singleflight.canonical_key("oeprom", {"a": 2})
+
+
+def test_duplicate_requests_attach_to_running_simulation():
+    started = []
+    task_id, coalesced = singleflight.submit("oeprom", {"a": 1}, started.append)
+    assert not coalesced
+    assert started == [task_id]
+
+    assert singleflight.submit("oeprom", {"a": 1}, started.append) == (task_id, True)
+    assert singleflight.submit("oeprom", {"a": 2}, started.append)[1] is False
+    assert len(started) == 2  # noqa: PLR2004
+    assert singleflight.metrics() == {"started": 2, "coalesced": 1, "released": 0}
+
+    # Simulation is only terminated if last waiter detaches
+    assert singleflight.detach(task_id) == 1
+    assert singleflight.detach(task_id) == 0
+
+    singleflight.release(task_id)
+    new_task_id, coalesced = singleflight.submit("oeprom", {"a": 1}, started.append)
+    assert not coalesced
+    assert new_task_id != task_id
+    assert singleflight.metrics()["released"] == 1
+
+
+def test_failed_start_releases_lock():
+    def fail(task_id):
+        error_msg = "Broker unavailable"
+        raise ConnectionError(error_msg)
+
+    with pytest.raises(ConnectionError):
+        singleflight.submit("oeprom", {"a": 1}, fail)
+    started = []
+    task_id, coalesced = singleflight.submit("oeprom", {"a": 1}, started.append)
+    assert not coalesced
+    assert started == [task_id]
@@ -0,0 +1,48 @@
+import numpy as np
+import pytest
+
+from building_dialouge_webapp.heat import forms
+from building_dialouge_webapp.heat import spaceheat
+
+# Two cold days followed by two warm days
+TEMPERATURE = np.concatenate([np.full(24, 0.0), np.full(24, 5.0), np.full(48, 18.0)])
+
+
+def insulation_flow_data(*parts: str) -> dict:
+    """Return flow data of building from 1960 with given building parts chosen in insulation form."""
+    form = forms.InsulationForm({"insulation_choices": list(parts)})
+    assert form.is_valid(), form.errors
+    return {"construction_year": 1960, **form.cleaned_data}
+
+
+def test_insulation_class_depends_on_insulated_parts():
+    all_parts = [choice for choice, _ in forms.InsulationForm.base_fields["insulation_choices"].choices]
+    unrenovated = spaceheat.insulation_class(insulation_flow_data())
+    partially_renovated = spaceheat.insulation_class(
+        insulation_flow_data("roof_insulation_year", "window_insulation_year"),
+    )
+    renovated = spaceheat.insulation_class(insulation_flow_data(*all_parts))
+    assert unrenovated == 0
+    assert unrenovated < partially_renovated < renovated
+    # Newer buildings are at least in insulation class of their construction year
+    assert spaceheat.insulation_class({"construction_year": 2020}) == len(spaceheat.INSULATION_YEARS) - 1
+
+
+def test_degree_hour_profiles_are_normalized():
+    heat_profiles = spaceheat.degree_hour_profiles(TEMPERATURE, [15, 10], 20)
+    assert heat_profiles.shape == (2, len(TEMPERATURE))
+    assert heat_profiles.sum(axis=1) == pytest.approx([1, 1])
+    # No heat demand above heating limit; demand proportional to degree hours below
+    assert not heat_profiles[:, 48:].any()
+    assert heat_profiles[0, 0] / heat_profiles[0, 24] == pytest.approx(20 / 15)
+
+
+def test_degree_hour_profiles_are_smoothed_by_inertia():
+    heat_profile = spaceheat.degree_hour_profiles(TEMPERATURE, [15], 20, inertia=4)[0]
+    assert heat_profile.sum() == pytest.approx(1)
+    assert heat_profile[48:51].all()
+    assert not heat_profile[51:].any()
+
+
+def test_daily_mean_of_incomplete_day():
+    assert spaceheat.daily_mean(np.array([*[0.0] * 24, 2.0, 4.0])).tolist() == [0.0] * 24 + [3.0, 3.0]
@@ -0,0 +1,78 @@
+import numpy as np
+import pytest
+
+from building_dialouge_webapp.heat import atlas
+from building_dialouge_webapp.heat import forms
+from building_dialouge_webapp.heat import surrogate
+
+
+def corpus():
+    features = []
+    targets = []
+    for flow_data in atlas.archetype_grid(heatings=(("gas_heating", ""), ("heat_pump", "air_heat_pump"))):
+        features.append(surrogate.extract_features(flow_data, atlas.RENOVATION_SCENARIO))
+        heat_pump = flow_data[f"{atlas.RENOVATION_SCENARIO}-primary_heating"] == "heat_pump"
+        targets.append(
+            surrogate.flatten_results(
+                {
+                    "total_system_costs": 1000 + 100 * flow_data["number_persons"] + 500 * heat_pump,
+                    "invested_capacity": {"conversion_heatpump_air-b_heat": 5.0} if heat_pump else {},
+                },
+            ),
+        )
+    return features, targets
+
+
+def renovation_request(**data) -> dict:
+    """Return flow data of renovation request form as stored in session (prefixed by renovation scenario)."""
+    form = forms.RenovationRequestForm(
+        {f"scenario1-{field}": value for field, value in data.items()},
+        prefix="scenario1",
+    )
+    assert form.is_valid(), form.errors
+    return {f"scenario1-{field}": value for field, value in form.cleaned_data.items()}
+
+
+def insulation(*parts: str) -> dict:
+    """Return flow data of insulation form as stored in session."""
+    form = forms.InsulationForm({"insulation_choices": list(parts)})
+    assert form.is_valid(), form.errors
+    return form.cleaned_data
+
+
+def test_extract_features():
+    flow_data = {
+        **atlas.archetype_flow_data("single_family", 1955, 2, "heat_pump", "air_heat_pump"),
+        "scenario1-secondary_heating": ["pv"],
+        **renovation_request(roof_renovation_details=["cover"], cellar_renovation_choice=["cellar_renovation"]),
+        **insulation("window_insulation_year"),
+    }
+    features = surrogate.extract_features(flow_data, "scenario1")
+    assert features["building_type=single_family"] == 1
+    assert features["heat_pump_type=air_heat_pump"] == 1
+    assert features["secondary_heating=pv"] == 1
+    assert features["roof_renovation"] == 1
+    assert features["cellar_renovation"] == 1
+    assert features["window_renovation"] == 0
+    assert features["insulated=window_insulation_year"] == 1
+    assert features["insulated=roof_insulation_year"] == 0
+    assert features["roof_south"] == pytest.approx(45)
+
+
+def test_surrogate_fit_predict_and_roundtrip(tmp_path):
+    features, targets = corpus()
+    model = surrogate.Surrogate.fit(features, targets, alpha=1e-6)
+    prediction = model.predict(features[0])
+    assert prediction == pytest.approx(targets[0] | {"invested_capacity:conversion_heatpump_air-b_heat": 0}, abs=1e-3)
+
+    model.save(tmp_path / surrogate.MODEL_FILE)
+    loaded = surrogate.Surrogate.load(tmp_path / surrogate.MODEL_FILE)
+    assert np.allclose(loaded.predict_many(features), model.predict_many(features))
+
+
+def test_validation_report():
+    features, targets = corpus()
+    report = surrogate.validation_report(features, targets, alpha=1e-6)
+    assert set(report.columns) == {"building_type", "construction_year_index", "target", "mae", "mean", "relative_mae"}
+    assert len(report) == len(atlas.BUILDING_TYPES) * len(atlas.tabula.CONSTRUCTION_YEARS) * 2
+    assert report["relative_mae"].max() < 1e-3  # noqa: PLR2004
@@ -0,0 +1,27 @@
+from building_dialouge_webapp.heat import tables
+
+
+def test_consumption_table_marks_missing_procedures():
+    html = tables.ConsumptionTable(
+        {
+            "scenario1": {"change_heating": -29, "pv_battery": "nicht ausgewählt"},
+            "scenario2": {"change_heating": -52},
+        },
+    ).to_html()
+    assert html.startswith('<table class="consumption_table table">')
+    assert '<th class="scenario1"><span>Szenario 1</span></th>' in html
+    assert "<tr><td>Heiztechnologie wechseln</td><td>-29</td><td>-52</td></tr>" in html
+    assert html.count('<td class="no-entry">nicht ausgewählt</td>') == 2  # noqa: PLR2004
+
+
+def test_investment_table_sums_values():
+    html = tables.InvestmentTable({"investments": {"renovate_roof": 64500, "replace_windows": 1000.5}}).to_html(
+        "scenario1 summary_table",
+    )
+    assert "<th><span class='summary-value'>65.500,50 €</span></th>" in html
+    assert "<tr><td>Dach sanieren</td><td>64.500 €</td></tr>" in html
+
+
+def test_sum_table_appends_sum_row():
+    html = tables.InvestmentSummaryTable({"scenario1": {"investment": 100, "contribution": 20}}).to_html()
+    assert "<tr><td>Summe</td><td>120 €</td></tr>" in html
@@ -0,0 +1,26 @@
+import numpy as np
+
+from building_dialouge_webapp.heat import settings
+from building_dialouge_webapp.heat import tabula
+
+
+def test_nearest_year_index_equals_argmin():
+    years = np.arange(1800, 2050)
+    expected = [
+        int(np.argmin([abs(year - construction_year) for year in settings.CONFIG["construction_years"]])) + 1
+        for construction_year in years
+    ]
+    assert [tabula.nearest_year_index(year) for year in years] == expected
+    assert tabula.nearest_year_indices(years).tolist() == expected
+
+
+def test_get_tabula_data():
+    tabula_data = tabula.get_tabula_data("single_family", 1955)
+    assert tabula_data["yearofconstruction"] == "1957"
+    assert tabula_data["flow_temperature"] == settings.CONFIG["flow_temperature"]["radiators"]
+    assert tabula_data["roof_area_available"] == 125.4 * settings.CONFIG["roof_usage"]
+
+
+def test_get_tabula_references():
+    references = tabula.get_tabula_references(["terraced_house", "apartment_building"], [1850, 2030])
+    assert references == ["DE.N.TH.02.", "DE.N.MFH.12."]
@@ -0,0 +1,33 @@
+import pytest
+
+from building_dialouge_webapp.heat import warmup
+
+
+@pytest.fixture(autouse=True)
+def _clear_report():
+    warmup.REPORT.clear()
+    yield
+    warmup.REPORT.clear()
+
+
+def test_failing_phase_does_not_stop_warm_up(monkeypatch):
+    calls = []
+
+    def fail():
+        error_msg = "No DB"
+        raise RuntimeError(error_msg)
+
+    monkeypatch.setattr(warmup, "PHASES", {"profiles": fail, "imports": lambda: calls.append("imports")})
+    report = warmup.warm_up()
+    assert calls == ["imports"]
+    assert set(report) == {"profiles", "imports"}
+
+
+def test_only_first_task_is_reported():
+    warmup.task_started("1")
+    warmup.task_finished("1", "first")
+    first = warmup.REPORT["first_task"]
+    warmup.task_started("2")
+    warmup.task_finished("2", "second")
+    assert warmup.REPORT["first_task"] == first
+    assert not warmup.TASKS_STARTED